@@ -5,14 +5,20 @@ Then open http://localhost:7860 in your browser.
 
 Configure the debate topic and bot roles in the UI, then click "Start Debate".
 Two bots take turns arguing. The user's microphone is muted (bot-to-bot mode).
+
+With DEBATE_ROOMS=1 every connection joins a shared room instead: the debate
+is generated once and broadcast to all of its listeners.
 """
 
 import asyncio
 import os
 import sys
+import time
 import uuid
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from http import HTTPMethod
+from typing import Awaitable, Callable, Optional
 
 from dotenv import load_dotenv
 from loguru import logger
@@ -38,23 +44,39 @@ from pipecat_ai_small_webrtc_prebuilt.frontend import SmallWebRTCPrebuiltUI
 from pydantic import BaseModel
 
 from pipecat.frames.frames import (
+    BotStartedSpeakingFrame,
+    BotStoppedSpeakingFrame,
+    ControlFrame,
+    EndFrame,
     Frame,
+    InterruptionFrame,
     LLMContextFrame,
     LLMFullResponseEndFrame,
     LLMFullResponseStartFrame,
     LLMTextFrame,
+    OutputAudioRawFrame,
+    SystemFrame,
     TextFrame,
     TranscriptionFrame,
+    TTSStartedFrame,
+    TTSStoppedFrame,
+    TTSUpdateSettingsFrame,
 )
+from pipecat.observers.base_observer import BaseObserver
+from pipecat.pipeline.parallel_pipeline import ParallelPipeline
 from pipecat.pipeline.pipeline import Pipeline
 from pipecat.pipeline.runner import PipelineRunner
 from pipecat.pipeline.task import PipelineParams, PipelineTask
 from pipecat.processors.aggregators.llm_context import LLMContext
+from pipecat.processors.filters.function_filter import FunctionFilter
 from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
 from pipecat.services.anthropic.llm import AnthropicLLMService
 from pipecat.services.deepgram.stt import DeepgramSTTService
 from pipecat.services.deepgram.tts import DeepgramTTSService
-from pipecat.transports.base_transport import TransportParams
+from pipecat.services.llm_service import LLMService
+from pipecat.services.stt_service import STTService
+from pipecat.services.tts_service import TTSService
+from pipecat.transports.base_transport import BaseTransport, TransportParams
 from pipecat.transports.smallwebrtc.connection import SmallWebRTCConnection
 from pipecat.transports.smallwebrtc.request_handler import (
     SmallWebRTCPatchRequest,
@@ -63,12 +85,37 @@ from pipecat.transports.smallwebrtc.request_handler import (
 )
 from pipecat.transports.smallwebrtc.transport import SmallWebRTCTransport
 
+from audio_bus import AudioBus, AudioBusListener, AudioBusOutputTransport
+from latency_trace import TurnLatencyObserver
+from llm_usage import PromptCacheObserver
+
 # ---------------------------------------------------------------------------
 # Default debate config (overridden by UI)
 # ---------------------------------------------------------------------------
 
 MAX_TURNS = 20
 
+# Debate LLM settings, shared by the live pipeline and debate_render.py
+DEBATE_MODEL = "claude-sonnet-4-5-20250929"
+DEBATE_TEMPERATURE = 0.9
+DEBATE_MAX_TOKENS = 150
+
+# Generate the next speaker while the current one is still talking and switch
+# on bot-stopped-speaking; "0" restores the fixed pause between turns
+DEBATE_PIPELINED = os.getenv("DEBATE_PIPELINED", "1") == "1"
+
+# A debate turn that hasn't produced audio this long after it was due to
+# start playing is skipped
+TURN_AUDIO_TIMEOUT_SECS = float(os.getenv("DEBATE_TURN_AUDIO_TIMEOUT_SECS", "10"))
+
+# Broadcast mode: every connection listens to a shared debate in its room
+# (request body "room", else DEFAULT_ROOM) instead of getting its own
+DEBATE_ROOMS = os.getenv("DEBATE_ROOMS", "0") == "1"
+DEFAULT_ROOM = "main"
+
+# Frame metadata key with the voice (TTS lane) a debate frame belongs to
+VOICE_METADATA_KEY = "debate_voice"
+
 debate_config = {
     "topic": "Will artificial intelligence ultimately be a net positive or net negative for humanity?",
     "bot_a_name": "Nova",
@@ -85,36 +132,43 @@ debate_config = {
 # ---------------------------------------------------------------------------
 
 
-class DebateManager(FrameProcessor):
-    """Manages turn-taking between two arguing bots.
+@dataclass
+class DebateTurnFrame(ControlFrame):
+    """Marks where a debate turn starts; routes it to ``voice`` and opens it at the gate."""
 
-    Sits after the LLM in the pipeline. Collects LLM output text, and when
-    the response ends, switches to the other bot and triggers a new turn
-    by queuing an LLMContextFrame via the pipeline task.
+    turn: int
+    speaker: str
+    voice: str
+
+
+@dataclass
+class DebateTurnFailedFrame(ControlFrame):
+    """Tells DebatePlaybackGate a turn's TTS failed, or (with ``turn``) that it stayed silent.
+
+    Without ``turn`` it applies to the turn of the TTS lane it comes out of.
     """
 
-    def __init__(self, tts: DeepgramTTSService, task_ref: list, config: dict, **kwargs):
-        super().__init__(**kwargs)
-        self._tts = tts
-        self._task_ref = task_ref
-        self._config = config
+    reason: str
+    turn: Optional[int] = None
 
-        # Per-bot conversation histories
-        self._history_a: list[dict] = []
-        self._history_b: list[dict] = []
 
-        self._current_bot = "A"
-        self._turn_count = 0
-        self._debating = False
+class DebateHistory:
+    """The two bots' conversation histories and whose turn it is.
 
-        self._response_text = ""
-        self._collecting = False
+    Each bot sees its own replies as assistant turns and the other bot's as
+    user turns. Used by DebateManager in the live pipeline and by
+    debate_render.py offline.
+    """
 
-    @property
-    def _task(self) -> PipelineTask:
-        return self._task_ref[0]
+    def __init__(self, config: dict):
+        self._config = config
+        self.history_a: list[dict] = []
+        self.history_b: list[dict] = []
+        self.current_bot = "A"
+        self.turn = 0
 
-    def _system_prompt(self, name: str, role: str) -> str:
+    @staticmethod
+    def system_prompt(name: str, role: str) -> str:
         return (
             f"You are {name}, {role} in a live voice debate. "
             "Argue with conviction and directly counter your opponent's points. "
@@ -123,33 +177,130 @@ class DebateManager(FrameProcessor):
             "Address your opponent directly."
         )
 
-    async def start_debate(self):
-        """Kick off the debate with Bot A's opening statement."""
+    def start(self):
+        """Reset to Bot A's opening statement."""
         cfg = self._config
-        self._debating = True
-        self._current_bot = "A"
-        self._turn_count = 0
+        self.current_bot = "A"
+        self.turn = 0
 
-        sys_a = self._system_prompt(cfg["bot_a_name"], cfg["bot_a_role"])
-        sys_b = self._system_prompt(cfg["bot_b_name"], cfg["bot_b_role"])
+        sys_a = self.system_prompt(cfg["bot_a_name"], cfg["bot_a_role"])
+        sys_b = self.system_prompt(cfg["bot_b_name"], cfg["bot_b_role"])
 
         opening_user_msg = (
             f"The debate topic is: {cfg['topic']}\n\n"
             "You are going first. Make your opening argument."
         )
-        self._history_a = [
+        self.history_a = [
             {"role": "system", "content": sys_a},
             {"role": "user", "content": opening_user_msg},
         ]
-        self._history_b = [
+        self.history_b = [
             {"role": "system", "content": sys_b},
         ]
 
-        self._tts.set_voice(cfg["bot_a_voice"])
+    def record(self, response: str) -> bool:
+        """Record the current bot's response and switch bots. False ends the debate."""
+        self.turn += 1
+        if self.turn >= MAX_TURNS:
+            logger.info("Debate concluded after max turns")
+            return False
+
+        response = response.strip()
+        if not response:
+            logger.warning("Empty response from bot, ending debate")
+            return False
+
+        cfg = self._config
+
+        if self.current_bot == "A":
+            self.history_a.append({"role": "assistant", "content": response})
+            self.history_b.append(
+                {"role": "user", "content": f"{cfg['bot_a_name']} said: {response}"}
+            )
+            self.current_bot = "B"
+        else:
+            self.history_b.append({"role": "assistant", "content": response})
+            self.history_a.append(
+                {"role": "user", "content": f"{cfg['bot_b_name']} said: {response}"}
+            )
+            self.current_bot = "A"
+        return True
+
+    def interject(self, text: str):
+        """Add an audience comment to both bots' histories."""
+        audience_msg = f"[Audience member says: {text}]"
+        self.history_a.append({"role": "user", "content": audience_msg})
+        self.history_b.append({"role": "user", "content": audience_msg})
+
+    def speaker(self) -> tuple[str, str]:
+        """Name and voice of the bot whose turn is next."""
+        cfg = self._config
+        if self.current_bot == "A":
+            return cfg["bot_a_name"], cfg["bot_a_voice"]
+        return cfg["bot_b_name"], cfg["bot_b_voice"]
+
+    def messages(self) -> list[dict]:
+        """A copy of the next speaker's history, system prompt first."""
+        return list(self.history_a if self.current_bot == "A" else self.history_b)
+
 
-        ctx = LLMContext(messages=list(self._history_a))
-        await self._task.queue_frames([LLMContextFrame(context=ctx)])
-        logger.info(f"Debate started — {cfg['bot_a_name']} goes first")
+class DebateManager(FrameProcessor):
+    """Manages turn-taking between two arguing bots.
+
+    Sits after the LLM in the pipeline. Collects LLM output text, and when
+    the response ends, switches to the other bot and triggers a new turn
+    by queuing an LLMContextFrame via the pipeline task.
+
+    Every turn opens with a DebateTurnFrame and a voice update, sent in-band
+    ahead of its text. In pipelined mode the next turn is requested as soon
+    as the current turn's text is complete, and a DebatePlaybackGate after
+    the TTS holds its audio until the current turn has finished playing. Only
+    one turn is generated ahead of the one playing, so audience interjections
+    still reach the next turn's prompt.
+
+    Fires ``on_debate_ended`` once the last turn's text is in.
+    """
+
+    def __init__(
+        self,
+        task_ref: list,
+        config: dict,
+        *,
+        pipelined: bool = DEBATE_PIPELINED,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._task_ref = task_ref
+        self._config = config
+        self._pipelined = pipelined
+
+        self._history = DebateHistory(config)
+        self._debating = False
+
+        self._response_text = ""
+        self._collecting = False
+
+        # Pipelined mode: turn now playing, and whether the next one is due
+        self._playing_turn = 0
+        self._next_turn_pending = False
+
+        self._register_event_handler("on_debate_ended")
+
+    @property
+    def _task(self) -> PipelineTask:
+        return self._task_ref[0]
+
+    async def start_debate(self):
+        """Kick off the debate with Bot A's opening statement."""
+        self._debating = True
+        self._history.start()
+        self._playing_turn = 0
+        self._next_turn_pending = False
+
+        await self._task.queue_frames(
+            [*self._turn_frames(), LLMContextFrame(context=self._context())]
+        )
+        logger.info(f"Debate started — {self._config['bot_a_name']} goes first")
 
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         await super().process_frame(frame, direction)
@@ -169,110 +320,398 @@ class DebateManager(FrameProcessor):
             await self.push_frame(frame, direction)
 
             if self._debating:
-                asyncio.create_task(self._next_turn())
+                if self._pipelined:
+                    await self._prepare_next_turn()
+                else:
+                    asyncio.create_task(self._next_turn())
 
         elif isinstance(frame, TranscriptionFrame):
             # In bot-to-bot mode mic is muted, but if user somehow speaks
             # we still handle it gracefully
             if self._debating and frame.text and frame.text.strip():
                 logger.info(f"User interjected: {frame.text}")
-                audience_msg = f"[Audience member says: {frame.text.strip()}]"
-                self._history_a.append({"role": "user", "content": audience_msg})
-                self._history_b.append({"role": "user", "content": audience_msg})
+                self._history.interject(frame.text.strip())
         else:
             await self.push_frame(frame, direction)
 
+    async def _advance(self) -> bool:
+        """Record the finished response and switch bots. False ends the debate."""
+        if not self._history.record(self._response_text):
+            self._debating = False
+            await self._call_event_handler("on_debate_ended")
+            return False
+        return True
+
+    def _turn_frames(self) -> list[Frame]:
+        """The frames that open the next turn, ahead of its text."""
+        bot_name, voice = self._history.speaker()
+        return [
+            DebateTurnFrame(turn=self._history.turn, speaker=bot_name, voice=voice),
+            TTSUpdateSettingsFrame(settings={"voice": voice}),
+        ]
+
+    def _context(self) -> LLMContext:
+        return LLMContext(messages=self._history.messages())
+
     async def _next_turn(self):
         """Switch to the other bot and trigger a new LLM call."""
         await asyncio.sleep(0.8)
 
-        self._turn_count += 1
-        if self._turn_count >= MAX_TURNS:
-            self._debating = False
-            logger.info("Debate concluded after max turns")
+        if not await self._advance():
             return
 
-        response = self._response_text.strip()
-        if not response:
-            logger.warning("Empty response from bot, ending debate")
-            self._debating = False
+        bot_name, _ = self._history.speaker()
+        logger.info(f"Turn {self._history.turn}/{MAX_TURNS} — {bot_name} is up")
+        await self._task.queue_frames(
+            [*self._turn_frames(), LLMContextFrame(context=self._context())]
+        )
+
+    async def _prepare_next_turn(self):
+        """Pipelined mode: line up the other bot as soon as this turn's text is done."""
+        if not await self._advance():
             return
 
-        cfg = self._config
+        # Right behind this turn's text, so the TTS stage and the gate see
+        # where the next turn starts before its text exists
+        for frame in self._turn_frames():
+            await self.push_frame(frame)
+        self._next_turn_pending = True
+        await self._maybe_request_next_turn()
+
+    async def on_turn_started(self, turn: int):
+        """Called by DebatePlaybackGate when ``turn`` starts playing."""
+        self._playing_turn = turn
+        await self._maybe_request_next_turn()
+
+    async def _maybe_request_next_turn(self):
+        # Generate at most one turn ahead of the one playing
+        if not self._next_turn_pending or self._playing_turn < self._history.turn - 1:
+            return
+        self._next_turn_pending = False
+
+        bot_name, _ = self._history.speaker()
+        logger.info(f"Turn {self._history.turn}/{MAX_TURNS} — {bot_name} is up next")
+        await self._task.queue_frames([LLMContextFrame(context=self._context())])
+
+
+class _VoiceTag(FrameProcessor):
+    """Tags the frames leaving one TTS lane of a DebateTTSRouter with its voice."""
+
+    def __init__(self, voice: str, **kwargs):
+        super().__init__(**kwargs)
+        self._voice = voice
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if direction == FrameDirection.DOWNSTREAM and not isinstance(
+            frame, (SystemFrame, EndFrame)
+        ):
+            frame.metadata.setdefault(VOICE_METADATA_KEY, self._voice)
+        await self.push_frame(frame, direction)
+
+
+class DebateTTSRouter(ParallelPipeline):
+    """Sends each debate turn to the TTS instance for its speaker's voice.
+
+    One lane per voice, so each debater keeps its own warm TTS connection and
+    the next speaker's turn can be synthesized while the current one is still
+    playing. A DebateTurnFrame selects the lane for everything that follows
+    it; frames leaving a lane are tagged with its voice for DebatePlaybackGate.
+    System and lifecycle frames (and everything upstream, such as
+    BotStoppedSpeakingFrame) reach every lane.
+    """
+
+    def __init__(self, pool: dict[str, TTSService]):
+        if not pool:
+            raise ValueError("DebateTTSRouter needs at least one TTS service")
+        super().__init__(
+            *[
+                [FunctionFilter(self._lane_filter(voice)), tts, _VoiceTag(voice)]
+                for voice, tts in pool.items()
+            ]
+        )
+        self._voices = list(pool)
+        self._voice = self._voices[0]
+
+    @staticmethod
+    def _lane_filter(voice: str):
+        async def routed_here(frame: Frame) -> bool:
+            return frame.metadata.get(VOICE_METADATA_KEY) == voice
+
+        return routed_here
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        # Route before fanning out, since the lanes process frames concurrently
+        if direction == FrameDirection.DOWNSTREAM and not isinstance(
+            frame, (SystemFrame, EndFrame)
+        ):
+            if isinstance(frame, DebateTurnFrame):
+                if frame.voice in self._voices:
+                    self._voice = frame.voice
+                else:
+                    logger.warning(f"{self}: no TTS for voice {frame.voice}, using {self._voice}")
+            frame.metadata[VOICE_METADATA_KEY] = self._voice
+        await super().process_frame(frame, direction)
+
+
+class DebatePlaybackGate(FrameProcessor):
+    """Holds each debate turn's output until the previous turn has finished playing.
+
+    Sits between the TTS stage and the output transport. A DebateTurnFrame
+    opens a turn; until the current turn is over, the new turn's frames are
+    buffered, so the next turn can be synthesized ahead without talking over
+    the current one. Behind a DebateTTSRouter the lanes' frames arrive
+    interleaved, and each frame's voice tag tells which turn it belongs to.
+
+    A turn is over once its output has ended (its LLMFullResponseEndFrame has
+    passed and its TTS has stopped, or reported an error; see watch()) and the
+    bot is no longer speaking, so a pause inside a turn doesn't let the next
+    one in. A turn with no audio ``audio_timeout`` seconds after it started
+    is skipped.
+    """
+
+    def __init__(
+        self,
+        on_turn_started: Callable[[int], Awaitable[None]],
+        *,
+        audio_timeout: float = TURN_AUDIO_TIMEOUT_SECS,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._on_turn_started = on_turn_started
+        self._audio_timeout = audio_timeout
+        self._bot_speaking = False
+        # The turn playing (None between turns), how far its output has got,
+        # whether it passed audio on and whether the bot then started speaking
+        self._turn: Optional[int] = None
+        self._response_ended = False
+        self._tts_active = False
+        self._timed_out = False
+        self._audible = False
+        self._heard = False
+        self._watchdog: Optional[asyncio.TimerHandle] = None
+        # Latest turn opened overall and per lane; held frames of turns not started yet
+        self._latest_turn = 0
+        self._lane_turns: dict[Optional[str], int] = {}
+        self._pending: dict[int, list[tuple[Frame, FrameDirection]]] = {}
+        self._released_at: Optional[float] = None
+
+    def watch(self, tts: TTSService):
+        """Treat an error from ``tts`` as the end of its output for the turn."""
+
+        @tts.event_handler("on_error")
+        async def on_error(processor, error):
+            # In-band, so it lands in the turn the failed text belongs to
+            await processor.push_frame(DebateTurnFailedFrame(reason=error.error))
+
+    async def cleanup(self):
+        await super().cleanup()
+        self._stop_watchdog()
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, BotStartedSpeakingFrame):
+            self._bot_speaking = True
+            if self._audible:
+                self._heard = True
+            if self._released_at is not None:
+                gap = time.monotonic() - self._released_at
+                logger.info(f"{self}: next turn audible {gap * 1000:.0f}ms after bot stopped")
+                self._released_at = None
+            await self.push_frame(frame, direction)
+
+        elif isinstance(frame, BotStoppedSpeakingFrame):
+            self._bot_speaking = False
+            await self.push_frame(frame, direction)
+            await self._maybe_end_turn()
+
+        elif isinstance(frame, InterruptionFrame):
+            # Drop the held audio but keep the turn boundaries
+            for held in self._pending.values():
+                held.clear()
+            await self.push_frame(frame, direction)
+
+        elif direction == FrameDirection.UPSTREAM or isinstance(frame, SystemFrame):
+            await self.push_frame(frame, direction)
+
+        elif isinstance(frame, DebateTurnFrame):
+            self._lane_turns[frame.metadata.get(VOICE_METADATA_KEY)] = frame.turn
+            self._latest_turn = max(self._latest_turn, frame.turn)
+            if self._pending or self._turn is not None:
+                self._pending[frame.turn] = []
+            else:
+                await self._start_turn(frame.turn)
+
+        elif isinstance(frame, DebateTurnFailedFrame) and frame.turn is not None:
+            # From the watchdog; stale if the turn has started playing since
+            if frame.turn == self._turn and not self._audible:
+                logger.warning(f"{self}: skipping debate turn {frame.turn}: {frame.reason}")
+                self._timed_out = True
+                await self._maybe_end_turn()
 
-        if self._current_bot == "A":
-            self._history_a.append({"role": "assistant", "content": response})
-            self._history_b.append(
-                {"role": "user", "content": f"{cfg['bot_a_name']} said: {response}"}
-            )
-            self._current_bot = "B"
-            self._tts.set_voice(cfg["bot_b_voice"])
-            ctx = LLMContext(messages=list(self._history_b))
         else:
-            self._history_b.append({"role": "assistant", "content": response})
-            self._history_a.append(
-                {"role": "user", "content": f"{cfg['bot_b_name']} said: {response}"}
-            )
-            self._current_bot = "A"
-            self._tts.set_voice(cfg["bot_a_voice"])
-            ctx = LLMContext(messages=list(self._history_a))
+            # Untagged frames (EndFrame) queue behind the latest turn
+            lane = frame.metadata.get(VOICE_METADATA_KEY)
+            turn = self._lane_turns.get(lane, self._latest_turn)
+            if turn in self._pending:
+                self._pending[turn].append((frame, direction))
+            else:
+                await self._pass(frame, direction, turn)
+
+    async def _start_turn(self, turn: int):
+        held = self._pending.pop(turn, [])
+        self._turn = turn
+        self._response_ended = False
+        self._tts_active = False
+        self._timed_out = False
+        self._audible = False
+        self._heard = False
+        self._watchdog = asyncio.get_running_loop().call_later(
+            self._audio_timeout, self._on_watchdog, turn
+        )
+        await self._on_turn_started(turn)
+        for frame, direction in held:
+            await self._pass(frame, direction, turn)
+        await self._maybe_end_turn()
+
+    async def _pass(self, frame: Frame, direction: FrameDirection, turn: int):
+        current = turn == self._turn
+        if isinstance(frame, DebateTurnFailedFrame):
+            if current:
+                logger.warning(f"{self}: TTS failed in debate turn {turn}: {frame.reason}")
+                self._tts_active = False
+                await self._maybe_end_turn()
+            return
 
-        bot_name = cfg["bot_a_name"] if self._current_bot == "A" else cfg["bot_b_name"]
-        logger.info(f"Turn {self._turn_count}/{MAX_TURNS} — {bot_name} is up")
-        await self._task.queue_frames([LLMContextFrame(context=ctx)])
+        if current:
+            if isinstance(frame, OutputAudioRawFrame):
+                self._audible = True
+                self._stop_watchdog()
+            elif isinstance(frame, TTSStartedFrame):
+                self._tts_active = True
+            elif isinstance(frame, TTSStoppedFrame):
+                self._tts_active = False
+            elif isinstance(frame, LLMFullResponseEndFrame):
+                self._response_ended = True
+        await self.push_frame(frame, direction)
+        if current and isinstance(frame, (TTSStoppedFrame, LLMFullResponseEndFrame)):
+            await self._maybe_end_turn()
+
+    async def _maybe_end_turn(self):
+        if self._turn is None or self._bot_speaking:
+            return
+        if not self._timed_out and (self._tts_active or not self._response_ended):
+            return
+        if self._audible and not self._heard:
+            # Its audio is on its way to the transport but hasn't started playing
+            return
 
+        self._turn = None
+        self._stop_watchdog()
+        if self._pending:
+            self._released_at = time.monotonic()
+            await self._start_turn(min(self._pending))
 
-# ---------------------------------------------------------------------------
-# Bot pipeline
-# ---------------------------------------------------------------------------
+    def _on_watchdog(self, turn: int):
+        self._watchdog = None
+        reason = f"no audio after {self._audio_timeout:.0f}s"
+        self.create_task(self.queue_frame(DebateTurnFailedFrame(reason=reason, turn=turn)))
 
+    def _stop_watchdog(self):
+        if self._watchdog:
+            self._watchdog.cancel()
+            self._watchdog = None
 
-async def run_debate_bot(connection: SmallWebRTCConnection, config: dict):
-    """Build and run the debate pipeline for one WebRTC session."""
 
-    transport = SmallWebRTCTransport(
-        webrtc_connection=connection,
-        params=TransportParams(
-            audio_in_enabled=True,
-            audio_out_enabled=True,
-        ),
-    )
+# ---------------------------------------------------------------------------
+# Bot pipeline
+# ---------------------------------------------------------------------------
 
-    stt = DeepgramSTTService(api_key=DEEPGRAM_API_KEY)
 
-    llm = AnthropicLLMService(
+def _debate_task(
+    config: dict,
+    head: list[FrameProcessor],
+    tail: list[FrameProcessor],
+    *,
+    llm: Optional[LLMService] = None,
+    tts: Optional[TTSService] = None,
+    tts_pool: Optional[dict[str, TTSService]] = None,
+    observers: Optional[list[BaseObserver]] = None,
+    pipelined: bool = DEBATE_PIPELINED,
+) -> tuple[PipelineTask, DebateManager]:
+    """The debate stages (LLM, DebateManager, TTS, playback gate) between ``head`` and ``tail``."""
+    llm = llm or AnthropicLLMService(
         api_key=ANTHROPIC_API_KEY,
-        model="claude-sonnet-4-5-20250929",
+        model=DEBATE_MODEL,
         params=AnthropicLLMService.InputParams(
-            temperature=0.9,
-            max_tokens=150,
+            temperature=DEBATE_TEMPERATURE,
+            max_tokens=DEBATE_MAX_TOKENS,
+            # Each bot's system prompt and history so far are re-read from cache
+            enable_prompt_caching=True,
         ),
     )
 
-    tts = DeepgramTTSService(
-        api_key=DEEPGRAM_API_KEY,
-        voice=config["bot_a_voice"],
-    )
+    if tts is None:
+        voices = dict.fromkeys([config["bot_a_voice"], config["bot_b_voice"]])
+        tts_pool = tts_pool or {
+            voice: DeepgramTTSService(api_key=DEEPGRAM_API_KEY, voice=voice) for voice in voices
+        }
+        tts_services = list(tts_pool.values())
+        tts = DebateTTSRouter(tts_pool)
+    else:
+        tts_services = [tts]
 
     task_ref: list[PipelineTask] = []
-    debate_manager = DebateManager(tts=tts, task_ref=task_ref, config=config)
-
-    pipeline = Pipeline(
-        [
-            transport.input(),
-            stt,
-            llm,
-            debate_manager,
-            tts,
-            transport.output(),
-        ]
-    )
+    debate_manager = DebateManager(task_ref=task_ref, config=config, pipelined=pipelined)
+    playback_gate = DebatePlaybackGate(debate_manager.on_turn_started)
+    for service in tts_services:
+        playback_gate.watch(service)
+
+    pipeline = Pipeline([*head, llm, debate_manager, tts, playback_gate, *tail])
 
     task = PipelineTask(
         pipeline,
         params=PipelineParams(enable_metrics=True, enable_usage_metrics=True),
+        # Turns are generated ahead of playback, so audio milestones can't be
+        # tied to a request; DebatePlaybackGate logs the gaps between turns
+        observers=observers
+        or [PromptCacheObserver(), TurnLatencyObserver("debate", text_only=True)],
     )
     task_ref.append(task)
+    return task, debate_manager
+
+
+def build_debate_task(
+    transport: BaseTransport,
+    config: dict,
+    *,
+    stt: Optional[STTService] = None,
+    llm: Optional[LLMService] = None,
+    tts: Optional[TTSService] = None,
+    tts_pool: Optional[dict[str, TTSService]] = None,
+    observers: Optional[list[BaseObserver]] = None,
+    pipelined: bool = DEBATE_PIPELINED,
+) -> PipelineTask:
+    """Build the debate pipeline task on ``transport``.
+
+    Services default to Deepgram / Anthropic / Deepgram; replay_harness.py
+    passes local stand-ins. Speech goes through ``tts_pool`` (voice -> TTS
+    service, one Deepgram connection per debater by default), or through the
+    single ``tts`` service, switching its voice every turn, if that is given.
+    """
+    stt = stt or DeepgramSTTService(api_key=DEEPGRAM_API_KEY)
+
+    task, debate_manager = _debate_task(
+        config,
+        [transport.input(), stt],
+        [transport.output()],
+        llm=llm,
+        tts=tts,
+        tts_pool=tts_pool,
+        observers=observers,
+        pipelined=pipelined,
+    )
 
     @transport.event_handler("on_client_connected")
     async def on_client_connected(transport, client):
@@ -284,10 +723,150 @@ async def run_debate_bot(connection: SmallWebRTCConnection, config: dict):
         logger.info("Client disconnected")
         await task.cancel()
 
+    return task
+
+
+async def run_debate_bot(connection: SmallWebRTCConnection, config: dict):
+    """Build and run the debate pipeline for one WebRTC session."""
+
+    transport = SmallWebRTCTransport(
+        webrtc_connection=connection,
+        params=TransportParams(
+            audio_in_enabled=True,
+            audio_out_enabled=True,
+        ),
+    )
+
+    task = build_debate_task(transport, config)
     runner = PipelineRunner(handle_sigint=False)
     await runner.run(task)
 
 
+# ---------------------------------------------------------------------------
+# Broadcast rooms — one debate pipeline for every listener
+# ---------------------------------------------------------------------------
+
+debate_rooms: dict[str, "DebateRoom"] = {}
+
+
+class DebateRoom:
+    """One debate, generated once and broadcast to every listener in the room.
+
+    The debate pipeline plays into an AudioBus instead of a client transport,
+    and each listener's WebRTC connection only runs a bus -> output pipeline,
+    so LLM and TTS cost doesn't grow with the audience. Listeners can't
+    interject. The debate starts with the first connected listener, late
+    joiners hear it from where it is, and it stops when the last one leaves.
+    Once the debate is over the room hangs up on its listeners.
+
+    A room runs one debate only. Once it has closed (emptied or finished),
+    whoever connects to the room's name gets a new room.
+    """
+
+    def __init__(self, name: str, config: dict):
+        self.name = name
+        self._config = config
+        self._bus = AudioBus()
+        # Pipelines of the connected listeners
+        self._listeners: set[PipelineTask] = set()
+        self._task: Optional[PipelineTask] = None
+        self._closed = False
+
+    async def listen(self, connection: SmallWebRTCConnection):
+        """Play the room to one WebRTC listener until they disconnect."""
+        transport = SmallWebRTCTransport(
+            webrtc_connection=connection,
+            params=TransportParams(audio_out_enabled=True),
+        )
+        bus_listener = AudioBusListener(self._bus)
+        task = PipelineTask(Pipeline([bus_listener, transport.output()]))
+        room: Optional[DebateRoom] = None
+
+        @transport.event_handler("on_client_connected")
+        async def on_client_connected(transport, client):
+            nonlocal room
+            room = self._join(task)
+            if room is not self:
+                await bus_listener.set_bus(room._bus)
+
+        @transport.event_handler("on_client_disconnected")
+        async def on_client_disconnected(transport, client):
+            await task.cancel()
+
+        try:
+            await PipelineRunner(handle_sigint=False).run(task)
+        finally:
+            if room:
+                await room._leave(task)
+
+    def _join(self, listener: PipelineTask) -> "DebateRoom":
+        """Add ``listener`` to the room, or to the one replacing it; returns the room joined."""
+        if self._closed:
+            # Closed while this listener was connecting
+            return debate_room(self.name, self._config)._join(listener)
+
+        self._listeners.add(listener)
+        logger.info(f"Room {self.name}: listener joined ({len(self._listeners)} listening)")
+        if self._task is None:
+            task, debate_manager = _debate_task(
+                self._config,
+                [],
+                [AudioBusOutputTransport(self._bus, TransportParams(audio_out_enabled=True))],
+            )
+
+            @task.event_handler("on_pipeline_started")
+            async def on_pipeline_started(task, frame):
+                await debate_manager.start_debate()
+
+            @debate_manager.event_handler("on_debate_ended")
+            async def on_debate_ended(manager):
+                # Late joiners get a new debate; this one plays out its last turn
+                self._close()
+                await task.queue_frame(EndFrame())
+
+            self._task = task
+            asyncio.create_task(self._run(task))
+        return self
+
+    async def _leave(self, listener: PipelineTask):
+        self._listeners.discard(listener)
+        logger.info(f"Room {self.name}: listener left ({len(self._listeners)} listening)")
+        if not self._listeners and self._task:
+            logger.info(f"Room {self.name}: empty, stopping the debate")
+            # Closed before awaiting the cancel, so a listener joining meanwhile
+            # starts a fresh debate instead of joining the one shutting down
+            task, self._task = self._task, None
+            self._close()
+            await task.cancel()
+
+    async def _run(self, task: PipelineTask):
+        try:
+            await PipelineRunner(handle_sigint=False).run(task)
+        finally:
+            self._close()
+            self._task = None
+            for listener in list(self._listeners):
+                await listener.queue_frame(EndFrame())
+
+    def _close(self):
+        self._closed = True
+        if debate_rooms.get(self.name) is self:
+            del debate_rooms[self.name]
+
+
+def debate_room(name: str, config: dict) -> DebateRoom:
+    """The open room called ``name``, created with ``config`` if there is none."""
+    room = debate_rooms.get(name)
+    if room is None:
+        room = debate_rooms[name] = DebateRoom(name, config)
+    return room
+
+
+async def run_debate_listener(connection: SmallWebRTCConnection, config: dict, room: str):
+    """Join ``room`` (creating it with ``config`` if it isn't running) as a listener."""
+    await debate_room(room, config).listen(connection)
+
+
 # ---------------------------------------------------------------------------
 # FastAPI app
 # ---------------------------------------------------------------------------
@@ -367,7 +946,12 @@ async def offer(request: SmallWebRTCRequest, background_tasks: BackgroundTasks):
 
     async def on_connection(connection: SmallWebRTCConnection):
         config_snapshot = dict(debate_config)
-        background_tasks.add_task(run_debate_bot, connection, config_snapshot)
+        if DEBATE_ROOMS:
+            request_data = request.request_data if isinstance(request.request_data, dict) else {}
+            room = request_data.get("room") or DEFAULT_ROOM
+            background_tasks.add_task(run_debate_listener, connection, config_snapshot, room)
+        else:
+            background_tasks.add_task(run_debate_bot, connection, config_snapshot)
 
     answer = await small_webrtc_handler.handle_web_request(
         request=request,
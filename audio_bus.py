@@ -0,0 +1,191 @@
+"""Fan one pipeline's audio output out to many listener pipelines.
+
+A broadcast generates its audio once, into an AudioBusOutputTransport, which
+plays it out in real time onto an AudioBus. Each listener pipeline starts with
+an AudioBusListener that pushes the bus audio to its own output transport:
+
+    bus = AudioBus()
+    Pipeline([llm, tts, AudioBusOutputTransport(bus, TransportParams(audio_out_enabled=True))])
+    Pipeline([AudioBusListener(bus), listener_transport.output()])
+
+Every listener has a bounded queue and takes audio from it in real time, so
+its backlog stays in that queue rather than in the pipeline's. A listener that
+falls behind loses its oldest audio instead of holding up the broadcast or the
+other listeners.
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from loguru import logger
+
+from pipecat.frames.frames import (
+    CancelFrame,
+    EndFrame,
+    Frame,
+    OutputAudioRawFrame,
+    StartFrame,
+)
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.transports.base_output import BaseOutputTransport
+from pipecat.transports.base_transport import TransportParams
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+# Audio a listener may lag behind the broadcast before its oldest chunks are
+# dropped
+LISTENER_BUFFER_SECS = float(os.getenv("AUDIO_BUS_LISTENER_BUFFER_SECS", "2"))
+
+# How far ahead of real time a listener hands audio to its output transport
+LISTENER_LEAD_SECS = 0.2
+
+
+@dataclass(frozen=True)
+class AudioChunk:
+    audio: bytes
+    sample_rate: int
+    num_channels: int
+
+    @property
+    def duration(self) -> float:
+        return len(self.audio) / (2 * self.num_channels * self.sample_rate)
+
+
+class _Subscription:
+    def __init__(self, max_secs: float):
+        self.queue: asyncio.Queue[AudioChunk] = asyncio.Queue()
+        self.max_secs = max_secs
+        self.buffered_secs = 0.0
+        self.dropped_secs = 0.0
+
+
+class AudioBus:
+    """Broadcasts audio chunks to any number of subscribers."""
+
+    def __init__(self):
+        self._subscriptions: set[_Subscription] = set()
+
+    @property
+    def listeners(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(self, max_secs: float = LISTENER_BUFFER_SECS) -> _Subscription:
+        subscription = _Subscription(max_secs)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: _Subscription):
+        self._subscriptions.discard(subscription)
+        if subscription.dropped_secs:
+            logger.info(
+                f"Audio bus listener left after dropping {subscription.dropped_secs:.1f}s of audio"
+            )
+
+    def publish(self, chunk: AudioChunk):
+        """Queue ``chunk`` for every subscriber; never blocks."""
+        for subscription in self._subscriptions:
+            queue = subscription.queue
+            while not queue.empty() and subscription.buffered_secs + chunk.duration > (
+                subscription.max_secs
+            ):
+                dropped = queue.get_nowait()
+                subscription.buffered_secs -= dropped.duration
+                if not subscription.dropped_secs:
+                    logger.warning("Audio bus listener is falling behind, dropping audio")
+                subscription.dropped_secs += dropped.duration
+            queue.put_nowait(chunk)
+            subscription.buffered_secs += chunk.duration
+
+
+class AudioBusOutputTransport(BaseOutputTransport):
+    """Output transport that plays audio onto an AudioBus in real time.
+
+    Paced like a real output device, so bot speaking events and anything that
+    waits on them behave as they would in front of a single listener.
+    """
+
+    def __init__(self, bus: AudioBus, params: TransportParams, **kwargs):
+        super().__init__(params, **kwargs)
+        self._bus = bus
+        self._play_until = 0.0
+
+    async def start(self, frame: StartFrame):
+        await super().start(frame)
+        await self.set_transport_ready(frame)
+
+    async def write_audio_frame(self, frame: OutputAudioRawFrame) -> bool:
+        chunk = AudioChunk(frame.audio, frame.sample_rate, frame.num_channels)
+        self._bus.publish(chunk)
+        # Keep a steady schedule across chunks so timer jitter doesn't add up
+        now = time.monotonic()
+        self._play_until = max(self._play_until, now) + chunk.duration
+        await asyncio.sleep(self._play_until - now)
+        return True
+
+
+class AudioBusListener(FrameProcessor):
+    """Pushes the audio published on an AudioBus downstream, from StartFrame until the end."""
+
+    def __init__(self, bus: AudioBus, *, max_secs: float = LISTENER_BUFFER_SECS, **kwargs):
+        super().__init__(**kwargs)
+        self._bus = bus
+        self._max_secs = max_secs
+        self._subscription: Optional[_Subscription] = None
+        self._play_task: Optional[asyncio.Task] = None
+        self._play_until = 0.0
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        await self.push_frame(frame, direction)
+
+        if isinstance(frame, StartFrame):
+            self._subscribe()
+        elif isinstance(frame, (EndFrame, CancelFrame)):
+            await self._stop()
+
+    async def cleanup(self):
+        await super().cleanup()
+        await self._stop()
+
+    async def set_bus(self, bus: AudioBus):
+        """Listen to ``bus`` instead, from now on."""
+        playing = self._subscription is not None
+        await self._stop()
+        self._bus = bus
+        if playing:
+            self._subscribe()
+
+    def _subscribe(self):
+        self._subscription = self._bus.subscribe(self._max_secs)
+        self._play_task = self.create_task(self._play())
+
+    async def _play(self):
+        subscription = self._subscription
+        while True:
+            chunk = await subscription.queue.get()
+            subscription.buffered_secs -= chunk.duration
+            now = time.monotonic()
+            self._play_until = max(self._play_until, now) + chunk.duration
+            ahead = self._play_until - now - chunk.duration - LISTENER_LEAD_SECS
+            if ahead > 0:
+                await asyncio.sleep(ahead)
+            await self.push_frame(
+                OutputAudioRawFrame(
+                    audio=chunk.audio,
+                    sample_rate=chunk.sample_rate,
+                    num_channels=chunk.num_channels,
+                )
+            )
+
+    async def _stop(self):
+        if self._play_task:
+            await self.cancel_task(self._play_task)
+            self._play_task = None
+        if self._subscription:
+            self._bus.unsubscribe(self._subscription)
+            self._subscription = None
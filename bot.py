@@ -1,19 +1,22 @@
 """Common bot logic: Deepgram STT, Anthropic Claude LLM, Deepgram TTS.
 
-This module exposes run_bot() which builds the full pipeline.
+This module exposes run_bot() which builds and runs the full pipeline, and
+build_bot_task() which only builds it (replay_harness.py runs it offline).
 Use default_runner.py as the entry point.
 """
 
 import os
+from typing import Optional
 
+import anthropic
 from dotenv import load_dotenv
 from loguru import logger
 
 load_dotenv(override=True)
 
-from pipecat.audio.vad.silero import SileroVADAnalyzer
 from pipecat.audio.vad.vad_analyzer import VADParams
 from pipecat.frames.frames import LLMRunFrame
+from pipecat.observers.base_observer import BaseObserver
 from pipecat.pipeline.pipeline import Pipeline
 from pipecat.pipeline.runner import PipelineRunner
 from pipecat.pipeline.task import PipelineParams, PipelineTask
@@ -26,34 +29,52 @@ from pipecat.runner.types import RunnerArguments
 from pipecat.services.anthropic.llm import AnthropicLLMService
 from pipecat.services.deepgram.stt import DeepgramSTTService
 from pipecat.services.deepgram.tts import DeepgramTTSService
+from pipecat.services.llm_service import LLMService
+from pipecat.services.stt_service import STTService
+from pipecat.services.tts_service import TTSService
 from pipecat.transports.base_transport import BaseTransport
 
+from context_window import ContextWindowProcessor
+from latency_trace import TurnLatencyObserver
+from llm_usage import PromptCacheObserver
+from warm_pool import SharedSileroVADAnalyzer, anthropic_client
 
-async def run_bot(
+
+def build_bot_task(
     transport: BaseTransport,
-    runner_args: RunnerArguments,
-):
-    """Build and run the voice-bot pipeline.
+    *,
+    stt: Optional[STTService] = None,
+    llm: Optional[LLMService] = None,
+    tts: Optional[TTSService] = None,
+    observers: Optional[list[BaseObserver]] = None,
+    summary_client: Optional[anthropic.AsyncAnthropic] = None,
+) -> PipelineTask:
+    """Build the voice-bot pipeline task.
 
     Args:
-        transport: The transport to use (WebRTC).
-        runner_args: Pipecat runner arguments.
+        transport: The transport to use (WebRTC, or a replay transport).
+        stt, llm, tts: Service overrides; default to Deepgram / Anthropic / Deepgram.
+        observers: Task observers; default to prompt-cache and latency tracing.
+        summary_client: Client for the context window's summaries; defaults to the
+            shared Anthropic client.
     """
     # Deepgram Speech-to-Text
-    stt = DeepgramSTTService(api_key=os.getenv("DEEPGRAM_API_KEY"))
+    stt = stt or DeepgramSTTService(api_key=os.getenv("DEEPGRAM_API_KEY"))
 
     # Anthropic Claude LLM
-    llm = AnthropicLLMService(
+    llm = llm or AnthropicLLMService(
         api_key=os.getenv("ANTHROPIC_API_KEY"),
         model="claude-sonnet-4-5-20250929",
+        client=anthropic_client(),
         params=AnthropicLLMService.InputParams(
             temperature=0.7,
             max_tokens=200,
+            enable_prompt_caching=True,
         ),
     )
 
     # Deepgram Text-to-Speech
-    tts = DeepgramTTSService(
+    tts = tts or DeepgramTTSService(
         api_key=os.getenv("DEEPGRAM_API_KEY"),
         voice="aura-2-helena-en",
     )
@@ -75,14 +96,20 @@ async def run_bot(
     user_aggregator, assistant_aggregator = LLMContextAggregatorPair(
         context,
         user_params=LLMUserAggregatorParams(
-            vad_analyzer=SileroVADAnalyzer(params=VADParams(stop_secs=0.2)),
+            vad_analyzer=SharedSileroVADAnalyzer(params=VADParams(stop_secs=0.2)),
         ),
     )
 
+    # Keeps per-turn latency flat over long calls
+    context_window = ContextWindowProcessor(
+        keep_turns=6, max_context_tokens=2000, client=summary_client
+    )
+
     pipeline = Pipeline([
         transport.input(),
         stt,
         user_aggregator,
+        context_window,
         llm,
         tts,
         transport.output(),
@@ -90,7 +117,11 @@ async def run_bot(
     ])
 
     pipeline_params = PipelineParams(enable_metrics=True, enable_usage_metrics=True)
-    task = PipelineTask(pipeline, params=pipeline_params)
+    task = PipelineTask(
+        pipeline,
+        params=pipeline_params,
+        observers=observers or [PromptCacheObserver(), TurnLatencyObserver("bot")],
+    )
 
     @transport.event_handler("on_client_connected")
     async def on_client_connected(transport, client):
@@ -103,5 +134,19 @@ async def run_bot(
         logger.info("Client disconnected")
         await task.cancel()
 
+    return task
+
+
+async def run_bot(
+    transport: BaseTransport,
+    runner_args: RunnerArguments,
+):
+    """Build and run the voice-bot pipeline.
+
+    Args:
+        transport: The transport to use (WebRTC).
+        runner_args: Pipecat runner arguments.
+    """
+    task = build_bot_task(transport)
     runner = PipelineRunner(handle_sigint=runner_args.handle_sigint)
     await runner.run(task)
@@ -0,0 +1,198 @@
+"""Bounded LLM context with a rolling summary of older turns.
+
+Without this the LLMContext grows for the whole call, and every turn re-sends
+the full history, so TTFT and token cost creep up as a session goes on.
+
+ContextWindowProcessor sits between the user aggregator and the LLM. It keeps
+the last ``keep_turns`` turns verbatim (fewer if they exceed
+``max_context_tokens``) and folds everything older into a running summary,
+sent as its own message after the system prompt so the prompt stays
+byte-identical and keeps being read from the prompt cache. The summary is
+written by a cheaper model in a background task and swapped in on a later
+turn, so no turn ever waits for it.
+
+    context_window = ContextWindowProcessor(keep_turns=6, max_context_tokens=2000)
+    Pipeline([..., user_aggregator, context_window, llm, ...])
+"""
+
+import os
+from typing import Optional
+
+import anthropic
+from loguru import logger
+
+from pipecat.frames.frames import Frame, LLMContextFrame
+from pipecat.processors.aggregators.llm_context import LLMContext
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from warm_pool import anthropic_client
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+SUMMARY_MODEL = os.getenv("CONTEXT_SUMMARY_MODEL", "claude-haiku-4-5-20251001")
+
+# Rough token estimate for budgeting; close enough for English text
+CHARS_PER_TOKEN = 4
+
+# Turns beyond keep_turns that accumulate before a summary call is made (unless
+# the token budget forces one sooner), so it isn't one call per turn
+FOLD_BATCH_TURNS = 2
+
+SUMMARY_HEADER = "SUMMARY OF THE EARLIER CONVERSATION (the most recent turns follow verbatim):\n"
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You maintain a running summary of a live voice conversation so it can be "
+    "continued without the full transcript. Merge the previous summary with the new "
+    "transcript excerpt into one updated summary. Keep every concrete fact, name, number, "
+    "decision, commitment and open question; drop greetings, filler and repetition. "
+    "Write plain prose, no lists or headings, at most {words} words. "
+    "Return ONLY the summary."
+)
+
+
+def _message_text(message) -> str:
+    if not isinstance(message, dict):
+        return ""
+    content = message.get("content")
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return " ".join(
+            block.get("text", "") for block in content if isinstance(block, dict)
+        )
+    return ""
+
+
+def _estimate_tokens(messages: list) -> int:
+    return sum(len(_message_text(m)) for m in messages) // CHARS_PER_TOKEN
+
+
+class ContextWindowProcessor(FrameProcessor):
+    """Keeps the LLM context bounded by summarizing turns that fall out of the window."""
+
+    def __init__(
+        self,
+        *,
+        keep_turns: int = 6,
+        max_context_tokens: int = 2000,
+        summary_max_tokens: int = 300,
+        client: Optional[anthropic.AsyncAnthropic] = None,
+        model: str = SUMMARY_MODEL,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._keep_turns = max(1, keep_turns)
+        self._max_context_tokens = max_context_tokens
+        self._summary_max_tokens = summary_max_tokens
+        self._client = client or anthropic_client()
+        self._model = model
+
+        self._summary = ""
+        # The system message carrying the summary, right after the system prompt
+        self._summary_message: Optional[dict] = None
+        self._summary_task = None
+        # Messages the running task is summarizing, and its result once done
+        self._folding: list = []
+        self._folded_summary: Optional[str] = None
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, LLMContextFrame) and direction == FrameDirection.DOWNSTREAM:
+            self._apply_summary(frame.context)
+            self._maybe_start_summary(frame.context)
+
+        await self.push_frame(frame, direction)
+
+    async def cleanup(self):
+        await super().cleanup()
+        if self._summary_task:
+            await self.cancel_task(self._summary_task)
+            self._summary_task = None
+
+    def _head_length(self, messages: list) -> int:
+        """Number of leading system messages (prompt, then summary), which stay verbatim."""
+        head = 0
+        while head < len(messages) and isinstance(messages[head], dict):
+            if messages[head].get("role") != "system":
+                break
+            head += 1
+        return head
+
+    def _turn_starts(self, messages: list, head: int) -> list[int]:
+        starts = [head] if head < len(messages) else []
+        for i in range(head + 1, len(messages)):
+            message = messages[i]
+            if isinstance(message, dict) and message.get("role") == "user":
+                starts.append(i)
+        return starts
+
+    def _apply_summary(self, context: LLMContext):
+        """Swap folded turns for the finished summary, if the task is done."""
+        if self._folded_summary is None:
+            return
+        summary, folded = self._folded_summary, self._folding
+        self._folded_summary, self._folding = None, []
+
+        messages = context.messages
+        head = self._head_length(messages)
+        window = messages[head : head + len(folded)]
+        if head == 0 or len(window) != len(folded) or any(
+            a is not b for a, b in zip(window, folded)
+        ):
+            # The context was replaced or rewritten meanwhile; drop this summary
+            return
+
+        self._summary = summary
+        system = [m for m in messages[:head] if m is not self._summary_message]
+        self._summary_message = {"role": "system", "content": SUMMARY_HEADER + summary}
+        context.set_messages([*system, self._summary_message, *messages[head + len(folded) :]])
+        logger.debug(
+            f"{self}: folded {len(folded)} messages into summary; "
+            f"context now ~{_estimate_tokens(context.messages)} tokens"
+        )
+
+    def _maybe_start_summary(self, context: LLMContext):
+        if self._summary_task or self._folded_summary is not None:
+            return
+        messages = context.messages
+        head = self._head_length(messages)
+        if head == 0:
+            return
+        starts = self._turn_starts(messages, head)
+
+        keep = min(self._keep_turns, len(starts))
+        while keep > 1 and _estimate_tokens(messages[starts[-keep] :]) > self._max_context_tokens:
+            keep -= 1
+        if len(starts) - keep < (FOLD_BATCH_TURNS if keep == self._keep_turns else 1):
+            return
+
+        self._folding = list(messages[head : starts[-keep]])
+        self._summary_task = self.create_task(self._summarize(list(self._folding)))
+
+    async def _summarize(self, folding: list):
+        transcript = "\n".join(
+            f"{'User' if m.get('role') == 'user' else 'Assistant'}: {_message_text(m)}"
+            for m in folding
+            if isinstance(m, dict) and _message_text(m).strip()
+        )
+        user = (
+            f"PREVIOUS SUMMARY:\n{self._summary or 'None yet'}\n\n"
+            f"NEW TRANSCRIPT EXCERPT:\n{transcript}"
+        )
+        try:
+            response = await self._client.messages.create(
+                model=self._model,
+                max_tokens=self._summary_max_tokens,
+                system=SUMMARY_SYSTEM_PROMPT.format(words=int(self._summary_max_tokens * 0.6)),
+                messages=[{"role": "user", "content": user}],
+            )
+            self._folded_summary = response.content[0].text.strip()
+        except Exception as e:
+            # Keep the turns verbatim; the next turn tries again
+            logger.warning(f"{self}: context summary failed: {e}")
+            self._folding = []
+        finally:
+            self._summary_task = None
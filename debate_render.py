@@ -0,0 +1,253 @@
+"""Offline debate rendering -- a whole debate to one audio file, faster than real time.
+
+Runs arguing_runner's debate turn logic (DebateHistory) directly against the
+Anthropic and Deepgram APIs, with no pipeline, transport or playback pacing.
+Each reply is requested as soon as the previous one's text is in, and its
+speech is synthesized in the background while the later turns are generated,
+so a render takes about as long as the LLM calls rather than as long as the
+debate.
+
+    python debate_render.py debate.wav
+    python debate_render.py debate.opus --turns 8 --topic "Should cities ban cars?"
+
+Writes the audio (16-bit mono WAV, or Ogg Opus for .ogg/.opus) and a
+transcript with each turn's start and end time in the audio, next to it as
+.txt by default (--transcript, .json for machine-readable).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import wave
+from dataclasses import dataclass
+from pathlib import Path
+
+import av
+import httpx
+import numpy as np
+from loguru import logger
+
+from arguing_runner import (
+    DEBATE_MAX_TOKENS,
+    DEBATE_MODEL,
+    DEBATE_TEMPERATURE,
+    DEEPGRAM_API_KEY,
+    MAX_TURNS,
+    DebateHistory,
+    debate_config,
+)
+from llm_usage import cached_system, record_usage
+from warm_pool import anthropic_client
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+DEEPGRAM_SPEAK_URL = "https://api.deepgram.com/v1/speak"
+
+# Rates both Deepgram linear16 output and the Opus encoder support
+SAMPLE_RATES = (8000, 16000, 24000, 48000)
+RENDER_SAMPLE_RATE = 24000
+
+# Silence between turns in the rendered audio
+TURN_GAP_SECS = float(os.getenv("DEBATE_RENDER_GAP_SECS", "0.4"))
+
+# Speech requests in flight at once
+TTS_CONCURRENCY = int(os.getenv("DEBATE_RENDER_TTS_CONCURRENCY", "4"))
+
+
+@dataclass
+class RenderedTurn:
+    turn: int
+    speaker: str
+    text: str
+    audio: bytes = b""
+
+
+# ---------------------------------------------------------------------------
+# Generation
+# ---------------------------------------------------------------------------
+
+
+async def _generate(history: DebateHistory) -> str:
+    """The next speaker's reply to the debate so far."""
+    system, *messages = history.messages()
+    response = await anthropic_client().messages.create(
+        model=DEBATE_MODEL,
+        max_tokens=DEBATE_MAX_TOKENS,
+        temperature=DEBATE_TEMPERATURE,
+        system=cached_system(system["content"]),
+        messages=messages,
+    )
+    record_usage(response.usage, source="debate render")
+    return "".join(block.text for block in response.content if block.type == "text")
+
+
+async def _synthesize(client: httpx.AsyncClient, text: str, voice: str, sample_rate: int) -> bytes:
+    """``text`` spoken in ``voice``, as 16-bit mono PCM."""
+    response = await client.post(
+        DEEPGRAM_SPEAK_URL,
+        params={
+            "model": voice,
+            "encoding": "linear16",
+            "sample_rate": sample_rate,
+            "container": "none",
+        },
+        json={"text": text},
+    )
+    response.raise_for_status()
+    return response.content
+
+
+async def render(
+    config: dict,
+    *,
+    turns: int = MAX_TURNS,
+    sample_rate: int = RENDER_SAMPLE_RATE,
+    concurrency: int = TTS_CONCURRENCY,
+) -> list[RenderedTurn]:
+    """Generate and voice up to ``turns`` debate turns (at most MAX_TURNS)."""
+    history = DebateHistory(config)
+    history.start()
+    rendered: list[RenderedTurn] = []
+    speech: list[asyncio.Task] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(
+        headers={"Authorization": f"Token {DEEPGRAM_API_KEY}"}, timeout=60
+    ) as tts_client:
+
+        async def speak(turn: RenderedTurn, voice: str):
+            async with semaphore:
+                started = time.perf_counter()
+                turn.audio = await _synthesize(tts_client, turn.text, voice, sample_rate)
+            logger.debug(
+                f"Turn {turn.turn} synthesized in {time.perf_counter() - started:.2f}s "
+                f"({len(turn.audio) / (2 * sample_rate):.1f}s of audio)"
+            )
+
+        try:
+            while True:
+                speaker, voice = history.speaker()
+                text = await _generate(history)
+                turn = RenderedTurn(history.turn + 1, speaker, text.strip())
+                logger.info(f"Turn {turn.turn}/{turns} — {speaker}: {turn.text}")
+                if turn.text:
+                    rendered.append(turn)
+                    # The text is final, so speech can run alongside the next turns
+                    speech.append(asyncio.create_task(speak(turn, voice)))
+                if turn.turn >= turns or not history.record(text):
+                    break
+            await asyncio.gather(*speech)
+        finally:
+            for task in speech:
+                task.cancel()
+
+    return rendered
+
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+
+def _assemble(
+    turns: list[RenderedTurn], sample_rate: int, gap_secs: float
+) -> tuple[bytes, list[dict]]:
+    """The turns' audio back to back, and when each turn plays in it."""
+    gap = bytes(2 * int(sample_rate * gap_secs))
+    audio = bytearray()
+    transcript = []
+    for turn in turns:
+        if audio:
+            audio += gap
+        start = len(audio) / (2 * sample_rate)
+        audio += turn.audio
+        transcript.append(
+            {
+                "turn": turn.turn,
+                "speaker": turn.speaker,
+                "start": round(start, 2),
+                "end": round(len(audio) / (2 * sample_rate), 2),
+                "text": turn.text,
+            }
+        )
+    return bytes(audio), transcript
+
+
+def _write_audio(path: Path, audio: bytes, sample_rate: int):
+    if path.suffix.lower() in (".ogg", ".opus"):
+        samples = np.frombuffer(audio, dtype=np.int16).reshape(1, -1)
+        with av.open(str(path), "w", format="ogg") as container:
+            stream = container.add_stream("libopus", rate=sample_rate)
+            stream.layout = "mono"
+            frame = av.AudioFrame.from_ndarray(samples, format="s16", layout="mono")
+            frame.sample_rate = sample_rate
+            for packet in [*stream.encode(frame), *stream.encode(None)]:
+                container.mux(packet)
+    else:
+        with wave.open(str(path), "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(sample_rate)
+            f.writeframes(audio)
+
+
+def _timestamp(secs: float) -> str:
+    minutes, secs = divmod(secs, 60)
+    return f"{int(minutes):02d}:{secs:04.1f}"
+
+
+def _write_transcript(path: Path, transcript: list[dict]):
+    if path.suffix.lower() == ".json":
+        path.write_text(json.dumps(transcript, indent=2))
+    else:
+        path.write_text(
+            "".join(
+                f"[{_timestamp(t['start'])} - {_timestamp(t['end'])}] {t['speaker']}: {t['text']}\n"
+                for t in transcript
+            )
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a debate to an audio file")
+    parser.add_argument("output", type=Path, help=".wav, or .ogg/.opus for Opus")
+    parser.add_argument("--transcript", type=Path, default=None, help="default: <output>.txt")
+    parser.add_argument("--topic", default=debate_config["topic"])
+    parser.add_argument("--turns", type=int, default=MAX_TURNS)
+    parser.add_argument("--sample-rate", type=int, choices=SAMPLE_RATES, default=RENDER_SAMPLE_RATE)
+    parser.add_argument("--gap", type=float, default=TURN_GAP_SECS, help="seconds between turns")
+    parser.add_argument("--concurrency", type=int, default=TTS_CONCURRENCY)
+    parser.add_argument("--log-level", default="INFO")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level=args.log_level)
+
+    started = time.perf_counter()
+    turns = asyncio.run(
+        render(
+            {**debate_config, "topic": args.topic},
+            turns=args.turns,
+            sample_rate=args.sample_rate,
+            concurrency=args.concurrency,
+        )
+    )
+    audio, transcript = _assemble(turns, args.sample_rate, args.gap)
+    _write_audio(args.output, audio, args.sample_rate)
+    transcript_path = args.transcript or args.output.with_suffix(".txt")
+    _write_transcript(transcript_path, transcript)
+
+    elapsed = time.perf_counter() - started
+    duration = len(audio) / (2 * args.sample_rate)
+    print(f"{len(turns)} turns, {duration:.1f}s of audio rendered in {elapsed:.1f}s")
+    print(f"  audio:      {args.output}")
+    print(f"  transcript: {transcript_path}")
+
+
+if __name__ == "__main__":
+    main()
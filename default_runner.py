@@ -5,6 +5,7 @@ Then open http://localhost:7860/client in your browser and click Connect.
 """
 
 from bot import run_bot
+from warm_pool import preload, start_warm_up
 
 from pipecat.runner.types import RunnerArguments
 from pipecat.runner.utils import create_transport
@@ -13,6 +14,8 @@ from pipecat.transports.base_transport import TransportParams
 
 async def bot(runner_args: RunnerArguments):
     """Entry point for Pipecat runner (WebRTC mode)."""
+    # Called as soon as the peer connection exists; open connections meanwhile
+    start_warm_up()
     transport_params = {
         "webrtc": lambda: TransportParams(audio_in_enabled=True, audio_out_enabled=True),
     }
@@ -23,4 +26,5 @@ async def bot(runner_args: RunnerArguments):
 if __name__ == "__main__":
     from pipecat.runner.run import main
 
+    preload()
     main()
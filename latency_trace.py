@@ -0,0 +1,276 @@
+"""Per-turn voice-to-voice latency tracing with a stage breakdown.
+
+TurnLatencyObserver watches a pipeline's frames and timestamps the milestones
+of every bot turn:
+
+  vad_end          user stopped speaking (VAD)
+  stt_final        final transcription from the STT service
+  llm_request      context handed to the LLM service
+  llm_first_token  first text token out of the LLM
+  tts_first_byte   first audio out of the TTS service
+  audio_out        output transport started playing the bot's audio
+
+Rolling p50/p95 per stage are logged after every turn. If LATENCY_TRACE_FILE
+is set (e.g. to latency_traces.jsonl, which git ignores), each completed turn
+is also appended to it as OpenTelemetry-style JSON spans (one per line: a
+"turn" span plus one child span per stage); the file isn't rotated. Turns the
+bot starts on its own (greetings, debate turns) have no vad_end/stt_final and
+are measured from llm_request. Pipelines without audio output pass text_only=True; their
+turns end at llm_first_token.
+
+    task = PipelineTask(pipeline, params=..., observers=[TurnLatencyObserver("bot")])
+"""
+
+import json
+import math
+import os
+import secrets
+import time
+from collections import deque
+from typing import Optional
+
+from loguru import logger
+
+from pipecat.frames.frames import (
+    BotStartedSpeakingFrame,
+    CancelFrame,
+    EndFrame,
+    LLMContextFrame,
+    LLMTextFrame,
+    TranscriptionFrame,
+    TTSAudioRawFrame,
+    VADUserStartedSpeakingFrame,
+    VADUserStoppedSpeakingFrame,
+)
+from pipecat.observers.base_observer import BaseObserver, FramePushed
+from pipecat.services.llm_service import LLMService
+from pipecat.services.stt_service import STTService
+from pipecat.services.tts_service import TTSService
+from pipecat.transports.base_output import BaseOutputTransport
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+# JSONL span output; unset, turns are only logged
+LATENCY_TRACE_FILE = os.getenv("LATENCY_TRACE_FILE", "")
+
+# Number of recent turns the rolling percentiles are computed over
+LATENCY_WINDOW_TURNS = int(os.getenv("LATENCY_WINDOW_TURNS", "50"))
+
+# Stage name -> (start milestone(s), end milestone). The first start milestone
+# present in the turn is used.
+STAGES = {
+    "stt": (("vad_end",), "stt_final"),
+    "turn_detect": (("stt_final", "vad_end"), "llm_request"),
+    "llm": (("llm_request",), "llm_first_token"),
+    "tts": (("llm_first_token",), "tts_first_byte"),
+    "output": (("tts_first_byte",), "audio_out"),
+    "total": (("vad_end", "llm_request"), "audio_out"),
+}
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class TurnLatencyObserver(BaseObserver):
+    """Collects per-turn milestone timestamps into spans and rolling percentiles."""
+
+    def __init__(
+        self,
+        name: str = "pipeline",
+        *,
+        trace_file: Optional[str] = LATENCY_TRACE_FILE,
+        window: int = LATENCY_WINDOW_TURNS,
+        text_only: bool = False,
+    ):
+        super().__init__()
+        self._name = name
+        self._text_only = text_only
+        self._stages = dict(STAGES)
+        if text_only:
+            self._stages["total"] = (("vad_end", "llm_request"), "llm_first_token")
+        self._trace_file = trace_file or None
+        self._samples = {stage: deque(maxlen=window) for stage in self._stages}
+        self._turn: dict[str, int] = {}
+        self._turn_count = 0
+        self._trace_id = secrets.token_hex(16)
+        # Pipeline clock (monotonic ns) -> unix ns, for span timestamps
+        self._clock_offset: Optional[int] = None
+        self._finished = False
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Rolling p50/p95 (ms) per stage over the last ``window`` turns."""
+        return {
+            stage: {
+                "p50": _percentile(list(samples), 50),
+                "p95": _percentile(list(samples), 95),
+                "n": len(samples),
+            }
+            for stage, samples in self._samples.items()
+            if samples
+        }
+
+    async def on_push_frame(self, data: FramePushed):
+        frame, source, now = data.frame, data.source, data.timestamp
+        if self._clock_offset is None:
+            self._clock_offset = time.time_ns() - now
+
+        if isinstance(frame, (EndFrame, CancelFrame)):
+            if not self._finished:
+                self._finished = True
+                self._log_summary()
+            return
+
+        # Frames are seen once per hop (and broadcast frames once per
+        # direction), so each milestone is taken from the processor that
+        # produces it, and only the first occurrence in a turn counts.
+        if isinstance(frame, VADUserStartedSpeakingFrame):
+            if "llm_request" in self._turn:
+                # Barge-in on a response that hadn't been heard yet
+                self._end_turn("interrupted")
+            else:
+                # Still the same user turn; wait for the next end of speech
+                self._turn.pop("vad_end", None)
+        elif isinstance(frame, VADUserStoppedSpeakingFrame):
+            if "llm_request" not in self._turn:
+                self._mark("vad_end", now)
+        elif isinstance(frame, TranscriptionFrame) and isinstance(source, STTService):
+            if "llm_request" not in self._turn:
+                self._turn["stt_final"] = now
+        elif isinstance(frame, LLMContextFrame) and isinstance(data.destination, LLMService):
+            if "llm_first_token" in self._turn:
+                self._end_turn("superseded")
+            self._mark("llm_request", now)
+        elif "llm_request" not in self._turn:
+            # The rest of a turn's milestones follow its LLM request; later
+            # frames of an already finished response are ignored
+            pass
+        elif isinstance(frame, LLMTextFrame) and isinstance(source, LLMService):
+            self._mark("llm_first_token", now)
+            if self._text_only:
+                self._end_turn("completed")
+        elif isinstance(frame, TTSAudioRawFrame) and isinstance(source, TTSService):
+            # Audio before the first token is the tail of an earlier response
+            if "llm_first_token" in self._turn:
+                self._mark("tts_first_byte", now)
+        elif isinstance(frame, BotStartedSpeakingFrame) and isinstance(
+            source, BaseOutputTransport
+        ):
+            if "tts_first_byte" in self._turn:
+                self._mark("audio_out", now)
+                self._end_turn("completed")
+
+    def _mark(self, milestone: str, timestamp: int):
+        self._turn.setdefault(milestone, timestamp)
+
+    def _end_turn(self, outcome: str):
+        turn, self._turn = self._turn, {}
+        self._turn_count += 1
+
+        durations = {}
+        for stage, (starts, end) in self._stages.items():
+            start = next((turn[s] for s in starts if s in turn), None)
+            if start is not None and end in turn:
+                durations[stage] = max(0, turn[end] - start) / 1e6
+
+        # Stages an unfinished turn got through still count; its total doesn't
+        for stage, ms in durations.items():
+            if outcome == "completed" or stage != "total":
+                self._samples[stage].append(ms)
+        if outcome == "completed":
+            self._log_turn(durations)
+        else:
+            logger.debug(f"{self._name} turn {self._turn_count} {outcome}: {durations}")
+
+        if self._trace_file:
+            self._write_spans(turn, durations, outcome)
+
+    def _log_turn(self, durations: dict[str, float]):
+        breakdown = " ".join(
+            f"{stage}={ms:.0f}" for stage, ms in durations.items() if stage != "total"
+        )
+        total = self._samples["total"]
+        rolling = (
+            f" | total p50={_percentile(list(total), 50):.0f} "
+            f"p95={_percentile(list(total), 95):.0f} over {len(total)}"
+            if total
+            else ""
+        )
+        logger.info(
+            f"{self._name} turn {self._turn_count}: "
+            f"{durations.get('total', 0):.0f}ms ({breakdown}){rolling}"
+        )
+
+    def _log_summary(self):
+        stats = self.stats()
+        if not stats:
+            return
+        summary = ", ".join(
+            f"{stage} p50={s['p50']:.0f} p95={s['p95']:.0f}" for stage, s in stats.items()
+        )
+        logger.info(f"{self._name} latency over {self._turn_count} turns (ms): {summary}")
+
+    def _write_spans(self, turn: dict[str, int], durations: dict[str, float], outcome: str):
+        if not turn:
+            return
+        start = min(turn.values())
+        end = max(turn.values())
+        turn_span_id = secrets.token_hex(8)
+        spans = [
+            self._span(
+                turn_span_id,
+                None,
+                "turn",
+                start,
+                end,
+                {
+                    "pipeline": self._name,
+                    "turn": self._turn_count,
+                    "outcome": outcome,
+                    **{f"{stage}_ms": round(ms, 1) for stage, ms in durations.items()},
+                },
+            )
+        ]
+        for stage, (starts, stop) in self._stages.items():
+            if stage == "total" or stage not in durations:
+                continue
+            span_start = next(turn[s] for s in starts if s in turn)
+            spans.append(
+                self._span(
+                    secrets.token_hex(8),
+                    turn_span_id,
+                    stage,
+                    span_start,
+                    max(span_start, turn[stop]),
+                    {"pipeline": self._name, "turn": self._turn_count},
+                )
+            )
+        try:
+            with open(self._trace_file, "a") as f:
+                f.writelines(json.dumps(span) + "\n" for span in spans)
+        except OSError as e:
+            logger.warning(f"Could not write latency trace to {self._trace_file}: {e}")
+            self._trace_file = None
+
+    def _span(
+        self,
+        span_id: str,
+        parent_id: Optional[str],
+        name: str,
+        start: int,
+        end: int,
+        attributes: dict,
+    ) -> dict:
+        return {
+            "traceId": self._trace_id,
+            "spanId": span_id,
+            "parentSpanId": parent_id or "",
+            "name": name,
+            "startTimeUnixNano": start + self._clock_offset,
+            "endTimeUnixNano": end + self._clock_offset,
+            "attributes": attributes,
+        }
@@ -0,0 +1,95 @@
+"""Anthropic prompt caching helpers and cache usage reporting.
+
+Static system prompts are sent as cacheable prefixes so every call after the
+first reads them from Anthropic's prompt cache instead of re-processing them:
+
+  - pipeline AnthropicLLMService instances set
+    InputParams(enable_prompt_caching=True), which marks the prompt up to the
+    latest user turn (system prompt included) as cacheable
+  - direct messages.create calls pass system=cached_system(prompt)
+
+Prompts shorter than the model's minimum cacheable length (1024 tokens for
+Sonnet) are processed normally by the API; caching kicks in as soon as the
+system prompt plus history crosses it.
+
+Cache reads and writes are tallied from both paths: record_usage() for direct
+calls, and PromptCacheObserver for the usage metrics pipelines emit.
+"""
+
+from loguru import logger
+
+from pipecat.frames.frames import MetricsFrame
+from pipecat.metrics.metrics import LLMUsageMetricsData
+from pipecat.observers.base_observer import BaseObserver, FramePushed
+from pipecat.services.llm_service import LLMService
+
+usage_totals = {
+    "calls": 0,
+    "input_tokens": 0,  # uncached input
+    "cache_read_input_tokens": 0,
+    "cache_creation_input_tokens": 0,
+    "output_tokens": 0,
+}
+
+
+def cached_system(prompt: str) -> list[dict]:
+    """A system prompt as a single text block marked as a cacheable prefix."""
+    return [{"type": "text", "text": prompt, "cache_control": {"type": "ephemeral"}}]
+
+
+def _record(source: str, uncached: int, cache_read: int, cache_write: int, output: int):
+    usage_totals["calls"] += 1
+    usage_totals["input_tokens"] += uncached
+    usage_totals["cache_read_input_tokens"] += cache_read
+    usage_totals["cache_creation_input_tokens"] += cache_write
+    usage_totals["output_tokens"] += output
+    total_input = uncached + cache_read + cache_write
+    logger.debug(
+        f"{source} usage: input={uncached} cache_read={cache_read} cache_write={cache_write} "
+        f"output={output} (cached {cache_read / total_input:.0%} of input)"
+        if total_input
+        else f"{source} usage: output={output}"
+    )
+
+
+def record_usage(usage, source: str = "LLM side-channel"):
+    """Tally the usage block of an Anthropic messages.create response."""
+    _record(
+        source,
+        usage.input_tokens or 0,
+        getattr(usage, "cache_read_input_tokens", None) or 0,
+        getattr(usage, "cache_creation_input_tokens", None) or 0,
+        usage.output_tokens or 0,
+    )
+
+
+def cache_hit_ratio() -> float:
+    """Share of all input tokens so far that were read from the prompt cache."""
+    total = (
+        usage_totals["input_tokens"]
+        + usage_totals["cache_read_input_tokens"]
+        + usage_totals["cache_creation_input_tokens"]
+    )
+    return usage_totals["cache_read_input_tokens"] / total if total else 0.0
+
+
+class PromptCacheObserver(BaseObserver):
+    """Tallies cache reads/writes from a pipeline's LLM usage metrics.
+
+    Needs PipelineParams(enable_usage_metrics=True).
+    """
+
+    async def on_push_frame(self, data: FramePushed):
+        # Count each metrics frame once, where the LLM service emits it
+        if not isinstance(data.frame, MetricsFrame) or not isinstance(data.source, LLMService):
+            return
+        for item in data.frame.data:
+            if isinstance(item, LLMUsageMetricsData):
+                tokens = item.value
+                _record(
+                    str(data.source),
+                    tokens.prompt_tokens,
+                    tokens.cache_read_input_tokens or 0,
+                    tokens.cache_creation_input_tokens or 0,
+                    tokens.completion_tokens,
+                )
@@ -1,74 +1,548 @@
 """Qwen3-TTS server -- serves TTS synthesis over HTTP.
 
-Run:  python qwen_tts_server.py
+Run:  pip install -r requirements-server.txt && python qwen_tts_server.py
 Listens on http://localhost:8100
 
-The model is loaded once at startup. Synthesis runs in a thread pool
-to avoid blocking the async event loop.
+The model is loaded once at startup. Concurrent requests are gathered by a
+micro-batching scheduler into batched generate calls, which run on a bounded
+pool of worker threads fed by a priority queue. When the queue is full new
+work is rejected with 429 instead of piling up.
+
+With QWEN_TTS_REPLICAS=N the front-end loads no model itself; it starts N
+worker processes, each with its own model copy pinned to a share of the
+host's cores, and dispatches batches to the least-loaded healthy one.
 
 Endpoints:
-  POST /synthesize   -- synthesize text to raw PCM audio
-  GET  /health       -- check server readiness
-  GET  /speakers     -- list available speakers
+  POST /synthesize          -- synthesize text to raw PCM audio
+  POST /synthesize/stream   -- same, but streams PCM segment by segment
+  POST /cancel/{request_id} -- stop an in-progress request by its request_id
+  GET  /health              -- readiness (503 until loaded and warmed up)
+  GET  /speakers            -- list available speakers
+  GET  /metrics             -- Prometheus metrics (latency histograms, load gauges)
+  WS   /ws                  -- persistent session: incremental text in, tagged audio out
+
+Set QWEN_TTS_PROFILE=cpu to run without a GPU (see PROFILES below).
 """
 
 import asyncio
+import hashlib
+import io
+import itertools
+import json
+import math
+import mmap
+import multiprocessing
+import os
+import queue
+import re
 import sys
+import threading
 import time
-from contextlib import asynccontextmanager
-from typing import Optional
+import unicodedata
+from collections import OrderedDict, defaultdict, deque
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, Literal, Optional, Union
 
 import numpy as np
+import soundfile
+import soxr
 import torch
 import uvicorn
-from fastapi import FastAPI
-from fastapi.responses import Response, JSONResponse
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from loguru import logger
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
 
 MODEL_NAME = "Qwen/Qwen3-TTS-12Hz-0.6B-CustomVoice"
-DEVICE = "cuda:0"
-DTYPE = torch.bfloat16
 OUTPUT_SAMPLE_RATE = 24000
+DEFAULT_SPEAKER = "Ryan"
+
+# Output formats clients may ask for. Audio is synthesized (and cached) as
+# int16 at OUTPUT_SAMPLE_RATE and converted once per response. Opus only
+# supports a handful of rates.
+Encoding = Literal["int16", "float32", "opus"]
+OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+
+# Inference profiles. "cuda" is the original GPU setup; "cpu" lets the server
+# run on GPU-less nodes, optionally with int8 dynamic quantization.
+PROFILES = {
+    "cuda": {"device": "cuda:0", "dtype": torch.bfloat16},
+    "cpu": {"device": "cpu", "dtype": torch.float32},
+}
+PROFILE = os.getenv("QWEN_TTS_PROFILE", "cuda")
+if PROFILE not in PROFILES:
+    raise ValueError(f"Unknown QWEN_TTS_PROFILE {PROFILE!r}, expected one of {list(PROFILES)}")
+DEVICE = PROFILES[PROFILE]["device"]
+DTYPE = PROFILES[PROFILE]["dtype"]
+
+# CPU profile tuning. Thread counts of 0 leave torch's defaults in place.
+CPU_QUANTIZE_INT8 = os.getenv("QWEN_TTS_CPU_INT8", "0") == "1"
+CPU_INTRA_OP_THREADS = int(os.getenv("QWEN_TTS_CPU_THREADS", "0"))
+CPU_INTER_OP_THREADS = int(os.getenv("QWEN_TTS_CPU_INTEROP_THREADS", "0"))
+
+# Warm-up set, synthesized for each speaker (comma-separated, or "all") before
+# /health reports ready, so the first real request runs at normal latency.
+WARMUP_TEXTS = [
+    t.strip()
+    for t in os.getenv(
+        "QWEN_TTS_WARMUP_TEXTS", "Hi.|Thanks for waiting, let me check that for you."
+    ).split("|")
+    if t.strip()
+]
+WARMUP_SPEAKERS = os.getenv("QWEN_TTS_WARMUP_SPEAKERS", DEFAULT_SPEAKER)
+
+# Synthesized once at startup to report the profile's real-time factor
+RTF_PROBE_TEXT = "Hello, thanks for calling. How can I help you today?"
+
+# Sentence boundary used to cut streaming requests into independently
+# synthesized segments (qwen_tts only returns audio once a call completes).
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?;])\s+")
+
+# Long inputs: sentences over SEGMENT_MAX_CHARS are cut again at clause
+# boundaries, and consecutive segments are joined with a CROSSFADE_MS linear
+# crossfade to hide the seams.
+CLAUSE_BOUNDARY = re.compile(r"(?<=[,:\u2013\u2014])\s+|\s+(?=[\u2013\u2014-]\s)")
+SEGMENT_MAX_CHARS = int(os.getenv("QWEN_TTS_SEGMENT_MAX_CHARS", "160"))
+CROSSFADE_MS = float(os.getenv("QWEN_TTS_CROSSFADE_MS", "20"))
+
+# Micro-batching: requests arriving within BATCH_MAX_WAIT_MS of the first one
+# are synthesized together, up to BATCH_MAX_SIZE texts per generate call.
+BATCH_MAX_SIZE = int(os.getenv("QWEN_TTS_BATCH_MAX_SIZE", "8"))
+BATCH_MAX_WAIT_MS = float(os.getenv("QWEN_TTS_BATCH_MAX_WAIT_MS", "15"))
+
+# Admission control: batches run on SYNTH_THREADS dedicated worker threads.
+# At most MAX_QUEUE_DEPTH requests may wait; lower priorities may only fill
+# their share of it, so prefetch/bulk work can't crowd out interactive turns.
+SYNTH_THREADS = int(os.getenv("QWEN_TTS_SYNTH_THREADS", "2"))
+MAX_QUEUE_DEPTH = int(os.getenv("QWEN_TTS_MAX_QUEUE_DEPTH", "32"))
+PRIORITIES = {"interactive": 0, "prefetch": 1, "bulk": 2}
+PRIORITY_DEPTH_SHARE = {"interactive": 1.0, "prefetch": 0.75, "bulk": 0.5}
+
+# Multi-replica mode: QWEN_TTS_REPLICAS > 0 starts that many worker processes,
+# each loading its own model copy pinned to an equal share of the host's cores
+# (GPU profiles spread replicas round-robin over the visible devices).
+REPLICAS = int(os.getenv("QWEN_TTS_REPLICAS", "0"))
+# How long a batch waits for a replica to become healthy (e.g. while a
+# crashed one respawns) before failing
+REPLICA_WAIT_S = float(os.getenv("QWEN_TTS_REPLICA_WAIT_S", "30"))
+
+# Synthesis cache: an in-memory LRU of PCM bounded by CACHE_MEMORY_MB, backed
+# by raw PCM files under CACHE_DIR (set QWEN_TTS_CACHE_DIR="" to disable).
+CACHE_MEMORY_MB = float(os.getenv("QWEN_TTS_CACHE_MEMORY_MB", "64"))
+CACHE_DIR = os.getenv("QWEN_TTS_CACHE_DIR", str(Path.home() / ".cache" / "qwen_tts_server"))
+CACHE_DISK_MB = float(os.getenv("QWEN_TTS_CACHE_DISK_MB", "1024"))
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+
+class _Histogram:
+    """Cumulative-bucket histogram rendered in the Prometheus text format.
+
+    Only observed from the event loop thread, so no locking is needed.
+    """
+
+    def __init__(self, name: str, help: str, buckets: tuple, labelnames: tuple[str, ...]):
+        self.name = name
+        self.help = help
+        self._buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._labelnames = labelnames
+        # label values -> [per-bucket counts..., sum]
+        self._series: dict[tuple, list[float]] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(labels[name] for name in self._labelnames)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [0] * len(self._buckets) + [0.0]
+        for i, bound in enumerate(self._buckets):
+            if value <= bound:
+                series[i] += 1
+        series[-1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, series in sorted(self._series.items()):
+            labels = dict(zip(self._labelnames, key))
+            for bound, count in zip(self._buckets, series):
+                le = _format_labels({**labels, "le": _format_value(bound)})
+                lines.append(f"{self.name}_bucket{le} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {series[-2]}")
+        return lines
+
+
+class _Sampled:
+    """Gauge or counter whose value is read from server state at scrape time.
+
+    ``read`` returns a number, or a list of (labels, value) pairs.
+    """
+
+    def __init__(self, name: str, help: str, kind: str, read: Callable[[], Any]):
+        self.name = name
+        self.help = help
+        self._kind = kind
+        self._read = read
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self._kind}"]
+        samples = self._read()
+        if not isinstance(samples, list):
+            samples = [({}, samples)]
+        for labels, value in samples:
+            lines.append(f"{self.name}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+REQUEST_LABELS = ("speaker", "status")  # status: ok, cache_hit, rejected, error, cancelled
+
+QUEUE_WAIT_SECONDS = _Histogram(
+    "qwen_tts_queue_wait_seconds",
+    "Time from admission until a worker picked the request up.",
+    (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    ("speaker", "priority"),
+)
+SYNTHESIS_SECONDS = _Histogram(
+    "qwen_tts_synthesis_seconds",
+    "Wall time to serve a synthesis request, including queueing.",
+    (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 32),
+    REQUEST_LABELS,
+)
+RTF = _Histogram(
+    "qwen_tts_rtf",
+    "Real-time factor (wall time / audio duration) per request.",
+    (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2, 4),
+    REQUEST_LABELS,
+)
+AUDIO_SECONDS = _Histogram(
+    "qwen_tts_audio_seconds",
+    "Seconds of audio produced per request.",
+    (0.5, 1, 2, 4, 8, 16, 32, 64),
+    REQUEST_LABELS,
+)
+REQUEST_CHARS = _Histogram(
+    "qwen_tts_request_chars",
+    "Request text length in characters.",
+    (10, 25, 50, 100, 200, 400, 800, 1600),
+    REQUEST_LABELS,
+)
+SAMPLED_METRICS = [
+    _Sampled(
+        "qwen_tts_in_flight_requests",
+        "Synthesis requests currently being served.",
+        "gauge",
+        lambda: in_flight,
+    ),
+    _Sampled(
+        "qwen_tts_queue_depth",
+        "Requests admitted but not yet picked up by a worker.",
+        "gauge",
+        lambda: pool.stats()["depth"] if pool else 0,
+    ),
+    _Sampled(
+        "qwen_tts_workers_busy",
+        "Worker threads currently running a batch.",
+        "gauge",
+        lambda: pool.stats()["busy"] if pool else 0,
+    ),
+    _Sampled(
+        "qwen_tts_ready",
+        "1 once the model is loaded and warmed up.",
+        "gauge",
+        lambda: int(model_ready),
+    ),
+    _Sampled(
+        "qwen_tts_replicas_healthy",
+        "Model replica processes currently accepting work.",
+        "gauge",
+        lambda: sum(r["healthy"] for r in replicas.stats()) if replicas else 0,
+    ),
+    _Sampled(
+        "qwen_tts_cache_lookups_total",
+        "Synthesis cache lookups by result.",
+        "counter",
+        lambda: [
+            ({"result": result}, count)
+            for result, count in (cache.stats() if cache else {}).items()
+            if result in ("memory_hits", "disk_hits", "misses", "shared")
+        ],
+    ),
+]
+
+
+def _speaker_label(speaker: str) -> str:
+    """Metric label for a speaker; unknown names collapse to "other"."""
+    if supported_speakers and speaker.lower() not in {s.lower() for s in supported_speakers}:
+        return "other"
+    return speaker.lower()
+
+
+def _observe_request(
+    speaker: str,
+    status: str,
+    chars: int,
+    elapsed: Optional[float] = None,
+    audio_seconds: float = 0.0,
+):
+    """Record one finished (or rejected) synthesis request."""
+    labels = {"speaker": _speaker_label(speaker), "status": status}
+    REQUEST_CHARS.observe(chars, **labels)
+    if elapsed is not None:
+        SYNTHESIS_SECONDS.observe(elapsed, **labels)
+    if audio_seconds > 0:
+        AUDIO_SECONDS.observe(audio_seconds, **labels)
+        RTF.observe(elapsed / audio_seconds, **labels)
 
 # ---------------------------------------------------------------------------
 # App
 # ---------------------------------------------------------------------------
 
+PCMBuffer = Union[bytes, memoryview]
+
 model = None
 model_ready = False
+startup_status = "loading"  # loading -> warming -> ready, or failed
+startup_phases: dict[str, float] = {}
+startup_stats: dict = {}
+supported_speakers: Optional[list[str]] = None
+replicas: Optional["ReplicaPool"] = None
+pool: Optional["SynthesisPool"] = None
+scheduler: Optional["BatchScheduler"] = None
+cache: Optional["SynthesisCache"] = None
+in_flight = 0  # synthesis requests currently being served
+cancel_events: dict[str, asyncio.Event] = {}  # request_id -> set to cancel it
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Load the Qwen3-TTS model at startup."""
-    global model, model_ready
-    logger.info(f"Loading {MODEL_NAME} on {DEVICE} with {DTYPE}...")
+    """Load and warm up the model in the background.
+
+    The server starts answering immediately so /health can report progress;
+    synthesis endpoints return 503 until warm-up has finished.
+    """
+    global model, model_ready, replicas, pool, scheduler
+    startup = asyncio.create_task(_startup())
+
+    yield
+
+    model_ready = False
+    startup.cancel()
+    if scheduler:
+        await scheduler.stop()
+    if pool:
+        pool.stop()
+    if replicas:
+        replicas.stop()
+    scheduler = None
+    pool = None
+    replicas = None
+    model = None
+
+
+@contextmanager
+def _phase(name: str):
+    """Time one startup phase into startup_phases."""
+    start = time.time()
+    yield
+    startup_phases[name] = round(time.time() - start, 2)
+    logger.info(f"Startup phase '{name}' took {startup_phases[name]:.2f}s")
+
+
+async def _startup():
+    global model, model_ready, startup_status, supported_speakers
+    global replicas, pool, scheduler, cache
+    loop = asyncio.get_running_loop()
+    startup_phases.clear()
     start = time.time()
+    try:
+        if REPLICAS > 0:
+            # Each replica loads, quantizes and warms up its own model copy
+            logger.info(f"Starting {REPLICAS} replica worker process(es)...")
+            startup_status = "warming"
+            with _phase("replicas"):
+                replicas = ReplicaPool(REPLICAS)
+                replicas.start()
+                await loop.run_in_executor(None, replicas.wait_ready)
+            supported_speakers = replicas.speakers
+        else:
+            if PROFILE == "cpu":
+                _configure_cpu_threads()
+
+            with _phase("resolve"):
+                model_path = await loop.run_in_executor(None, _resolve_model_path)
+
+            logger.info(f"Loading {MODEL_NAME} on {DEVICE} with {DTYPE} (profile={PROFILE})...")
+            with _phase("load"):
+                model = await loop.run_in_executor(None, _load_model, model_path)
+
+            if PROFILE == "cpu" and CPU_QUANTIZE_INT8:
+                with _phase("quantize"):
+                    await loop.run_in_executor(None, _quantize_int8)
+
+            supported_speakers = model.get_supported_speakers()
+
+            startup_status = "warming"
+            with _phase("warmup"):
+                await loop.run_in_executor(None, _warm_up, supported_speakers)
+
+        logger.info(f"Supported speakers: {supported_speakers}")
+
+        with _phase("rtf_probe"):
+            rtf = await loop.run_in_executor(None, _measure_rtf)
+        startup_stats.update(
+            profile=PROFILE,
+            device=DEVICE,
+            dtype=str(DTYPE).removeprefix("torch."),
+            int8=PROFILE == "cpu" and CPU_QUANTIZE_INT8,
+            threads=torch.get_num_threads(),
+            rtf=round(rtf, 3),
+        )
+
+        # In replica mode each pool thread drives one replica at a time
+        pool = SynthesisPool(REPLICAS or SYNTH_THREADS, MAX_QUEUE_DEPTH)
+        pool.start()
+        scheduler = BatchScheduler(pool, BATCH_MAX_SIZE, BATCH_MAX_WAIT_MS)
+        scheduler.start()
+        # Quantized weights sound different, so they get their own cache entries
+        model_tag = f"{MODEL_NAME}@{OUTPUT_SAMPLE_RATE}"
+        if startup_stats["int8"]:
+            model_tag += ":int8"
+        cache = SynthesisCache(
+            max_memory_bytes=int(CACHE_MEMORY_MB * 1024 * 1024),
+            disk_dir=Path(CACHE_DIR) if CACHE_DIR else None,
+            max_disk_bytes=int(CACHE_DISK_MB * 1024 * 1024),
+            model_tag=model_tag,
+        )
+    except Exception:
+        startup_status = "failed"
+        logger.exception("Startup failed")
+        return
+
+    startup_phases["total"] = round(time.time() - start, 2)
+    startup_status = "ready"
+    model_ready = True
+    logger.info(f"Ready to serve after {startup_phases['total']:.1f}s: {startup_phases}")
+
 
+def _resolve_model_path() -> str:
+    """Return a local snapshot directory for MODEL_NAME, downloading only if missing.
+
+    Passing a local directory to from_pretrained skips the hub round trips the
+    model and processor loaders would otherwise each make on every start.
+    """
+    if os.path.isdir(MODEL_NAME):
+        return MODEL_NAME
+
+    from huggingface_hub import snapshot_download
+
+    try:
+        return snapshot_download(MODEL_NAME, local_files_only=True)
+    except Exception:
+        logger.info(f"{MODEL_NAME} not in the local cache, downloading...")
+        return snapshot_download(MODEL_NAME)
+
+
+def _load_model(model_path: str, device: str = DEVICE):
     from qwen_tts import Qwen3TTSModel
 
-    model = Qwen3TTSModel.from_pretrained(
-        MODEL_NAME,
-        device_map=DEVICE,
+    # safetensors checkpoints are memory-mapped and copied straight into the
+    # target device's tensors instead of being read into RAM first
+    loaded = Qwen3TTSModel.from_pretrained(
+        model_path,
+        device_map=device,
         dtype=DTYPE,
+        use_safetensors=True,
+        low_cpu_mem_usage=True,
     )
+    loaded.model.talker.register_forward_pre_hook(_check_cancelled)
+    return loaded
 
-    elapsed = time.time() - start
-    logger.info(f"Model loaded in {elapsed:.1f}s")
 
-    speakers = model.get_supported_speakers()
-    logger.info(f"Supported speakers: {speakers}")
-    model_ready = True
+def _check_cancelled(module, args):
+    """Forward pre-hook on the talker: abort generate between decode steps."""
+    cancel = getattr(_cancel_state, "event", None)
+    if cancel is not None and cancel.is_set():
+        raise SynthesisCancelled()
 
-    yield
 
-    model_ready = False
-    model = None
+def _warm_up(supported_speakers: Optional[list[str]]):
+    """Synthesize the warm-up set for each configured speaker.
+
+    Runs every text on its own and then as one batch, so both the single and
+    batched code paths have been through kernel selection and allocator
+    growth before the first real request.
+    """
+    if WARMUP_SPEAKERS.strip().lower() == "all" and supported_speakers:
+        speakers = list(supported_speakers)
+    else:
+        speakers = [s.strip() for s in WARMUP_SPEAKERS.split(",") if s.strip()]
+
+    for speaker in speakers:
+        start = time.time()
+        for text in WARMUP_TEXTS:
+            _synthesize_sync(text, speaker, "English", None)
+        if len(WARMUP_TEXTS) > 1:
+            _synthesize_batch_sync(WARMUP_TEXTS, speaker, "English", None)
+        logger.debug(f"Warmed up speaker {speaker} in {time.time() - start:.2f}s")
+
+
+def _configure_cpu_threads():
+    """Apply the configured intra/inter-op thread counts before any inference."""
+    if CPU_INTRA_OP_THREADS > 0:
+        torch.set_num_threads(CPU_INTRA_OP_THREADS)
+    if CPU_INTER_OP_THREADS > 0:
+        torch.set_num_interop_threads(CPU_INTER_OP_THREADS)
+    logger.info(
+        f"CPU threads: intra-op={torch.get_num_threads()} "
+        f"inter-op={torch.get_num_interop_threads()}"
+    )
+
+
+def _quantize_int8():
+    """Swap the model's nn.Linear layers for int8 dynamically quantized ones."""
+    start = time.time()
+    torch.ao.quantization.quantize_dynamic(
+        model.model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+    )
+    logger.info(f"Applied int8 dynamic quantization in {time.time() - start:.1f}s")
+
+
+def _measure_rtf() -> float:
+    """Synthesize the probe sentence once and log the real-time factor."""
+    start = time.time()
+    _, _, audio_duration = _synthesize_batch(
+        [RTF_PROBE_TEXT], DEFAULT_SPEAKER, "English", None
+    )[0]
+    elapsed = time.time() - start
+    rtf = elapsed / audio_duration if audio_duration > 0 else 0
+    logger.info(
+        f"Startup RTF ({PROFILE}): {rtf:.2f} "
+        f"({audio_duration:.2f}s audio in {elapsed:.2f}s)"
+    )
+    return rtf
 
 
 app = FastAPI(title="Qwen3-TTS Server", lifespan=lifespan)
@@ -76,31 +550,84 @@ app = FastAPI(title="Qwen3-TTS Server", lifespan=lifespan)
 
 class SynthesizeRequest(BaseModel):
     text: str
-    speaker: str = "Ryan"
+    speaker: str = DEFAULT_SPEAKER
     language: str = "English"
     instruct: Optional[str] = None
+    priority: Literal["interactive", "prefetch", "bulk"] = "interactive"
+    # /synthesize only: split long input into segments synthesized in
+    # parallel and joined with crossfades (/synthesize/stream always splits)
+    split: bool = False
+    # Output format; "opus" (Ogg Opus) is only available on /synthesize
+    sample_rate: int = Field(OUTPUT_SAMPLE_RATE, ge=8000, le=48000)
+    encoding: Encoding = "int16"
+    # Lets the client stop the request early through POST /cancel/{request_id}
+    request_id: Optional[str] = None
+
+
+@app.post("/cancel/{request_id}")
+async def cancel(request_id: str):
+    """Cancel an in-progress /synthesize or /synthesize/stream request.
+
+    Its queued or running synthesis is stopped unless another request is
+    sharing it.
+    """
+    cancelled = cancel_events.get(request_id)
+    if cancelled:
+        cancelled.set()
+    return {"cancelled": cancelled is not None}
 
 
 @app.get("/health")
 async def health():
-    return {"status": "ready" if model_ready else "loading"}
+    """Report readiness; 503 until the model is loaded and warmed up."""
+    status = {"status": startup_status, **startup_stats, "startup_phases": startup_phases}
+    if pool:
+        status["queue"] = pool.stats()
+    if replicas:
+        status["replicas"] = replicas.stats()
+    if cache:
+        status["cache"] = cache.stats()
+    return JSONResponse(status_code=200 if model_ready else 503, content=status)
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus text-format metrics: latency histograms and load gauges."""
+    lines = []
+    for metric in (
+        QUEUE_WAIT_SECONDS,
+        SYNTHESIS_SECONDS,
+        RTF,
+        AUDIO_SECONDS,
+        REQUEST_CHARS,
+        *SAMPLED_METRICS,
+    ):
+        lines.extend(metric.render())
+    return Response(content="\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
 
 
 @app.get("/speakers")
 async def speakers():
     if not model_ready:
         return JSONResponse(status_code=503, content={"detail": "Model not loaded"})
-    return {"speakers": model.get_supported_speakers()}
+    return {"speakers": supported_speakers}
 
 
 def _synthesize_sync(text: str, speaker: str, language: str, instruct: Optional[str]):
     """Run synthesis on the GPU. Called from a thread pool."""
+    return _synthesize_batch_sync([text], speaker, language, instruct)[0]
+
+
+def _synthesize_batch_sync(
+    texts: list[str], speaker: str, language: str, instruct: Optional[str]
+) -> list[tuple[bytes, int, float]]:
+    """Synthesize several texts for one speaker in a single generate call."""
     kwargs = {}
     if instruct:
         kwargs["instruct"] = instruct
 
     wavs, sr = model.generate_custom_voice(
-        text=text,
+        text=texts,
         speaker=speaker,
         language=language,
         non_streaming_mode=True,
@@ -108,18 +635,1105 @@ def _synthesize_sync(text: str, speaker: str, language: str, instruct: Optional[
         **kwargs,
     )
 
-    waveform = wavs[0]
+    return [(_to_pcm16(waveform), sr, len(waveform) / sr) for waveform in wavs]
+
+
+def _synthesize_batch(
+    texts: list[str], speaker: str, language: str, instruct: Optional[str]
+) -> list[tuple[bytes, int, float]]:
+    """Run one batch on the in-process model, or on a replica in replica mode."""
+    if replicas:
+        return replicas.run_batch(texts, speaker, language, instruct)
+    return _synthesize_batch_sync(texts, speaker, language, instruct)
+
+
+def _to_pcm16(waveform: np.ndarray) -> bytes:
+    """Convert a float waveform in [-1, 1] to little-endian int16 PCM bytes."""
     waveform = np.clip(waveform, -1.0, 1.0)
-    pcm_int16 = (waveform * 32767).astype(np.int16)
-    return pcm_int16.tobytes(), sr, len(waveform) / sr
+    return (waveform * 32767).astype(np.int16).tobytes()
+
+
+def _split_sentences(text: str) -> list[str]:
+    """Split text on sentence boundaries, dropping empty pieces."""
+    return [s.strip() for s in SENTENCE_BOUNDARY.split(text) if s.strip()]
+
+
+def _split_segments(text: str, max_chars: int = SEGMENT_MAX_CHARS) -> list[str]:
+    """Split text into sentences, cutting long ones further at clause boundaries.
+
+    Clauses are packed greedily back together up to ``max_chars`` so a long
+    sentence becomes a few natural-sounding pieces rather than many tiny ones.
+    A single clause longer than ``max_chars`` is cut at word boundaries.
+    """
+    segments = []
+    for sentence in _split_sentences(text):
+        if len(sentence) <= max_chars:
+            segments.append(sentence)
+            continue
+
+        pieces = []
+        for clause in CLAUSE_BOUNDARY.split(sentence):
+            words = clause.split()
+            while words:
+                piece = words.pop(0)
+                while words and len(piece) + 1 + len(words[0]) <= max_chars:
+                    piece += " " + words.pop(0)
+                pieces.append(piece)
+
+        current = ""
+        for piece in pieces:
+            if current and len(current) + 1 + len(piece) > max_chars:
+                segments.append(current)
+                current = piece
+            else:
+                current = f"{current} {piece}" if current else piece
+        if current:
+            segments.append(current)
+    return segments
+
+
+class _OutputConverter:
+    """Resamples and re-encodes int16 PCM at OUTPUT_SAMPLE_RATE for one response.
+
+    Chunks are fed through one soxr stream so segment boundaries resample
+    seamlessly; ``flush`` drains the resampler's delay line. int16 at the
+    native rate passes straight through.
+    """
+
+    def __init__(self, sample_rate: int, encoding: str):
+        self.sample_rate = sample_rate
+        self.encoding = encoding
+        self._resampler = (
+            soxr.ResampleStream(OUTPUT_SAMPLE_RATE, sample_rate, 1, dtype="float32")
+            if sample_rate != OUTPUT_SAMPLE_RATE
+            else None
+        )
+
+    @property
+    def headers(self) -> dict:
+        return {
+            "X-Sample-Rate": str(self.sample_rate),
+            "X-Channels": "1",
+            "X-Bit-Depth": "32" if self.encoding == "float32" else "16",
+            "X-Encoding": self.encoding,
+        }
+
+    def push(self, pcm: PCMBuffer, last: bool = False) -> bytes:
+        if self._resampler is None and self.encoding == "int16":
+            return bytes(pcm)
+        samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768
+        if self._resampler is not None:
+            samples = self._resampler.resample_chunk(samples, last=last)
+        if self.encoding == "float32":
+            return samples.astype("<f4").tobytes()
+        return _to_pcm16(samples)
+
+    def flush(self) -> bytes:
+        return self.push(b"", last=True)
+
+
+def _encode_ogg_opus(pcm: PCMBuffer, sample_rate: int) -> bytes:
+    """Resample int16 PCM at OUTPUT_SAMPLE_RATE and encode it as Ogg Opus."""
+    samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768
+    if sample_rate != OUTPUT_SAMPLE_RATE:
+        samples = soxr.resample(samples, OUTPUT_SAMPLE_RATE, sample_rate)
+    out = io.BytesIO()
+    soundfile.write(out, samples, sample_rate, format="OGG", subtype="OPUS")
+    return out.getvalue()
+
+
+def _convert_output(pcm: PCMBuffer, sample_rate: int, encoding: str) -> bytes:
+    if encoding == "opus":
+        return _encode_ogg_opus(pcm, sample_rate)
+    converter = _OutputConverter(sample_rate, encoding)
+    return converter.push(pcm) + converter.flush()
+
+
+def _format_error(req: SynthesizeRequest, streaming: bool) -> Optional[str]:
+    if req.encoding == "opus":
+        if streaming:
+            return "opus is only available on /synthesize"
+        if req.sample_rate not in OPUS_SAMPLE_RATES:
+            return f"opus needs sample_rate in {list(OPUS_SAMPLE_RATES)}"
+    return None
+
+
+class _Crossfader:
+    """Joins consecutive int16 PCM segments with a short linear crossfade.
+
+    The last ``fade_ms`` of every segment is held back until the next one
+    arrives and is mixed with its head; ``flush`` releases the final tail.
+    """
+
+    def __init__(self, sample_rate: int, fade_ms: float):
+        self._fade = int(sample_rate * fade_ms / 1000)
+        self._tail = np.zeros(0, dtype=np.int16)
+
+    def push(self, pcm: PCMBuffer) -> bytes:
+        samples = np.frombuffer(pcm, dtype=np.int16)
+        if self._fade <= 0:
+            return samples.tobytes()
+
+        overlap = min(len(self._tail), len(samples))
+        ramp = np.linspace(0.0, 1.0, overlap, endpoint=False, dtype=np.float32)
+        tail = self._tail[len(self._tail) - overlap :].astype(np.float32)
+        mixed = tail * (1.0 - ramp) + samples[:overlap].astype(np.float32) * ramp
+
+        keep = min(self._fade, len(samples) - overlap)
+        out = np.concatenate(
+            [
+                self._tail[: len(self._tail) - overlap],
+                mixed.astype(np.int16),
+                samples[overlap : len(samples) - keep],
+            ]
+        )
+        self._tail = samples[len(samples) - keep :]
+        return out.tobytes()
+
+    def flush(self) -> bytes:
+        tail, self._tail = self._tail, np.zeros(0, dtype=np.int16)
+        return tail.tobytes()
+
+
+# ---------------------------------------------------------------------------
+# Worker pool with admission control
+# ---------------------------------------------------------------------------
+
+
+class Overloaded(Exception):
+    """Raised when the synthesis queue is too deep to admit more work."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Synthesis queue full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class SynthesisCancelled(Exception):
+    """Raised when every request waiting on a batch has gone away."""
+
+    def __init__(self):
+        super().__init__("Synthesis cancelled")
+
+
+# The cancel event of the batch the current thread is synthesizing, checked
+# by _check_cancelled at every decode step
+_cancel_state = threading.local()
+
+
+class SynthesisPool:
+    """Bounded set of worker threads draining a priority queue of batches.
+
+    ``admit``/``release`` track how many requests are waiting (in the batching
+    window or in this queue) and reject new ones past ``max_depth``. Only the
+    event loop thread touches the counters; workers report back through
+    ``call_soon_threadsafe``.
+    """
+
+    def __init__(self, workers: int, max_depth: int):
+        self._workers = max(1, workers)
+        self._max_depth = max_depth
+        self._queue: queue.PriorityQueue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._threads: list[threading.Thread] = []
+        self._depth = 0
+        self._busy = 0
+        self._rejected = 0
+        self._cancelled = 0
+        self._waits: deque[float] = deque(maxlen=256)
+        self._service_times: deque[float] = deque(maxlen=64)
+
+    def start(self):
+        for i in range(self._workers):
+            thread = threading.Thread(target=self._worker, name=f"synth-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        # Sentinels sort after every real priority; in-flight batches finish on their own
+        for _ in self._threads:
+            self._queue.put((math.inf, next(self._seq), None))
+        self._threads.clear()
+
+    def is_full(self, priority: str) -> bool:
+        return self._depth >= self._max_depth * PRIORITY_DEPTH_SHARE[priority]
+
+    def admit(self, priority: str):
+        """Reserve a queue slot for one request or raise Overloaded."""
+        if self.is_full(priority):
+            self._rejected += 1
+            raise Overloaded(self.retry_after())
+        self._depth += 1
+
+    def release(self, count: int = 1):
+        """Give back slots for requests that left before reaching a worker."""
+        self._depth -= count
+
+    def retry_after(self) -> int:
+        """Rough seconds until a slot frees up, for the Retry-After header."""
+        service = (
+            sum(self._service_times) / len(self._service_times) if self._service_times else 1.0
+        )
+        return max(1, math.ceil(service * (self._queue.qsize() + 1) / self._workers))
+
+    async def run(
+        self,
+        priority: str,
+        admitted: list[tuple[float, dict]],
+        fn: Callable[..., Any],
+        *args,
+        cancel: Optional[threading.Event] = None,
+    ) -> Any:
+        """Run fn(*args) on a worker thread for a batch of admitted requests.
+
+        ``admitted`` holds each request's admission time and the labels its
+        queue wait is recorded under. Once ``cancel`` is set the batch is
+        skipped if still queued, or stopped at its next decode step, and
+        SynthesisCancelled is raised.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        job = (fn, args, admitted, cancel, future, loop)
+        self._queue.put((PRIORITIES[priority], next(self._seq), job))
+        return await future
+
+    def stats(self) -> dict:
+        waits = sorted(self._waits)
+        return {
+            "depth": self._depth,
+            "max_depth": self._max_depth,
+            "workers": self._workers,
+            "busy": self._busy,
+            "rejected": self._rejected,
+            "cancelled": self._cancelled,
+            "wait_ms_avg": round(1000 * sum(waits) / len(waits), 1) if waits else 0.0,
+            "wait_ms_p95": round(1000 * waits[int(0.95 * (len(waits) - 1))], 1) if waits else 0.0,
+        }
+
+    def _worker(self):
+        while True:
+            _, _, job = self._queue.get()
+            if job is None:
+                return
+            fn, args, admitted, cancel, future, loop = job
+            now = time.monotonic()
+            loop.call_soon_threadsafe(
+                self._on_start, [(now - t, labels) for t, labels in admitted]
+            )
+            if cancel is not None and cancel.is_set():
+                # Everyone waiting on it left while it was queued
+                loop.call_soon_threadsafe(_resolve, future, None, SynthesisCancelled())
+                loop.call_soon_threadsafe(self._on_cancelled)
+                loop.call_soon_threadsafe(self._on_finish)
+                continue
+
+            _cancel_state.event = cancel
+            try:
+                result = fn(*args)
+            except Exception as e:
+                loop.call_soon_threadsafe(_resolve, future, None, e)
+                if isinstance(e, SynthesisCancelled):
+                    loop.call_soon_threadsafe(self._on_cancelled)
+            else:
+                loop.call_soon_threadsafe(_resolve, future, result, None)
+            finally:
+                _cancel_state.event = None
+                self._service_times.append(time.monotonic() - now)
+                loop.call_soon_threadsafe(self._on_finish)
+
+    def _on_start(self, waits: list[tuple[float, dict]]):
+        self._depth -= len(waits)
+        self._busy += 1
+        for wait, labels in waits:
+            self._waits.append(wait)
+            QUEUE_WAIT_SECONDS.observe(wait, **labels)
+
+    def _on_finish(self):
+        self._busy -= 1
+
+    def _on_cancelled(self):
+        self._cancelled += 1
+
+
+def _resolve(future: asyncio.Future, result: Any, error: Optional[BaseException]):
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+# ---------------------------------------------------------------------------
+# Multi-replica worker processes
+# ---------------------------------------------------------------------------
+
+
+class ReplicaCrashed(Exception):
+    """Raised for a batch whose replica process died before answering."""
+
+
+def _replica_main(index: int, cores: list[int], conn):
+    """Worker process entry point: load a model copy and serve batches on conn.
+
+    Messages in:  ("job", job_id, texts, speaker, language, instruct) or
+                  ("cancel", job_id)
+    Messages out: ("ready", speakers) once, then ("result", job_id, results, error)
+    with error "cancelled" for jobs stopped by a cancel message.
+    """
+    global model
+    if cores:
+        os.sched_setaffinity(0, cores)
+        torch.set_num_threads(len(cores))
+    elif PROFILE == "cpu":
+        _configure_cpu_threads()
+
+    device = DEVICE
+    if PROFILE == "cuda" and torch.cuda.device_count() > 1:
+        device = f"cuda:{index % torch.cuda.device_count()}"
+
+    logger.info(f"Replica {index}: loading on {device} (cores={cores or 'all'})")
+    model = _load_model(_resolve_model_path(), device)
+    if PROFILE == "cpu" and CPU_QUANTIZE_INT8:
+        _quantize_int8()
+    speakers = model.get_supported_speakers()
+    _warm_up(speakers)
+    conn.send(("ready", speakers))
+
+    # Receive on a separate thread so cancels get through mid-generate
+    jobs: queue.Queue = queue.Queue()
+    cancels: dict[int, threading.Event] = defaultdict(threading.Event)
+    cancels_lock = threading.Lock()
+
+    def receive():
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                jobs.put(None)  # front-end went away
+                return
+            if message[0] == "cancel":
+                with cancels_lock:
+                    cancels[message[1]].set()
+            else:
+                jobs.put(message[1:])
+
+    threading.Thread(target=receive, name="replica-recv", daemon=True).start()
+
+    while True:
+        job = jobs.get()
+        if job is None:
+            return
+        job_id, texts, speaker, language, instruct = job
+        with cancels_lock:
+            _cancel_state.event = cancels[job_id]
+        try:
+            if _cancel_state.event.is_set():
+                raise SynthesisCancelled()
+            results = _synthesize_batch_sync(texts, speaker, language, instruct)
+            conn.send(("result", job_id, results, None))
+        except SynthesisCancelled:
+            conn.send(("result", job_id, None, "cancelled"))
+        except Exception as e:
+            conn.send(("result", job_id, None, str(e)))
+        finally:
+            with cancels_lock:
+                cancels.pop(job_id, None)
+
+
+class _ReplicaJob:
+    def __init__(self, job_id: int):
+        self.id = job_id
+        self.done = threading.Event()
+        self.result: Optional[list] = None
+        self.error: Optional[Exception] = None
+        self.cancelled = False
+
+
+class _Replica:
+    def __init__(self, index: int, cores: list[int]):
+        self.index = index
+        self.cores = cores
+        self.process: Optional[multiprocessing.Process] = None
+        self.conn = None
+        self.healthy = False
+        self.failed = False
+        self.restarts = 0
+        self.completed = 0
+        self.outstanding: dict[int, _ReplicaJob] = {}
+        self.send_lock = threading.Lock()
+
+
+class ReplicaPool:
+    """Model replicas in worker processes behind least-loaded dispatch.
+
+    ``run_batch`` blocks the calling thread (a SynthesisPool worker) until a
+    replica answers. If a replica dies, its outstanding batches are retried
+    once on another healthy replica (not more, so a batch that crashes its
+    replica can't take the whole pool down) and the dead one is respawned.
+    """
+
+    def __init__(self, count: int):
+        self._ctx = multiprocessing.get_context("spawn")
+        self._cond = threading.Condition()
+        self._ids = itertools.count()
+        self._stopping = False
+        self.speakers: Optional[list[str]] = None
+
+        cores: list[int] = []
+        if hasattr(os, "sched_getaffinity"):
+            cores = sorted(os.sched_getaffinity(0))
+        else:
+            logger.warning("CPU affinity not supported on this platform, replicas won't be pinned")
+        if cores and len(cores) < count:
+            logger.warning(f"{count} replicas on {len(cores)} cores, pinning disabled")
+            cores = []
+        share = len(cores) // count if cores else 0
+        self._replicas = [
+            _Replica(i, cores[i * share : (i + 1) * share]) for i in range(count)
+        ]
+
+    def start(self):
+        for replica in self._replicas:
+            self._spawn(replica)
+            threading.Thread(
+                target=self._reader, args=(replica,), name=f"replica-{replica.index}", daemon=True
+            ).start()
+
+    def wait_ready(self):
+        """Block until every replica has loaded and warmed up its model."""
+        with self._cond:
+            self._cond.wait_for(
+                lambda: all(r.healthy or r.failed for r in self._replicas)
+            )
+            failed = [r.index for r in self._replicas if r.failed]
+        if failed:
+            raise RuntimeError(f"Replica(s) {failed} failed to start")
+
+    def stop(self):
+        self._stopping = True
+        for replica in self._replicas:
+            if replica.conn:
+                replica.conn.close()
+            if replica.process and replica.process.is_alive():
+                replica.process.terminate()
+                replica.process.join(timeout=5)
+
+    def run_batch(
+        self, texts: list[str], speaker: str, language: str, instruct: Optional[str]
+    ) -> list[tuple[bytes, int, float]]:
+        # Set by SynthesisPool when the batch's callers have all gone away
+        cancel = getattr(_cancel_state, "event", None)
+        for attempt in range(min(2, len(self._replicas))):
+            replica, job = self._dispatch()
+            try:
+                with replica.send_lock:
+                    replica.conn.send(("job", job.id, texts, speaker, language, instruct))
+            except (OSError, ValueError):
+                # Pipe already closed; the reader thread will notice the crash
+                with self._cond:
+                    replica.outstanding.pop(job.id, None)
+                job.error = ReplicaCrashed(f"Replica {replica.index} unreachable")
+            else:
+                self._wait(replica, job, cancel)
+
+            if job.cancelled:
+                raise SynthesisCancelled()
+            if isinstance(job.error, ReplicaCrashed):
+                logger.warning(f"{job.error}, retrying batch on another replica")
+                continue
+            if job.error:
+                raise job.error
+            return job.result
+        raise RuntimeError("TTS replicas crashed while running the batch")
+
+    def _wait(self, replica: _Replica, job: _ReplicaJob, cancel: Optional[threading.Event]):
+        """Wait for a job, forwarding a cancel to the replica if one comes in."""
+        if cancel is None:
+            job.done.wait()
+            return
+        while not job.done.wait(timeout=0.02):
+            if cancel.is_set():
+                try:
+                    with replica.send_lock:
+                        replica.conn.send(("cancel", job.id))
+                except (OSError, ValueError):
+                    pass  # crashed; the reader thread fails the job over
+                job.done.wait()
+                return
+
+    def stats(self) -> list[dict]:
+        with self._cond:
+            return [
+                {
+                    "index": r.index,
+                    "pid": r.process.pid if r.process else None,
+                    "cores": r.cores,
+                    "healthy": r.healthy,
+                    "failed": r.failed,
+                    "outstanding": len(r.outstanding),
+                    "completed": r.completed,
+                    "restarts": r.restarts,
+                }
+                for r in self._replicas
+            ]
+
+    def _dispatch(self) -> tuple[_Replica, _ReplicaJob]:
+        """Register a job on the healthy replica with the fewest outstanding batches."""
+        with self._cond:
+            self._cond.wait_for(
+                lambda: any(r.healthy for r in self._replicas), timeout=REPLICA_WAIT_S
+            )
+            healthy = [r for r in self._replicas if r.healthy]
+            if not healthy:
+                raise RuntimeError("No healthy TTS replicas")
+            replica = min(healthy, key=lambda r: len(r.outstanding))
+            job = _ReplicaJob(next(self._ids))
+            replica.outstanding[job.id] = job
+            return replica, job
+
+    def _spawn(self, replica: _Replica):
+        parent_conn, child_conn = self._ctx.Pipe()
+        replica.process = self._ctx.Process(
+            target=_replica_main,
+            args=(replica.index, replica.cores, child_conn),
+            name=f"qwen-tts-replica-{replica.index}",
+            daemon=True,
+        )
+        replica.process.start()
+        child_conn.close()
+        replica.conn = parent_conn
+
+    def _reader(self, replica: _Replica):
+        while not self._stopping:
+            try:
+                message = replica.conn.recv()
+            except (EOFError, OSError):
+                if self._stopping or not self._on_crash(replica):
+                    return
+                continue
+
+            if message[0] == "ready":
+                with self._cond:
+                    replica.healthy = True
+                    self.speakers = self.speakers or message[1]
+                    self._cond.notify_all()
+                logger.info(f"Replica {replica.index} ready (pid {replica.process.pid})")
+                continue
+
+            _, job_id, results, error = message
+            with self._cond:
+                job = replica.outstanding.pop(job_id, None)
+                replica.completed += 1
+            if job:
+                job.result = results
+                job.cancelled = error == "cancelled"
+                job.error = RuntimeError(error) if error and not job.cancelled else None
+                job.done.set()
+
+    def _on_crash(self, replica: _Replica) -> bool:
+        """Fail the replica's outstanding jobs over and respawn it.
+
+        Returns False if the replica died while still starting up; respawning
+        would most likely just crash again, so it is marked failed instead.
+        """
+        replica.process.join(timeout=1)
+        with self._cond:
+            was_ready = replica.healthy
+            replica.healthy = False
+            replica.failed = not was_ready
+            jobs = list(replica.outstanding.values())
+            replica.outstanding.clear()
+            self._cond.notify_all()
+        for job in jobs:
+            job.error = ReplicaCrashed(f"Replica {replica.index} crashed")
+            job.done.set()
+
+        exit_info = (
+            f"Replica {replica.index} (pid {replica.process.pid}) exited "
+            f"with code {replica.process.exitcode}"
+        )
+        if not was_ready:
+            logger.error(f"{exit_info} during startup, not respawning")
+            return False
+        logger.error(f"{exit_info}, {len(jobs)} batch(es) to retry; respawning")
+        replica.restarts += 1
+        self._spawn(replica)
+        return True
+
+
+# ---------------------------------------------------------------------------
+# Micro-batching scheduler
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _PendingSynthesis:
+    text: str
+    speaker: str
+    language: str
+    instruct: Optional[str]
+    priority: str
+    solo: bool
+    admitted_at: float
+    future: asyncio.Future
+
+    @property
+    def wait_labels(self) -> dict:
+        return {"speaker": _speaker_label(self.speaker), "priority": self.priority}
+
+    @property
+    def group(self) -> tuple:
+        if self.solo:
+            return (id(self),)
+        return (self.speaker, self.language, self.instruct or "")
+
+
+class BatchScheduler:
+    """Gathers concurrent synthesis requests into batched generate calls.
+
+    The first request to arrive opens a window of ``max_wait_ms``; everything
+    submitted before the window closes (or until ``max_batch_size`` requests
+    are waiting) is grouped by speaker/language/instruct and each group is
+    synthesized with one ``generate_custom_voice`` call over its texts.
+    Batches are handed to the worker pool at the priority of their most
+    urgent member. Requests submitted with ``solo=True`` always get a batch
+    of their own, so their latency isn't tied to the longest text in a batch.
+    """
+
+    def __init__(self, pool: SynthesisPool, max_batch_size: int, max_wait_ms: float):
+        self._pool = pool
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_wait = max(0.0, max_wait_ms) / 1000
+        self._pending: list[_PendingSynthesis] = []
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._batches: set[asyncio.Task] = set()
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for item in self._pending:
+            if not item.future.done():
+                item.future.set_exception(RuntimeError("Server shutting down"))
+        self._pool.release(len(self._pending))
+        self._pending.clear()
+
+    async def submit(
+        self,
+        text: str,
+        speaker: str,
+        language: str,
+        instruct: Optional[str],
+        priority: str = "interactive",
+        solo: bool = False,
+    ) -> tuple[bytes, int, float]:
+        """Queue one text for synthesis and wait for its PCM.
+
+        Raises Overloaded if the pool has no room for the request.
+        """
+        self._pool.admit(priority)
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(
+            _PendingSynthesis(
+                text, speaker, language, instruct, priority, solo, time.monotonic(), future
+            )
+        )
+        self._wakeup.set()
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+
+            # Hold the window open until it expires or the batch is full
+            deadline = loop.time() + self._max_wait
+            while len(self._pending) < self._max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+
+            batch = self._pending[: self._max_batch_size]
+            self._pending = self._pending[self._max_batch_size :]
+            if not self._pending:
+                self._wakeup.clear()
+
+            # Callers that gave up while waiting don't need synthesizing
+            groups: dict[tuple, list[_PendingSynthesis]] = defaultdict(list)
+            for item in batch:
+                if item.future.done():
+                    self._pool.release()
+                else:
+                    groups[item.group].append(item)
+
+            for items in groups.values():
+                task = asyncio.create_task(self._run_batch(items))
+                self._batches.add(task)
+                task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, items: list[_PendingSynthesis]):
+        first = items[0]
+        texts = [item.text for item in items]
+        priority = min((item.priority for item in items), key=PRIORITIES.__getitem__)
+        start = time.time()
+
+        # Stop synthesizing once nobody is waiting for any text in the batch
+        cancel = threading.Event()
+
+        def on_item_done(_):
+            if all(item.future.done() for item in items):
+                cancel.set()
+
+        for item in items:
+            item.future.add_done_callback(on_item_done)
+
+        try:
+            results = await self._pool.run(
+                priority,
+                [(item.admitted_at, item.wait_labels) for item in items],
+                _synthesize_batch,
+                texts,
+                first.speaker,
+                first.language,
+                first.instruct,
+                cancel=cancel,
+            )
+        except SynthesisCancelled:
+            logger.debug(f"Cancelled batch of {len(items)} speaker={first.speaker}")
+            return
+        except Exception as e:
+            for item in items:
+                if not item.future.done():
+                    item.future.set_exception(e)
+            return
+
+        if len(items) > 1:
+            audio = sum(duration for _, _, duration in results)
+            logger.debug(
+                f"Batch of {len(items)} synthesized {audio:.2f}s audio "
+                f"in {time.time() - start:.2f}s speaker={first.speaker}"
+            )
+        for item, result in zip(items, results):
+            if not item.future.done():
+                item.future.set_result(result)
+
+
+# ---------------------------------------------------------------------------
+# Synthesis cache
+# ---------------------------------------------------------------------------
+
+class SynthesisCache:
+    """Content-addressed PCM cache with a memory LRU and an on-disk tier.
+
+    Entries are keyed on a hash of the normalized text, speaker, language,
+    instruct and model. Memory hits return the stored bytes directly; disk
+    hits return a memoryview over an mmap of the raw PCM file and are
+    promoted into the memory tier. Concurrent misses on the same key share
+    a single in-flight synthesis, which is cancelled if all of them leave.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_memory_bytes: int,
+        disk_dir: Optional[Path],
+        max_disk_bytes: int,
+        model_tag: str,
+    ):
+        self._max_memory_bytes = max_memory_bytes
+        self._max_disk_bytes = max_disk_bytes
+        self._model_tag = model_tag
+        self._memory: OrderedDict[str, PCMBuffer] = OrderedDict()
+        self._memory_bytes = 0
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._waiters: dict[str, int] = defaultdict(int)
+        self._counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "shared": 0}
+
+        self._disk_dir = disk_dir
+        self._disk_bytes = 0
+        if disk_dir:
+            disk_dir.mkdir(parents=True, exist_ok=True)
+            self._disk_bytes = sum(f.stat().st_size for f in disk_dir.glob("*.pcm"))
+            logger.info(
+                f"Synthesis cache: {len(list(disk_dir.glob('*.pcm')))} file(s), "
+                f"{self._disk_bytes / 1e6:.1f} MB on disk at {disk_dir}"
+            )
+
+    def key(self, text: str, speaker: str, language: str, instruct: Optional[str]) -> str:
+        normalized = " ".join(unicodedata.normalize("NFKC", text).split())
+        parts = [
+            self._model_tag,
+            normalized,
+            speaker.lower(),
+            language.lower(),
+            " ".join((instruct or "").split()),
+        ]
+        return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+
+    def stats(self) -> dict:
+        lookups = sum(self._counters.values())
+        hits = lookups - self._counters["misses"]
+        return {
+            **self._counters,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "disk_bytes": self._disk_bytes,
+        }
+
+    async def get_or_synthesize(
+        self,
+        text: str,
+        speaker: str,
+        language: str,
+        instruct: Optional[str],
+        synthesize: Callable[[], Awaitable[tuple[bytes, int, float]]],
+    ) -> tuple[PCMBuffer, int, float, bool]:
+        """Return (pcm, sample_rate, duration, cache_hit) for the request."""
+        key = self.key(text, speaker, language, instruct)
+
+        pcm = self._get_memory(key)
+        if pcm is not None:
+            self._counters["memory_hits"] += 1
+            return pcm, OUTPUT_SAMPLE_RATE, _duration(pcm), True
+
+        pcm = self._get_disk(key)
+        if pcm is not None:
+            self._counters["disk_hits"] += 1
+            self._put_memory(key, pcm)
+            return pcm, OUTPUT_SAMPLE_RATE, _duration(pcm), True
+
+        task = self._inflight.get(key)
+        if task:
+            self._counters["shared"] += 1
+        else:
+            self._counters["misses"] += 1
+            task = asyncio.create_task(self._synthesize_and_store(key, synthesize))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # Shielded so one caller going away doesn't cancel it for the others;
+        # when the last one goes, the synthesis is cancelled too.
+        self._waiters[key] += 1
+        try:
+            pcm, sr, duration = await asyncio.shield(task)
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+                if not task.done():
+                    task.cancel()
+        return pcm, sr, duration, False
+
+    async def _synthesize_and_store(
+        self, key: str, synthesize: Callable[[], Awaitable[tuple[bytes, int, float]]]
+    ) -> tuple[bytes, int, float]:
+        pcm, sr, duration = await synthesize()
+        if sr == OUTPUT_SAMPLE_RATE:
+            self._put_memory(key, pcm)
+            if self._disk_dir:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, self._put_disk, key, pcm)
+        return pcm, sr, duration
+
+    def _get_memory(self, key: str) -> Optional[PCMBuffer]:
+        pcm = self._memory.get(key)
+        if pcm is not None:
+            self._memory.move_to_end(key)
+        return pcm
+
+    def _put_memory(self, key: str, pcm: PCMBuffer):
+        if len(pcm) > self._max_memory_bytes or key in self._memory:
+            return
+        self._memory[key] = pcm
+        self._memory_bytes += len(pcm)
+        while self._memory_bytes > self._max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _get_disk(self, key: str) -> Optional[memoryview]:
+        if not self._disk_dir:
+            return None
+        path = self._disk_dir / f"{key}.pcm"
+        try:
+            with open(path, "rb") as f:
+                # The mapping stays valid after the file is closed
+                return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        except (FileNotFoundError, ValueError):
+            # ValueError: empty file, which mmap refuses to map
+            return None
+
+    def _put_disk(self, key: str, pcm: bytes):
+        path = self._disk_dir / f"{key}.pcm"
+        if path.exists():
+            # Already stored and counted in _disk_bytes
+            return
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            tmp.write_bytes(pcm)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Failed to write cache file {path}: {e}")
+            tmp.unlink(missing_ok=True)
+            return
+        self._disk_bytes += len(pcm)
+        if self._disk_bytes > self._max_disk_bytes:
+            self._prune_disk()
+
+    def _prune_disk(self):
+        """Delete least recently modified files until the tier is at 90% of its budget."""
+        files = sorted(self._disk_dir.glob("*.pcm"), key=lambda f: f.stat().st_mtime)
+        total = sum(f.stat().st_size for f in files)
+        target = self._max_disk_bytes * 0.9
+        for f in files:
+            if total <= target:
+                break
+            total -= f.stat().st_size
+            f.unlink(missing_ok=True)
+        self._disk_bytes = total
+
+
+def _duration(pcm: PCMBuffer) -> float:
+    return len(pcm) / 2 / OUTPUT_SAMPLE_RATE
+
+
+async def synthesize_pcm(
+    text: str,
+    speaker: str,
+    language: str,
+    instruct: Optional[str],
+    priority: str = "interactive",
+    solo: bool = False,
+) -> tuple[PCMBuffer, int, float, bool]:
+    """Synthesize one text through the cache and batching scheduler.
+
+    Returns (pcm, sample_rate, duration, cache_hit). Raises Overloaded on a
+    cache miss when the worker pool is full.
+    """
+    return await cache.get_or_synthesize(
+        text,
+        speaker,
+        language,
+        instruct,
+        lambda: scheduler.submit(text, speaker, language, instruct, priority, solo),
+    )
+
+
+async def synthesize_segments(
+    segments: list[str],
+    speaker: str,
+    language: str,
+    instruct: Optional[str],
+    priority: str = "interactive",
+    cancelled: Optional[asyncio.Event] = None,
+) -> AsyncIterator[tuple[PCMBuffer, int, float, bool]]:
+    """Synthesize segments concurrently and yield their results in order.
+
+    Segment 1 is submitted on its own so it comes back as fast as possible;
+    segments 2..n are submitted right behind it and batch with each other
+    while segment 1 is being played out. Raises RequestCancelled once
+    ``cancelled`` is set.
+    """
+    cancelled = cancelled or asyncio.Event()
+    tasks = [
+        asyncio.create_task(
+            synthesize_pcm(segment, speaker, language, instruct, priority, solo=i == 0)
+        )
+        for i, segment in enumerate(segments)
+    ]
+    try:
+        for segment, task in zip(segments, tasks):
+            try:
+                result = await _unless_cancelled(task, cancelled)
+            except Overloaded:
+                # The queue filled up behind us; earlier segments have since
+                # drained, so try this one again on its own.
+                result = await _unless_cancelled(
+                    synthesize_pcm(segment, speaker, language, instruct, priority, solo=True),
+                    cancelled,
+                )
+            yield result
+    finally:
+        for task in tasks:
+            task.cancel()
+            if task.done() and not task.cancelled():
+                task.exception()  # mark retrieved so asyncio doesn't warn
+
+
+class RequestCancelled(Exception):
+    """The client disconnected or cancelled the request by its id."""
+
+
+@contextmanager
+def _cancellation(request_id: Optional[str]) -> Iterator[asyncio.Event]:
+    """Event that POST /cancel/{request_id} sets while the request is running."""
+    cancelled = asyncio.Event()
+    if request_id:
+        cancel_events[request_id] = cancelled
+    try:
+        yield cancelled
+    finally:
+        if request_id and cancel_events.get(request_id) is cancelled:
+            del cancel_events[request_id]
+
+
+async def _set_on_disconnect(request: Request, cancelled: asyncio.Event):
+    """Set ``cancelled`` when the client closes the connection."""
+    # The body has been read already, so the next message is the disconnect
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
+    cancelled.set()
+
+
+async def _unless_cancelled(awaitable: Awaitable, cancelled: asyncio.Event) -> Any:
+    """Await ``awaitable``, cancelling it and raising RequestCancelled if
+    ``cancelled`` is set first.
+
+    Cancelling the synthesis task lets the cache and scheduler stop the batch
+    (between decode steps, if it's already running) once nobody else needs it.
+    """
+    work = asyncio.ensure_future(awaitable)
+    waiter = asyncio.create_task(cancelled.wait())
+    try:
+        done, _ = await asyncio.wait({work, waiter}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        waiter.cancel()
+        if not work.done():
+            work.cancel()
+    if work not in done:
+        raise RequestCancelled()
+    return work.result()
+
+
+def _overloaded_response(e: Overloaded) -> JSONResponse:
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(e)},
+        headers={"Retry-After": str(e.retry_after)},
+    )
 
 
 @app.post("/synthesize")
-async def synthesize(req: SynthesizeRequest):
-    """Synthesize text to raw 16-bit PCM audio.
+async def synthesize(req: SynthesizeRequest, request: Request):
+    """Synthesize text to audio.
 
-    Returns raw PCM bytes. Synthesis runs in a thread pool so the
-    server stays responsive to health checks and concurrent requests.
+    Returns raw PCM bytes (int16 by default), or an Ogg Opus file, at the
+    requested sample rate. Repeated phrases are served from the synthesis
+    cache; misses go through the batching scheduler, so concurrent requests
+    for the same voice share one generate call.
     """
     if not model_ready:
         return JSONResponse(status_code=503, content={"detail": "Model not loaded"})
@@ -127,38 +1741,439 @@ async def synthesize(req: SynthesizeRequest):
     text = req.text.strip()
     if not text:
         return JSONResponse(status_code=400, content={"detail": "Empty text"})
+    if error := _format_error(req, streaming=False):
+        return JSONResponse(status_code=400, content={"detail": error})
 
+    global in_flight
     logger.debug(f"Synthesizing: [{text[:80]}] speaker={req.speaker}")
     start = time.time()
+    in_flight += 1
 
     try:
-        loop = asyncio.get_running_loop()
-        pcm_bytes, sr, audio_duration = await loop.run_in_executor(
-            None, _synthesize_sync, text, req.speaker, req.language, req.instruct
-        )
+        with _cancellation(req.request_id) as cancelled:
+            watcher = asyncio.create_task(_set_on_disconnect(request, cancelled))
+            try:
+                if req.split:
+                    work = _synthesize_joined(req, text, cancelled)
+                else:
+                    work = synthesize_pcm(
+                        text, req.speaker, req.language, req.instruct, req.priority
+                    )
+                pcm_bytes, sr, audio_duration, cache_hit = await _unless_cancelled(
+                    work, cancelled
+                )
+            finally:
+                watcher.cancel()
 
         elapsed = time.time() - start
-        rtf = elapsed / audio_duration if audio_duration > 0 else 0
-        logger.info(
-            f"Synthesized {audio_duration:.2f}s audio in {elapsed:.2f}s "
-            f"(RTF={rtf:.2f}) [{text[:50]}]"
+        _observe_request(
+            req.speaker, "cache_hit" if cache_hit else "ok", len(text), elapsed, audio_duration
         )
+        if cache_hit:
+            logger.info(
+                f"Cache hit: {audio_duration:.2f}s audio in {elapsed * 1e6:.0f}us [{text[:50]}]"
+            )
+        else:
+            rtf = elapsed / audio_duration if audio_duration > 0 else 0
+            logger.info(
+                f"Synthesized {audio_duration:.2f}s audio in {elapsed:.2f}s "
+                f"(RTF={rtf:.2f}) [{text[:50]}]"
+            )
 
-        return Response(
-            content=pcm_bytes,
-            media_type="audio/pcm",
-            headers={
-                "X-Sample-Rate": str(sr),
-                "X-Channels": "1",
-                "X-Bit-Depth": "16",
-                "X-Audio-Duration": f"{audio_duration:.3f}",
-            },
-        )
+        headers = {
+            "X-Audio-Duration": f"{audio_duration:.3f}",
+            "X-Cache": "hit" if cache_hit else "miss",
+        }
+        if req.sample_rate == sr and req.encoding == "int16":
+            content = pcm_bytes
+            headers.update(_OutputConverter(sr, "int16").headers)
+        else:
+            content = await asyncio.get_running_loop().run_in_executor(
+                None, _convert_output, pcm_bytes, req.sample_rate, req.encoding
+            )
+            headers.update(_OutputConverter(req.sample_rate, req.encoding).headers)
+
+        media_type = "audio/ogg; codecs=opus" if req.encoding == "opus" else "audio/pcm"
+        return Response(content=content, media_type=media_type, headers=headers)
+
+    except Overloaded as e:
+        logger.warning(f"Rejected {req.priority} request: {e}")
+        _observe_request(req.speaker, "rejected", len(text))
+        return _overloaded_response(e)
+
+    except RequestCancelled:
+        logger.debug(f"Cancelled after {time.time() - start:.2f}s [{text[:50]}]")
+        _observe_request(req.speaker, "cancelled", len(text), time.time() - start)
+        # 499 (client closed request); usually nobody is left to read it
+        return JSONResponse(status_code=499, content={"detail": "Cancelled"})
 
     except Exception as e:
         logger.error(f"Synthesis failed: {e}")
+        _observe_request(req.speaker, "error", len(text), time.time() - start)
         return JSONResponse(status_code=500, content={"detail": str(e)})
 
+    finally:
+        in_flight -= 1
+
+
+async def _synthesize_joined(
+    req: SynthesizeRequest, text: str, cancelled: asyncio.Event
+) -> tuple[bytes, int, float, bool]:
+    """Synthesize split segments in parallel and crossfade them into one buffer."""
+    crossfader = _Crossfader(OUTPUT_SAMPLE_RATE, CROSSFADE_MS)
+    chunks = []
+    all_hits = True
+    async for pcm, _, _, cache_hit in synthesize_segments(
+        _split_segments(text), req.speaker, req.language, req.instruct, req.priority, cancelled
+    ):
+        chunks.append(crossfader.push(pcm))
+        all_hits = all_hits and cache_hit
+    chunks.append(crossfader.flush())
+    pcm_bytes = b"".join(chunks)
+    return pcm_bytes, OUTPUT_SAMPLE_RATE, _duration(pcm_bytes), all_hits
+
+
+@app.post("/synthesize/stream")
+async def synthesize_stream(req: SynthesizeRequest):
+    """Synthesize text and stream raw PCM with chunked transfer encoding.
+
+    The text is split into sentence/clause segments. Segment 1 is synthesized
+    and streamed first while the rest are queued and batched behind it, so
+    time to first audio doesn't grow with the length of the input. Segments
+    are joined with short crossfades, then resampled and encoded as requested.
+    """
+    if not model_ready:
+        return JSONResponse(status_code=503, content={"detail": "Model not loaded"})
+
+    text = req.text.strip()
+    if not text:
+        return JSONResponse(status_code=400, content={"detail": "Empty text"})
+    if error := _format_error(req, streaming=True):
+        return JSONResponse(status_code=400, content={"detail": error})
+
+    # Once the stream starts the status code is fixed, so shed load up front
+    if pool.is_full(req.priority):
+        e = Overloaded(pool.retry_after())
+        logger.warning(f"Rejected {req.priority} stream: {e}")
+        _observe_request(req.speaker, "rejected", len(text))
+        return _overloaded_response(e)
+
+    segments = _split_segments(text)
+    converter = _OutputConverter(req.sample_rate, req.encoding)
+    logger.debug(
+        f"Streaming {len(segments)} segment(s): [{text[:80]}] speaker={req.speaker}"
+    )
+
+    async def pcm_chunks():
+        global in_flight
+        start = time.time()
+        total_audio = 0.0
+        all_hits = True
+        status = "cancelled"  # unless we get to the end or fail first
+        crossfader = _Crossfader(OUTPUT_SAMPLE_RATE, CROSSFADE_MS)
+        # A client disconnect cancels this generator (and with it the
+        # segment tasks); an explicit cancel by request_id ends it cleanly.
+        with _cancellation(req.request_id) as cancelled:
+            results = synthesize_segments(
+                segments, req.speaker, req.language, req.instruct, req.priority, cancelled
+            )
+            in_flight += 1
+            try:
+                i = 0
+                async for pcm_bytes, sr, audio_duration, cache_hit in results:
+                    if sr != OUTPUT_SAMPLE_RATE:
+                        logger.warning(
+                            f"Model returned {sr} Hz, header advertised {OUTPUT_SAMPLE_RATE} Hz"
+                        )
+                    if i == 0:
+                        logger.debug(f"First audio after {time.time() - start:.2f}s")
+                    i += 1
+                    total_audio += audio_duration
+                    all_hits = all_hits and cache_hit
+                    yield converter.push(crossfader.push(pcm_bytes))
+                yield converter.push(crossfader.flush(), last=True)
+                status = "cache_hit" if all_hits else "ok"
+            except RequestCancelled:
+                logger.debug(f"Stream cancelled on segment {i + 1} [{text[:50]}]")
+                return
+            except Exception as e:
+                # Headers are already sent, so all we can do is end the stream.
+                logger.error(f"Streaming synthesis failed on segment {i + 1}: {e}")
+                status = "error"
+                return
+            finally:
+                in_flight -= 1
+                await results.aclose()
+                _observe_request(req.speaker, status, len(text), time.time() - start, total_audio)
+
+            elapsed = time.time() - start
+            rtf = elapsed / total_audio if total_audio > 0 else 0
+            logger.info(
+                f"Streamed {total_audio:.2f}s audio in {elapsed:.2f}s "
+                f"(RTF={rtf:.2f}) [{text[:50]}]"
+            )
+
+    return StreamingResponse(pcm_chunks(), media_type="audio/pcm", headers=converter.headers)
+
+
+# ---------------------------------------------------------------------------
+# WebSocket sessions
+# ---------------------------------------------------------------------------
+#
+# One connection carries many utterances. Client -> server (JSON text):
+#   {"type": "config", "speaker", "language", "instruct", "priority",
+#    "sample_rate", "encoding"}  session defaults (encoding: int16 | float32)
+#   {"type": "text", "utterance_id", "text", ...same optional fields}
+#   {"type": "flush", "utterance_id"}   no more text; finish the utterance
+#   {"type": "cancel", "utterance_id"}  drop whatever hasn't been sent yet
+# Server -> client:
+#   {"type": "ready", "sample_rate"}                 once, after connecting
+#   binary: 1-byte id length, utterance id (UTF-8), PCM in the chosen format
+#   {"type": "done", "utterance_id", "audio_seconds"}
+#   {"type": "cancelled" | "error", "utterance_id", ...}
+#
+# Text is synthesized as soon as a complete sentence (or a clause-bounded
+# segment of SEGMENT_MAX_CHARS) has arrived, so speech can start while the
+# rest of the utterance is still being generated upstream.
+
+
+def _take_complete_segments(buffer: str) -> tuple[list[str], str]:
+    """Split off the segments of ``buffer`` that more text can no longer change.
+
+    Returns (segments, rest) where ``rest`` is the unfinished tail to keep
+    buffering.
+    """
+    sentences = SENTENCE_BOUNDARY.split(buffer)
+    rest = sentences.pop()
+    segments = [segment for sentence in sentences for segment in _split_segments(sentence)]
+    if len(rest) > SEGMENT_MAX_CHARS:
+        # A long sentence still in progress: release all but its last clause
+        pieces = _split_segments(rest)
+        segments.extend(pieces[:-1])
+        rest = pieces[-1] + (" " if rest[-1].isspace() else "")
+    return segments, rest
+
+
+def _audio_message(utterance_id: str, pcm: bytes) -> bytes:
+    tag = utterance_id.encode()
+    return bytes([len(tag)]) + tag + pcm
+
+
+class _Utterance:
+    """Text received so far for one utterance and its queued segment tasks."""
+
+    def __init__(self, utterance_id: str, options: dict):
+        self.id = utterance_id
+        self.speaker = options["speaker"]
+        self.language = options["language"]
+        self.instruct = options["instruct"]
+        self.priority = options["priority"]
+        self.converter = _OutputConverter(options["sample_rate"], options["encoding"])
+        self.buffer = ""
+        self.chars = 0
+        self.flushed = False
+        self.started = time.time()
+        self.tasks: list[asyncio.Task] = []
+        # (segment text, task) in order; None once flushed
+        self.segments: asyncio.Queue = asyncio.Queue()
+        self.sender: Optional[asyncio.Task] = None
+
+
+class SpeechSession:
+    """Serves the utterances of one WebSocket connection."""
+
+    def __init__(self, websocket: WebSocket):
+        self._ws = websocket
+        self._send_lock = asyncio.Lock()
+        self._utterances: dict[str, _Utterance] = {}
+        self._defaults = {
+            "speaker": DEFAULT_SPEAKER,
+            "language": "English",
+            "instruct": None,
+            "priority": "interactive",
+            "sample_rate": OUTPUT_SAMPLE_RATE,
+            "encoding": "int16",
+        }
+
+    async def run(self):
+        await self._send_json({"type": "ready", "sample_rate": OUTPUT_SAMPLE_RATE})
+        try:
+            while True:
+                message = await self._ws.receive_json()
+                kind = message.get("type")
+                if kind == "config":
+                    self._defaults = self._options(message)
+                elif kind == "text":
+                    await self._on_text(message)
+                elif kind == "flush":
+                    await self._on_flush(message)
+                elif kind == "cancel":
+                    await self._on_cancel(message)
+                else:
+                    await self._send_json({"type": "error", "detail": f"Unknown type {kind!r}"})
+        except WebSocketDisconnect:
+            pass
+        finally:
+            for utterance in list(self._utterances.values()):
+                self._abort(utterance)
+
+    def _options(self, message: dict) -> dict:
+        options = {key: message.get(key, value) for key, value in self._defaults.items()}
+        if options["priority"] not in PRIORITIES:
+            options["priority"] = self._defaults["priority"]
+        rate = options["sample_rate"]
+        if not isinstance(rate, int) or not 8000 <= rate <= 48000:
+            options["sample_rate"] = self._defaults["sample_rate"]
+        if options["encoding"] not in ("int16", "float32"):
+            options["encoding"] = self._defaults["encoding"]
+        return options
+
+    async def _on_text(self, message: dict):
+        utterance_id = str(message.get("utterance_id", ""))
+        if not utterance_id or len(utterance_id.encode()) > 255:
+            await self._send_json({"type": "error", "detail": "Bad utterance_id"})
+            return
+
+        utterance = self._utterances.get(utterance_id)
+        if utterance is None:
+            utterance = _Utterance(utterance_id, self._options(message))
+            utterance.sender = asyncio.create_task(self._stream(utterance))
+            self._utterances[utterance_id] = utterance
+        elif utterance.flushed:
+            await self._send_json(
+                {"type": "error", "utterance_id": utterance_id, "detail": "Already flushed"}
+            )
+            return
+
+        text = str(message.get("text", ""))
+        utterance.chars += len(text)
+        segments, utterance.buffer = _take_complete_segments(utterance.buffer + text)
+        for segment in segments:
+            self._submit(utterance, segment)
+
+    async def _on_flush(self, message: dict):
+        utterance = self._utterances.get(str(message.get("utterance_id", "")))
+        if utterance is None or utterance.flushed:
+            return
+        for segment in _split_segments(utterance.buffer):
+            self._submit(utterance, segment)
+        utterance.buffer = ""
+        utterance.flushed = True
+        utterance.segments.put_nowait(None)
+
+    async def _on_cancel(self, message: dict):
+        utterance = self._utterances.get(str(message.get("utterance_id", "")))
+        if utterance is None:
+            return
+        self._abort(utterance)
+        await self._send_json({"type": "cancelled", "utterance_id": utterance.id})
+
+    def _submit(self, utterance: _Utterance, segment: str):
+        # Like synthesize_segments: the first segment goes alone for a fast
+        # start, later ones may batch with each other.
+        task = asyncio.create_task(
+            synthesize_pcm(
+                segment,
+                utterance.speaker,
+                utterance.language,
+                utterance.instruct,
+                utterance.priority,
+                solo=not utterance.tasks,
+            )
+        )
+        utterance.tasks.append(task)
+        utterance.segments.put_nowait((segment, task))
+
+    def _abort(self, utterance: _Utterance):
+        self._utterances.pop(utterance.id, None)
+        if utterance.sender:
+            utterance.sender.cancel()
+        for task in utterance.tasks:
+            task.cancel()
+
+    async def _stream(self, utterance: _Utterance):
+        """Send an utterance's audio in segment order as each one is ready."""
+        global in_flight
+        in_flight += 1
+        crossfader = _Crossfader(OUTPUT_SAMPLE_RATE, CROSSFADE_MS)
+        total_audio = 0.0
+        all_hits = True
+        status = "cancelled"
+        try:
+            while True:
+                item = await utterance.segments.get()
+                if item is None:
+                    break
+                segment, task = item
+                try:
+                    pcm, _, audio_duration, cache_hit = await task
+                except Overloaded:
+                    pcm, _, audio_duration, cache_hit = await synthesize_pcm(
+                        segment,
+                        utterance.speaker,
+                        utterance.language,
+                        utterance.instruct,
+                        utterance.priority,
+                        solo=True,
+                    )
+                total_audio += audio_duration
+                all_hits = all_hits and cache_hit
+                await self._send_audio(utterance.id, utterance.converter.push(crossfader.push(pcm)))
+            await self._send_audio(
+                utterance.id, utterance.converter.push(crossfader.flush(), last=True)
+            )
+            status = "cache_hit" if all_hits and utterance.tasks else "ok"
+            await self._send_json(
+                {
+                    "type": "done",
+                    "utterance_id": utterance.id,
+                    "audio_seconds": round(total_audio, 3),
+                }
+            )
+        except Exception as e:
+            status = "rejected" if isinstance(e, Overloaded) else "error"
+            logger.error(f"WebSocket synthesis failed for {utterance.id}: {e}")
+            try:
+                await self._send_json(
+                    {"type": "error", "utterance_id": utterance.id, "detail": str(e)}
+                )
+            except Exception:
+                pass  # the connection is gone too
+        finally:
+            in_flight -= 1
+            if self._utterances.get(utterance.id) is utterance:
+                del self._utterances[utterance.id]
+            for task in utterance.tasks:
+                task.cancel()
+                if task.done() and not task.cancelled():
+                    task.exception()  # mark retrieved so asyncio doesn't warn
+            _observe_request(
+                utterance.speaker,
+                status,
+                utterance.chars,
+                time.time() - utterance.started,
+                total_audio,
+            )
+
+    async def _send_audio(self, utterance_id: str, pcm: bytes):
+        if pcm:
+            async with self._send_lock:
+                await self._ws.send_bytes(_audio_message(utterance_id, pcm))
+
+    async def _send_json(self, message: dict):
+        async with self._send_lock:
+            await self._ws.send_json(message)
+
+
+@app.websocket("/ws")
+async def synthesize_ws(websocket: WebSocket):
+    """Persistent synthesis session; see the protocol notes above."""
+    await websocket.accept()
+    if not model_ready:
+        await websocket.close(code=1013, reason="Model not loaded")
+        return
+    await SpeechSession(websocket).run()
+
 
 # ---------------------------------------------------------------------------
 # Entry point
@@ -171,7 +2186,7 @@ if __name__ == "__main__":
     print()
     print("Qwen3-TTS Server")
     print(f"  Model:  {MODEL_NAME}")
-    print(f"  Device: {DEVICE}")
+    print(f"  Device: {DEVICE} (profile={PROFILE})")
     print(f"  URL:    http://localhost:8100")
     print()
 
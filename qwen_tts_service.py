@@ -7,11 +7,35 @@ Usage in a pipecat pipeline:
         language="English",
     )
 
-The service sends text to the Qwen3-TTS server's /synthesize endpoint
-and streams back raw PCM audio frames compatible with pipecat's pipeline.
+Pass base_urls=[...] instead to spread load over several server replicas.
+Each replica is probed via /health, requests go to the healthy replica with
+the fewest outstanding requests, and a request that fails before any audio
+arrives is retried on another replica. With hedge=True, a request whose
+first audio is slower than the recent p95 is duplicated on a second replica
+and whichever answers first is used.
+
+The service sends text to the Qwen3-TTS server's /synthesize/stream
+endpoint (or /synthesize with streaming=False) and streams back raw PCM
+audio frames compatible with pipecat's pipeline. Audio is requested at the
+pipeline's output sample rate (unless sample_rate is given), so the server
+resamples it once instead of the transport resampling every frame.
+
+With websocket=True a single connection to the server's /ws endpoint is kept
+for the whole session instead. Text is pushed as it arrives and the server
+starts synthesizing each sentence as soon as it is complete; combine with
+aggregate_sentences=False to hand it LLM tokens directly.
+
+In HTTP mode, lookahead=N requests up to N upcoming sentences in the
+background while the current one plays, so the server isn't idle between
+sentences.
 """
 
-from typing import AsyncGenerator, Optional
+import asyncio
+import json
+import time
+import uuid
+from collections import deque
+from typing import AsyncGenerator, Optional, Sequence
 
 import aiohttp
 from loguru import logger
@@ -21,55 +45,307 @@ from pipecat.frames.frames import (
     EndFrame,
     ErrorFrame,
     Frame,
+    InterruptionFrame,
+    LLMFullResponseEndFrame,
+    MetricsFrame,
     StartFrame,
     TTSAudioRawFrame,
     TTSStartedFrame,
     TTSStoppedFrame,
 )
+from pipecat.metrics.metrics import MetricsData
+from pipecat.processors.frame_processor import FrameDirection
 from pipecat.services.tts_service import TTSService
 
 
+class _PCMFramer:
+    """Cuts a stream of 16-bit PCM into fixed-size frames through a ring buffer.
+
+    Network chunks are copied into a reusable ``bytearray`` once and every
+    frame is copied out once through a ``memoryview``, instead of growing and
+    re-slicing a ``bytes`` buffer. The first frame is released as soon as any
+    whole samples are available rather than waiting for a full frame.
+    """
+
+    def __init__(self, frame_bytes: int):
+        self._frame_bytes = frame_bytes
+        self._buffer = bytearray(max(4 * frame_bytes, 4096))
+        self._view = memoryview(self._buffer)
+        self._start = 0
+        self._size = 0
+        self._first = True
+
+    def write(self, data: bytes) -> list[bytes]:
+        """Add a chunk and return the frames it completes."""
+        self._reserve(len(data))
+        capacity = len(self._buffer)
+        end = (self._start + self._size) % capacity
+        head = min(len(data), capacity - end)
+        src = memoryview(data)
+        self._view[end : end + head] = src[:head]
+        self._view[: len(data) - head] = src[head:]
+        self._size += len(data)
+
+        frames = []
+        if self._first and 2 <= self._size < self._frame_bytes:
+            frames.append(self._read(self._size & ~1))
+        while self._size >= self._frame_bytes:
+            frames.append(self._read(self._frame_bytes))
+        if frames:
+            self._first = False
+        return frames
+
+    def flush(self) -> Optional[bytes]:
+        """Return the last partial frame (dropping a stray odd byte), if any."""
+        size = self._size & ~1
+        frame = self._read(size) if size else None
+        self._start = self._size = 0
+        return frame
+
+    def _read(self, size: int) -> bytes:
+        capacity = len(self._buffer)
+        end = self._start + size
+        if end <= capacity:
+            frame = bytes(self._view[self._start : end])
+        else:
+            frame = bytes(self._view[self._start :]) + bytes(self._view[: end - capacity])
+        self._start = end % capacity
+        self._size -= size
+        return frame
+
+    def _reserve(self, size: int):
+        if self._size + size <= len(self._buffer):
+            return
+        pending = self._size
+        buffer = bytearray(max(2 * len(self._buffer), pending + size))
+        buffer[:pending] = self._read(pending)
+        self._buffer, self._view = buffer, memoryview(buffer)
+        self._start, self._size = 0, pending
+
+
+class _Pacer:
+    """Holds frames back so output runs at most ``lead_s`` ahead of realtime."""
+
+    def __init__(self, lead_s: float):
+        self._lead = lead_s
+        self._start = 0.0
+        self._sent = 0.0
+
+    def reset(self):
+        self._start = self._sent = 0.0
+
+    async def wait(self, duration_s: float):
+        now = time.monotonic()
+        if now >= self._start + self._sent:
+            # Everything sent so far has played out; restart the clock
+            self._start, self._sent = now, 0.0
+        ahead = self._start + self._sent - now
+        if ahead > self._lead:
+            await asyncio.sleep(ahead - self._lead)
+        self._sent += duration_s
+
+
+class _Endpoint:
+    """One Qwen3-TTS server replica with its own keep-alive connection pool."""
+
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.outstanding = 0
+        self.healthy = True
+
+    def open(self, pool_size: int):
+        if not self.session or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=pool_size, keepalive_timeout=60)
+            self.session = aiohttp.ClientSession(connector=connector)
+
+    async def close(self):
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    def mark_down(self, reason: str):
+        if self.healthy:
+            logger.warning(f"QwenTTS replica {self.url} marked down: {reason}")
+        self.healthy = False
+
+
+# First-audio latencies used for the hedge deadline, and how many are needed
+# before the percentile replaces hedge_delay_ms
+HEDGE_WINDOW = 200
+HEDGE_MIN_SAMPLES = 20
+
+
+class _Prefetch:
+    """One sentence being synthesized ahead of playback, and its buffered frames."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.frames: asyncio.Queue = asyncio.Queue()  # None marks the end
+        self.task: Optional[asyncio.Task] = None
+
+
+class _ReplicaError(Exception):
+    """Non-200 response from a replica."""
+
+    def __init__(self, status: int, detail: str):
+        super().__init__(f"{status} {detail}")
+        self.status = status
+
+
+class _SynthesisFailed(Exception):
+    """No replica could start the synthesis."""
+
+
+class _Stream:
+    """An open synthesis response and the first audio bytes read from it."""
+
+    def __init__(self, endpoint: _Endpoint, request_id: str, response, first: bytes):
+        self.endpoint = endpoint
+        self.request_id = request_id
+        self.response: aiohttp.ClientResponse = response
+        self.first = first
+
+
+class HedgeMetricsData(MetricsData):
+    """Hedged request counters, pushed after every request when hedging is on.
+
+    Parameters:
+        requests: HTTP synthesis requests made so far.
+        hedged: How many of them sent a duplicate to a second replica.
+        hedge_wins: How many hedges produced audio before the original.
+        deadline: Current hedge deadline in seconds.
+    """
+
+    requests: int
+    hedged: int
+    hedge_wins: int
+    deadline: float
+
+
 class QwenTTSService(TTSService):
     """HTTP-based pipecat TTS service backed by a Qwen3-TTS server.
 
-    The server must expose POST /synthesize returning raw 16-bit PCM.
+    The server must expose POST /synthesize returning raw 16-bit PCM. With
+    streaming enabled (the default) POST /synthesize/stream is used instead,
+    and audio frames are emitted as soon as bytes arrive. With websocket
+    enabled, every LLM response becomes one utterance on a persistent /ws
+    connection, ended by ``flush_audio`` or cancelled on interruption.
+
+    Audio is re-cut into ``frame_ms`` frames (20 ms or more); the first frame
+    of an utterance goes out as soon as any audio arrives. With
+    ``pace_realtime`` frames are released no more than ``max_lead_ms`` ahead
+    of realtime, so the output queue holds a small, bounded amount of audio
+    and an interruption has little to flush.
+
+    ``base_urls`` lists several server replicas. They are probed every
+    ``health_check_interval`` seconds, and each request (or websocket
+    session) goes to the healthy replica with the fewest requests in flight.
+    Connection errors and 5xx responses before any audio was produced are
+    retried on the next replica.
+
+    ``hedge`` enables hedged requests: if no audio has arrived by the
+    ``hedge_percentile`` of recent first-audio latencies (``hedge_delay_ms``
+    until enough have been seen), the request is sent to a second replica as
+    well, the first to produce audio is used and the other is cancelled.
+
+    ``lookahead`` (HTTP mode only) makes ``run_tts`` return as soon as the
+    request is sent: up to ``lookahead`` sentences after the one playing are
+    synthesized at "prefetch" priority and buffered, and a playback task
+    pushes their frames in order. An interruption discards them all.
     """
 
     def __init__(
         self,
         *,
         base_url: str = "http://localhost:8100",
+        base_urls: Optional[Sequence[str]] = None,
         voice: str = "Ryan",
         language: str = "English",
         instruct: Optional[str] = None,
-        sample_rate: int = 24000,
+        sample_rate: Optional[int] = None,
+        streaming: bool = True,
+        websocket: bool = False,
+        frame_ms: float = 40,
+        pace_realtime: bool = False,
+        max_lead_ms: float = 200,
+        health_check_interval: float = 5.0,
+        pool_size: int = 8,
+        hedge: bool = False,
+        hedge_percentile: float = 95,
+        hedge_delay_ms: float = 500,
+        lookahead: int = 0,
         **kwargs,
     ):
+        if frame_ms < 20:
+            raise ValueError(f"frame_ms must be at least 20, got {frame_ms}")
         super().__init__(sample_rate=sample_rate, **kwargs)
-        self._base_url = base_url.rstrip("/")
+        self._endpoints = [_Endpoint(url) for url in (base_urls or [base_url])]
+        self._health_check_interval = health_check_interval
+        self._pool_size = pool_size
+        self._health_task = None
+        self._frame_ms = frame_ms
+        self._pacer = _Pacer(max_lead_ms / 1000) if pace_realtime else None
+        self._streaming = streaming
+        self._websocket = websocket
         self._language = language
         self._instruct = instruct
-        self._session: Optional[aiohttp.ClientSession] = None
+        # HTTP requests in progress (more than one while hedging), by request id
+        self._requests: dict[str, _Endpoint] = {}
+
+        # Hedging state; first-audio latencies are kept even when it's off
+        self._hedge = hedge
+        self._hedge_percentile = hedge_percentile
+        self._hedge_delay = hedge_delay_ms / 1000
+        self._ttfb_samples: deque[float] = deque(maxlen=HEDGE_WINDOW)
+        self._request_count = 0
+        self._hedged_count = 0
+        self._hedge_wins = 0
         self.set_voice(voice)
 
+        # Look-ahead state; _prefetches[0] is the sentence playing
+        self._lookahead = 0 if websocket else lookahead
+        self._prefetches: list[_Prefetch] = []
+        self._prefetch_changed = asyncio.Event()
+        self._playback_task = None
+
+        # WebSocket mode state
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._ws_endpoint: Optional[_Endpoint] = None
+        self._receive_task = None
+        self._utterance_id: Optional[str] = None  # utterance still taking text
+        # Utterances sent whose audio hasn't finished, with their framers
+        self._live_utterances: dict[str, _PCMFramer] = {}
+        self._awaiting_first_audio: set[str] = set()
+
     def can_generate_metrics(self) -> bool:
         return True
 
     async def start(self, frame: StartFrame):
         await super().start(frame)
-        self._session = aiohttp.ClientSession()
+        self._open_sessions()
+        if len(self._endpoints) > 1:
+            await self._check_health()
+            self._health_task = self.create_task(self._health_loop())
+        if self._websocket:
+            await self._connect_websocket()
+        if self._lookahead:
+            self._playback_task = self.create_task(self._playback_loop())
 
     async def stop(self, frame: EndFrame):
         await super().stop(frame)
-        if self._session:
-            await self._session.close()
-            self._session = None
+        # Let sentences already handed to the playback task finish, unless it
+        # has died; whatever is left is cancelled below
+        while self._prefetches and self._playback_task and not self._playback_task.done():
+            self._prefetch_changed.clear()
+            await self._prefetch_changed.wait()
+        await self._stop_prefetching()
+        await self._close_sessions()
 
     async def cancel(self, frame: CancelFrame):
         await super().cancel(frame)
-        if self._session:
-            await self._session.close()
-            self._session = None
+        await self._stop_prefetching()
+        await self._close_sessions()
 
     async def set_language(self, language: str):
         self._language = language
@@ -77,76 +353,525 @@ class QwenTTSService(TTSService):
     async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
         logger.debug(f"QwenTTS: synthesizing [{text[:80]}...]")
 
-        if not self._session:
-            self._session = aiohttp.ClientSession()
+        self._open_sessions()
+
+        if self._websocket:
+            async for frame in self._send_ws_text(text):
+                yield frame
+            return
+
+        if self._lookahead:
+            await self._prefetch(text)
+            return
+
+        await self.start_ttfb_metrics()
+        async for frame in self._http_frames(text):
+            if isinstance(frame, TTSAudioRawFrame):
+                await self.stop_ttfb_metrics()
+            yield await self._pace(frame)
+
+    async def _http_frames(
+        self, text: str, priority: str = "interactive"
+    ) -> AsyncGenerator[Frame, None]:
+        """Synthesize ``text`` over HTTP, yielding unpaced frames as audio arrives."""
+        payload = {
+            "text": text,
+            "speaker": self._voice_id,
+            "language": self._language,
+            # Have the server resample once instead of every frame here
+            "sample_rate": self.sample_rate,
+            "priority": priority,
+        }
+        if self._instruct:
+            payload["instruct"] = self._instruct
+        path = "/synthesize/stream" if self._streaming else "/synthesize"
+
+        self._request_count += 1
+        started = False
+        tried: list[_Endpoint] = []
+        while True:
+            try:
+                stream = await self._connect(payload, path, tried)
+            except _SynthesisFailed as e:
+                yield TTSStoppedFrame()
+                yield ErrorFrame(error=str(e))
+                return
 
+            audio_sent = False
+            try:
+                # Read sample rate from response headers
+                server_sr = int(stream.response.headers.get("X-Sample-Rate", self.sample_rate))
+
+                if not started:
+                    await self.start_tts_usage_metrics(text)
+                    yield TTSStartedFrame()
+                    started = True
+
+                async for frame in self._response_frames(stream, server_sr):
+                    audio_sent = True
+                    yield frame
+
+                yield TTSStoppedFrame()
+                return
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.error(f"QwenTTS connection error from {stream.endpoint.url}: {e}")
+                stream.endpoint.mark_down(repr(e))
+                if audio_sent:
+                    # Part of the utterance was already played; don't repeat it
+                    yield TTSStoppedFrame()
+                    yield ErrorFrame(error=f"Lost TTS server {stream.endpoint.url}: {e}")
+                    return
+            except Exception as e:
+                logger.error(f"QwenTTS error: {e}")
+                yield TTSStoppedFrame()
+                yield ErrorFrame(error=f"TTS error: {e}")
+                return
+            finally:
+                self._close_stream(stream)
+
+    async def _connect(self, payload: dict, path: str, tried: list[_Endpoint]) -> _Stream:
+        """Open a synthesis stream and wait for its first audio bytes.
+
+        Replicas that fail are retried on the next one. With hedging, once the
+        hedge deadline passes without audio a duplicate goes to another
+        replica; the first stream with audio wins and the rest are cancelled.
+        """
+        attempts: dict[asyncio.Task, tuple[_Endpoint, str]] = {}
+        hedges: set[asyncio.Task] = set()
+        started = time.monotonic()
+        hedge_at = started + self._hedge_deadline() if self._hedge else None
+        last_error = "No TTS server available"
+        winner: Optional[_Stream] = None
+
+        def launch() -> Optional[asyncio.Task]:
+            endpoint = self._pick_endpoint(exclude=tried)
+            if endpoint is None:
+                return None
+            tried.append(endpoint)
+            # Lets an interruption stop the synthesis on the server
+            request_id = uuid.uuid4().hex
+            task = asyncio.create_task(self._open_stream(endpoint, request_id, payload, path))
+            attempts[task] = (endpoint, request_id)
+            return task
+
+        try:
+            while winner is None:
+                if not attempts and not launch():
+                    raise _SynthesisFailed(last_error)
+                timeout = max(0.0, hedge_at - time.monotonic()) if hedge_at else None
+                done, _ = await asyncio.wait(
+                    attempts, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    hedge_at = None
+                    hedge = launch()
+                    if hedge:
+                        hedges.add(hedge)
+                        self._hedged_count += 1
+                        logger.debug(f"QwenTTS: hedging request on {attempts[hedge][0].url}")
+                    continue
+                for task in done:
+                    endpoint, _ = attempts.pop(task)
+                    try:
+                        stream = task.result()
+                    except _ReplicaError as e:
+                        logger.error(f"QwenTTS server error from {endpoint.url}: {e}")
+                        last_error = f"TTS server error: {e.status}"
+                        if e.status < 500:
+                            raise _SynthesisFailed(last_error)
+                        # Overloaded, still loading or broken: try another replica
+                        endpoint.mark_down(f"HTTP {e.status}")
+                        continue
+                    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                        logger.error(f"QwenTTS connection error from {endpoint.url}: {e}")
+                        endpoint.mark_down(repr(e))
+                        last_error = f"Cannot reach TTS server at {endpoint.url}: {e}"
+                        continue
+                    if winner is None:
+                        winner = stream
+                        if task in hedges:
+                            self._hedge_wins += 1
+                    else:
+                        self._close_stream(stream, cancel=True)
+        finally:
+            for task, (endpoint, request_id) in attempts.items():
+                if task.done() and not task.cancelled() and not task.exception():
+                    self._close_stream(task.result(), cancel=True)
+                else:
+                    task.cancel()
+                    self.create_task(self._cancel_request(endpoint, request_id))
+            if self._hedge:
+                await self._push_hedge_metrics()
+
+        # What the caller waited, hedge delay and retries included
+        self._ttfb_samples.append(time.monotonic() - started)
+        return winner
+
+    async def _open_stream(
+        self, endpoint: _Endpoint, request_id: str, payload: dict, path: str
+    ) -> _Stream:
+        """POST to one replica and read up to the first audio bytes."""
+        endpoint.outstanding += 1
+        self._requests[request_id] = endpoint
+        response = None
+        try:
+            response = await endpoint.session.post(
+                f"{endpoint.url}{path}",
+                json={**payload, "request_id": request_id},
+                timeout=aiohttp.ClientTimeout(total=60, sock_connect=5),
+            )
+            if response.status != 200:
+                raise _ReplicaError(response.status, await response.text())
+            endpoint.healthy = True
+            first = await response.content.readany()
+            return _Stream(endpoint, request_id, response, first)
+        except BaseException:
+            if response is not None:
+                response.close()
+            endpoint.outstanding -= 1
+            self._requests.pop(request_id, None)
+            raise
+
+    def _close_stream(self, stream: _Stream, cancel: bool = False):
+        """Release a stream's connection; ``cancel`` also stops it on the server."""
+        if cancel:
+            stream.response.close()
+            self.create_task(self._cancel_request(stream.endpoint, stream.request_id))
+        else:
+            # Back to the keep-alive pool if the body was read to the end
+            stream.response.release()
+        stream.endpoint.outstanding -= 1
+        self._requests.pop(stream.request_id, None)
+
+    def _hedge_deadline(self) -> float:
+        samples = self._ttfb_samples
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return self._hedge_delay
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * self._hedge_percentile / 100))]
+
+    @property
+    def hedge_stats(self) -> dict:
+        """Hedging counters, for tuning hedge_percentile."""
+        requests = self._request_count
+        return {
+            "requests": requests,
+            "hedged": self._hedged_count,
+            "hedge_wins": self._hedge_wins,
+            "hedge_rate": self._hedged_count / requests if requests else 0.0,
+            "win_rate": self._hedge_wins / self._hedged_count if self._hedged_count else 0.0,
+            "deadline": self._hedge_deadline(),
+        }
+
+    async def _push_hedge_metrics(self):
+        if not self.metrics_enabled:
+            return
+        data = HedgeMetricsData(
+            processor=self.name,
+            model=self.model_name or None,
+            requests=self._request_count,
+            hedged=self._hedged_count,
+            hedge_wins=self._hedge_wins,
+            deadline=self._hedge_deadline(),
+        )
+        await self.push_frame(MetricsFrame(data=[data]))
+
+    async def _cancel_request(self, endpoint: _Endpoint, request_id: str):
+        """Tell the server to stop synthesizing a request we no longer need."""
         try:
+            async with endpoint.session.post(
+                f"{endpoint.url}/cancel/{request_id}",
+                timeout=aiohttp.ClientTimeout(total=5),
+            ):
+                pass
+        except Exception as e:
+            logger.debug(f"QwenTTS cancel failed: {e}")
+
+    async def _response_frames(
+        self, stream: _Stream, sample_rate: int
+    ) -> AsyncGenerator[Frame, None]:
+        """Re-cut the response body into frames as bytes arrive."""
+        framer = _PCMFramer(self._frame_bytes(sample_rate))
+        for audio in framer.write(stream.first):
+            yield self._audio_frame(audio, sample_rate)
+        async for data in stream.response.content.iter_any():
+            for audio in framer.write(data):
+                yield self._audio_frame(audio, sample_rate)
+        audio = framer.flush()
+        if audio:
+            yield self._audio_frame(audio, sample_rate)
+
+    def _frame_bytes(self, sample_rate: int) -> int:
+        return int(sample_rate * self._frame_ms / 1000) * 2
+
+    def _audio_frame(self, audio: bytes, sample_rate: int) -> TTSAudioRawFrame:
+        return TTSAudioRawFrame(audio=audio, sample_rate=sample_rate, num_channels=1)
+
+    async def _paced_frame(self, audio: bytes, sample_rate: int) -> TTSAudioRawFrame:
+        return await self._pace(self._audio_frame(audio, sample_rate))
+
+    async def _pace(self, frame: Frame) -> Frame:
+        if self._pacer and isinstance(frame, TTSAudioRawFrame):
+            await self._pacer.wait(len(frame.audio) / 2 / frame.sample_rate)
+        return frame
+
+    # -----------------------------------------------------------------------
+    # Look-ahead
+    # -----------------------------------------------------------------------
+
+    async def _prefetch(self, text: str):
+        """Start synthesizing ``text`` now, once fewer than lookahead are queued."""
+        while len(self._prefetches) > self._lookahead:
+            self._prefetch_changed.clear()
+            await self._prefetch_changed.wait()
+        if not self._prefetches:
+            # Nothing playing, so this sentence's latency is what the user hears
             await self.start_ttfb_metrics()
+            priority = "interactive"
+        else:
+            priority = "prefetch"
+        item = _Prefetch(text)
+        item.task = self.create_task(self._fetch(item, priority))
+        self._prefetches.append(item)
+        self._prefetch_changed.set()
 
-            payload = {
-                "text": text,
-                "speaker": self._voice_id,
-                "language": self._language,
-            }
-            if self._instruct:
-                payload["instruct"] = self._instruct
-
-            async with self._session.post(
-                f"{self._base_url}/synthesize",
-                json=payload,
-                timeout=aiohttp.ClientTimeout(total=60),
+    async def _fetch(self, item: _Prefetch, priority: str):
+        try:
+            async for frame in self._http_frames(item.text, priority):
+                await item.frames.put(frame)
+        finally:
+            item.frames.put_nowait(None)
+
+    async def _playback_loop(self):
+        """Push each prefetched sentence's frames in order, paced like run_tts."""
+        try:
+            while True:
+                if not self._prefetches:
+                    self._prefetch_changed.clear()
+                    await self._prefetch_changed.wait()
+                    continue
+                item = self._prefetches[0]
+                while (frame := await item.frames.get()) is not None:
+                    if isinstance(frame, TTSAudioRawFrame):
+                        await self.stop_ttfb_metrics()
+                    await self.push_frame(await self._pace(frame))
+                self._prefetches.remove(item)
+                self._prefetch_changed.set()
+        finally:
+            # Wake stop() if playback ends early, so it doesn't wait forever
+            self._prefetch_changed.set()
+
+    async def _discard_prefetches(self):
+        prefetches, self._prefetches = self._prefetches, []
+        for item in prefetches:
+            if item.task:
+                await self.cancel_task(item.task)
+        self._prefetch_changed.set()
+
+    async def _stop_prefetching(self):
+        if self._playback_task:
+            await self.cancel_task(self._playback_task)
+            self._playback_task = None
+        await self._discard_prefetches()
+
+    # -----------------------------------------------------------------------
+    # Replicas
+    # -----------------------------------------------------------------------
+
+    def _open_sessions(self):
+        for endpoint in self._endpoints:
+            endpoint.open(self._pool_size)
+
+    async def _close_sessions(self):
+        if self._health_task:
+            await self.cancel_task(self._health_task)
+            self._health_task = None
+        await self._disconnect_websocket()
+        for endpoint in self._endpoints:
+            await endpoint.close()
+
+    def _pick_endpoint(self, exclude: Sequence[_Endpoint] = ()) -> Optional[_Endpoint]:
+        """Least-outstanding healthy replica; unhealthy ones only as a last resort."""
+        candidates = [e for e in self._endpoints if e not in exclude]
+        if not candidates:
+            return None
+        # min() keeps list order on ties, so an idle service favours the first URL
+        return min(candidates, key=lambda e: (not e.healthy, e.outstanding))
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(self._health_check_interval)
+            await self._check_health()
+
+    async def _check_health(self):
+        await asyncio.gather(*(self._probe(endpoint) for endpoint in self._endpoints))
+
+    async def _probe(self, endpoint: _Endpoint):
+        try:
+            async with endpoint.session.get(
+                f"{endpoint.url}/health", timeout=aiohttp.ClientTimeout(total=2)
             ) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    logger.error(
-                        f"QwenTTS server error: {response.status} {error_text}"
-                    )
-                    yield ErrorFrame(error=f"TTS server error: {response.status}")
-                    return
+                healthy = response.status == 200
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            healthy = False
+        if healthy and not endpoint.healthy:
+            logger.info(f"QwenTTS replica {endpoint.url} is healthy again")
+            endpoint.healthy = True
+        elif not healthy:
+            endpoint.mark_down("health check failed")
 
-                # Read sample rate from response headers
-                server_sr = int(response.headers.get("X-Sample-Rate", self.sample_rate))
+    # -----------------------------------------------------------------------
+    # WebSocket mode
+    # -----------------------------------------------------------------------
 
-                await self.start_tts_usage_metrics(text)
-                yield TTSStartedFrame()
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if self._websocket and isinstance(frame, LLMFullResponseEndFrame):
+            await self.flush_audio()
 
-                await self.stop_ttfb_metrics()
+    async def flush_audio(self):
+        """End the current utterance; the server synthesizes what's left."""
+        if not self._websocket or not self._utterance_id:
+            return
+        utterance_id, self._utterance_id = self._utterance_id, None
+        await self._send_ws({"type": "flush", "utterance_id": utterance_id})
 
-                # Stream PCM data in chunks
-                # Each chunk: 0.5s of 16-bit mono audio
-                chunk_size = server_sr * 2 * 1  # 1 second of 16-bit mono
-                chunk_size = chunk_size // 2  # 0.5s chunks
-
-                buffer = b""
-                async for data in response.content.iter_any():
-                    buffer += data
-                    while len(buffer) >= chunk_size:
-                        chunk = buffer[:chunk_size]
-                        buffer = buffer[chunk_size:]
-                        yield TTSAudioRawFrame(
-                            audio=chunk,
-                            sample_rate=server_sr,
-                            num_channels=1,
-                        )
-
-                # Flush remaining buffer (ensure even byte count for int16)
-                if buffer:
-                    if len(buffer) % 2 != 0:
-                        buffer = buffer[:-1]
-                    if buffer:
-                        yield TTSAudioRawFrame(
-                            audio=buffer,
-                            sample_rate=server_sr,
-                            num_channels=1,
-                        )
-
-            yield TTSStoppedFrame()
-
-        except aiohttp.ClientError as e:
-            logger.error(f"QwenTTS connection error: {e}")
-            yield TTSStoppedFrame()
-            yield ErrorFrame(error=f"Cannot reach TTS server at {self._base_url}: {e}")
-        except Exception as e:
-            logger.error(f"QwenTTS error: {e}")
-            yield TTSStoppedFrame()
-            yield ErrorFrame(error=f"TTS error: {e}")
+    async def _handle_interruption(self, frame: InterruptionFrame, direction: FrameDirection):
+        await super()._handle_interruption(frame, direction)
+        if self._pacer:
+            self._pacer.reset()
+        if not self._websocket:
+            # Don't hold up the interruption on the round trip
+            for request_id, endpoint in self._requests.items():
+                self.create_task(self._cancel_request(endpoint, request_id))
+            self._requests.clear()
+            if self._lookahead:
+                # Restart playback so a frame it was about to push is dropped too
+                await self._stop_prefetching()
+                self._playback_task = self.create_task(self._playback_loop())
+            return
+        # Audio still arriving for these is dropped by the receive loop
+        cancelled = list(self._live_utterances)
+        self._live_utterances.clear()
+        self._awaiting_first_audio.clear()
+        self._utterance_id = None
+        for utterance_id in cancelled:
+            await self._send_ws({"type": "cancel", "utterance_id": utterance_id})
+
+    async def _send_ws_text(self, text: str) -> AsyncGenerator[Frame, None]:
+        if not self._ws or self._ws.closed:
+            await self._connect_websocket()
+        if not self._ws:
+            urls = ", ".join(e.url for e in self._endpoints)
+            yield ErrorFrame(error=f"Cannot reach TTS server at {urls}")
+            return
+
+        if not self._utterance_id:
+            self._utterance_id = uuid.uuid4().hex
+            self._live_utterances[self._utterance_id] = _PCMFramer(
+                self._frame_bytes(self.sample_rate)
+            )
+            self._awaiting_first_audio.add(self._utterance_id)
+            await self.start_ttfb_metrics()
+            yield TTSStartedFrame()
+
+        await self.start_tts_usage_metrics(text)
+        message = {
+            "type": "text",
+            "utterance_id": self._utterance_id,
+            "text": text,
+            "speaker": self._voice_id,
+            "language": self._language,
+            "sample_rate": self.sample_rate,
+        }
+        if self._instruct:
+            message["instruct"] = self._instruct
+        await self._send_ws(message)
+
+    async def _send_ws(self, message: dict):
+        if not self._ws or self._ws.closed:
+            return
+        try:
+            await self._ws.send_str(json.dumps(message))
+        except (aiohttp.ClientError, ConnectionResetError) as e:
+            logger.error(f"QwenTTS websocket send failed: {e}")
+
+    async def _connect_websocket(self):
+        tried: list[_Endpoint] = []
+        while endpoint := self._pick_endpoint(exclude=tried):
+            tried.append(endpoint)
+            ws_url = endpoint.url.replace("http://", "ws://").replace("https://", "wss://")
+            try:
+                self._ws = await endpoint.session.ws_connect(f"{ws_url}/ws", heartbeat=30)
+                await self._ws.receive_json(timeout=10)  # "ready"
+            except Exception as e:
+                logger.error(f"QwenTTS websocket connection to {endpoint.url} failed: {e}")
+                endpoint.mark_down(repr(e))
+                if self._ws:
+                    await self._ws.close()
+                self._ws = None
+                continue
+            # The session counts as one outstanding request on its replica
+            endpoint.outstanding += 1
+            self._ws_endpoint = endpoint
+            self._receive_task = self.create_task(self._receive_messages())
+            return
+
+    async def _disconnect_websocket(self):
+        if self._receive_task:
+            await self.cancel_task(self._receive_task)
+            self._receive_task = None
+        if self._ws:
+            await self._ws.close()
+            self._ws = None
+        self._release_ws_endpoint()
+        self._utterance_id = None
+        self._live_utterances.clear()
+        self._awaiting_first_audio.clear()
+
+    def _release_ws_endpoint(self):
+        if self._ws_endpoint:
+            self._ws_endpoint.outstanding -= 1
+            self._ws_endpoint = None
+
+    async def _receive_messages(self):
+        """Turn tagged audio and utterance events from the server into frames."""
+        async for msg in self._ws:
+            if msg.type == aiohttp.WSMsgType.BINARY:
+                data = msg.data
+                tag_len = data[0]
+                utterance_id = data[1 : 1 + tag_len].decode()
+                framer = self._live_utterances.get(utterance_id)
+                if framer is None:
+                    continue
+                if utterance_id in self._awaiting_first_audio:
+                    self._awaiting_first_audio.discard(utterance_id)
+                    await self.stop_ttfb_metrics()
+                for audio in framer.write(memoryview(data)[1 + tag_len :]):
+                    await self.push_frame(await self._paced_frame(audio, self.sample_rate))
+            elif msg.type == aiohttp.WSMsgType.TEXT:
+                event = json.loads(msg.data)
+                utterance_id = event.get("utterance_id")
+                if event["type"] == "error":
+                    logger.error(f"QwenTTS server error: {event.get('detail')}")
+                    await self.push_error(f"TTS error: {event.get('detail')}")
+                if event["type"] in ("done", "error") and utterance_id in self._live_utterances:
+                    audio = self._live_utterances.pop(utterance_id).flush()
+                    if audio:
+                        await self.push_frame(await self._paced_frame(audio, self.sample_rate))
+                    self._awaiting_first_audio.discard(utterance_id)
+                    if utterance_id == self._utterance_id:
+                        self._utterance_id = None
+                    await self.push_frame(TTSStoppedFrame())
+            else:
+                break
+
+        logger.warning("QwenTTS websocket closed by server")
+        if self._ws_endpoint:
+            self._ws_endpoint.mark_down("websocket closed")
+        self._release_ws_endpoint()
+        self._ws = None
+        self._utterance_id = None
+        self._live_utterances.clear()
+        self._awaiting_first_audio.clear()
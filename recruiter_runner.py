@@ -17,7 +17,7 @@ import uuid
 from contextlib import asynccontextmanager
 from http import HTTPMethod
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
 from dotenv import load_dotenv
 from loguru import logger
@@ -43,7 +43,6 @@ from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
-from pipecat.audio.vad.silero import SileroVADAnalyzer
 from pipecat.audio.vad.vad_analyzer import VADParams
 from pipecat.frames.frames import (
     Frame,
@@ -54,6 +53,7 @@ from pipecat.frames.frames import (
     TextFrame,
     TranscriptionFrame,
 )
+from pipecat.observers.base_observer import BaseObserver
 from pipecat.pipeline.pipeline import Pipeline
 from pipecat.pipeline.runner import PipelineRunner
 from pipecat.pipeline.task import PipelineParams, PipelineTask
@@ -65,7 +65,9 @@ from pipecat.processors.aggregators.llm_response_universal import (
 from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
 from pipecat.services.anthropic.llm import AnthropicLLMService
 from pipecat.services.deepgram.stt import DeepgramSTTService
-from pipecat.transports.base_transport import TransportParams
+from pipecat.services.llm_service import LLMService
+from pipecat.services.stt_service import STTService
+from pipecat.transports.base_transport import BaseTransport, TransportParams
 
 from pipecat.transports.smallwebrtc.connection import SmallWebRTCConnection
 from pipecat.transports.smallwebrtc.request_handler import (
@@ -76,6 +78,11 @@ from pipecat.transports.smallwebrtc.request_handler import (
 )
 from pipecat.transports.smallwebrtc.transport import SmallWebRTCTransport
 
+import warm_pool
+from context_window import ContextWindowProcessor
+from latency_trace import TurnLatencyObserver
+from llm_usage import PromptCacheObserver, cached_system, record_usage
+
 # ---------------------------------------------------------------------------
 # Paths
 # ---------------------------------------------------------------------------
@@ -120,19 +127,25 @@ def broadcast_sse(event: str, data: Any):
 # Anthropic async client (for side-channel LLM calls)
 # ---------------------------------------------------------------------------
 
-text_llm = anthropic.AsyncAnthropic(api_key=ANTHROPIC_API_KEY)
+# Shared with the pipeline LLM so side-channel calls reuse its warm connections
+text_llm = warm_pool.anthropic_client()
 
 
 async def async_llm_text_call(
     system_prompt: str, user_prompt: str, max_tokens: int = 1024
 ) -> str:
-    """Native async Anthropic text call for side-channel operations."""
+    """Native async Anthropic text call for side-channel operations.
+
+    The system prompt is the static part of every side-channel call, so it is
+    sent as a cacheable prefix.
+    """
     response = await text_llm.messages.create(
         model="claude-sonnet-4-5-20250929",
         max_tokens=max_tokens,
         messages=[{"role": "user", "content": user_prompt}],
-        system=system_prompt,
+        system=cached_system(system_prompt),
     )
+    record_usage(response.usage)
     return response.content[0].text
 
 
@@ -270,25 +283,31 @@ class HMTranscriptProcessor(FrameProcessor):
 # ---------------------------------------------------------------------------
 
 
-async def run_intake_bot(connection: SmallWebRTCConnection):
-    """Build and run the intake practice pipeline for one WebRTC session."""
-
-    transport = SmallWebRTCTransport(
-        webrtc_connection=connection,
-        params=TransportParams(
-            audio_in_enabled=True,
-            audio_out_enabled=False,  # No voice output -- HM responds as text only
-        ),
-    )
+def build_intake_task(
+    transport: BaseTransport,
+    *,
+    stt: Optional[STTService] = None,
+    llm: Optional[LLMService] = None,
+    observers: Optional[list[BaseObserver]] = None,
+    summary_client: Optional[anthropic.AsyncAnthropic] = None,
+) -> PipelineTask:
+    """Build the intake practice pipeline task on ``transport``.
 
-    stt = DeepgramSTTService(api_key=DEEPGRAM_API_KEY)
+    Services (and ``summary_client``, used for the context window's summaries)
+    default to Deepgram / Anthropic; replay_harness.py passes local stand-ins.
+    Expects session_state["hm_system_prompt"] to be set.
+    """
+    stt = stt or DeepgramSTTService(api_key=DEEPGRAM_API_KEY)
 
-    llm = AnthropicLLMService(
+    llm = llm or AnthropicLLMService(
         api_key=ANTHROPIC_API_KEY,
         model="claude-sonnet-4-5-20250929",
+        client=warm_pool.anthropic_client(),
         params=AnthropicLLMService.InputParams(
             temperature=0.7,
             max_tokens=600,
+            # Caches the HM system prompt and history up to the latest turn
+            enable_prompt_caching=True,
         ),
     )
 
@@ -303,16 +322,22 @@ async def run_intake_bot(connection: SmallWebRTCConnection):
     user_aggregator, assistant_aggregator = LLMContextAggregatorPair(
         context,
         user_params=LLMUserAggregatorParams(
-            vad_analyzer=SileroVADAnalyzer(params=VADParams(stop_secs=0.6)),
+            vad_analyzer=warm_pool.SharedSileroVADAnalyzer(params=VADParams(stop_secs=0.6)),
         ),
     )
 
+    # Intake calls run long; summarize older turns so latency stays flat
+    context_window = ContextWindowProcessor(
+        keep_turns=8, max_context_tokens=3000, client=summary_client
+    )
+
     pipeline = Pipeline(
         [
             transport.input(),
             stt,
             user_transcript,
             user_aggregator,
+            context_window,
             llm,
             hm_transcript,
             transport.output(),
@@ -323,6 +348,8 @@ async def run_intake_bot(connection: SmallWebRTCConnection):
     task = PipelineTask(
         pipeline,
         params=PipelineParams(enable_metrics=True, enable_usage_metrics=True),
+        observers=observers
+        or [PromptCacheObserver(), TurnLatencyObserver("recruiter", text_only=True)],
     )
 
     @transport.event_handler("on_client_connected")
@@ -347,6 +374,21 @@ async def run_intake_bot(connection: SmallWebRTCConnection):
         logger.info("Recruiter disconnected")
         await task.cancel()
 
+    return task
+
+
+async def run_intake_bot(connection: SmallWebRTCConnection):
+    """Build and run the intake practice pipeline for one WebRTC session."""
+
+    transport = SmallWebRTCTransport(
+        webrtc_connection=connection,
+        params=TransportParams(
+            audio_in_enabled=True,
+            audio_out_enabled=False,  # No voice output -- HM responds as text only
+        ),
+    )
+
+    task = build_intake_task(transport)
     runner = PipelineRunner(handle_sigint=False)
     await runner.run(task)
 
@@ -361,6 +403,7 @@ active_sessions: dict[str, dict] = {}
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    await asyncio.to_thread(warm_pool.preload)
     yield
     await small_webrtc_handler.close()
 
@@ -443,6 +486,8 @@ async def rtvi_start(request: Request):
 @app.post("/api/offer")
 async def offer(request: SmallWebRTCRequest, background_tasks: BackgroundTasks):
     """Handle WebRTC SDP offer."""
+    # Open the connections the session will need while the SDP exchange runs
+    warm_pool.start_warm_up()
 
     async def on_connection(connection: SmallWebRTCConnection):
         background_tasks.add_task(run_intake_bot, connection)
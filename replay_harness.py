@@ -0,0 +1,574 @@
+"""Offline replay harness -- benchmark the real pipelines from recorded audio.
+
+Runs the pipeline built by bot.build_bot_task, arguing_runner.build_debate_task
+or recruiter_runner.build_intake_task on a file-backed transport, with local
+stand-ins for STT, LLM, TTS and the context window's summary calls, whose
+latency and token rates are configurable.
+Everything else (VAD, aggregators, context window, debate manager, transcript
+processors, output pacing) is the production code, so pipeline regressions are
+measurable on a laptop with no network, browser or API keys.
+
+    python replay_harness.py bot --wav hello.wav question.wav
+    python replay_harness.py intake --wav intro.wav --llm-ttft-ms 600
+    python replay_harness.py debate --turns 6 --speed 4
+
+Each WAV is one user utterance (16-bit PCM, any rate / channel count). Its
+transcript is read from a sidecar .txt next to it if present. After each
+utterance the harness feeds silence until the bot has answered, then moves on.
+--speed > 1 replays input and output audio faster than real time; the stand-in
+service latencies are not scaled.
+
+Reports per-turn latency by stage (TurnLatencyObserver), frames pushed per
+second and process CPU time; --json writes the report to a file.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import wave
+from pathlib import Path
+from types import SimpleNamespace
+from typing import AsyncGenerator, Optional
+
+import numpy as np
+from loguru import logger
+
+from pipecat.audio.utils import create_file_resampler
+from pipecat.frames.frames import (
+    BotStoppedSpeakingFrame,
+    CancelFrame,
+    EndFrame,
+    Frame,
+    InputAudioRawFrame,
+    LLMContextFrame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    LLMTextFrame,
+    OutputAudioRawFrame,
+    StartFrame,
+    TranscriptionFrame,
+    TTSAudioRawFrame,
+    TTSStartedFrame,
+    TTSStoppedFrame,
+)
+from pipecat.observers.base_observer import BaseObserver, FramePushed
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.services.llm_service import LLMService
+from pipecat.services.stt_service import SegmentedSTTService
+from pipecat.services.tts_service import TTSService
+from pipecat.transports.base_input import BaseInputTransport
+from pipecat.transports.base_output import BaseOutputTransport
+from pipecat.transports.base_transport import BaseTransport, TransportParams
+from pipecat.utils.time import time_now_iso8601
+
+from latency_trace import TurnLatencyObserver
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+# Input audio is fed in chunks of this size, like a WebRTC track
+INPUT_CHUNK_MS = 20
+
+# Silence fed before the first utterance and after the last response
+LEAD_IN_SECS = 0.5
+
+# "Silence" is low-level noise like a real mic. On pure digital zeros Silero's
+# state drifts between its (wall-clock) resets when replaying faster than real
+# time, and it then misses the next utterance.
+COMFORT_NOISE_RMS = 30
+
+# Words the stand-in LLM cycles through; sentence breaks let TTS aggregate
+REPLAY_RESPONSE = (
+    "That is a fair point and worth thinking through carefully. "
+    "Here is how I would approach it in practice. "
+    "Start small, measure everything, and iterate quickly. "
+)
+
+# ---------------------------------------------------------------------------
+# Stand-in services
+# ---------------------------------------------------------------------------
+
+
+class ReplaySTTService(SegmentedSTTService):
+    """Returns the next scripted transcript ``latency_ms`` after each end of speech."""
+
+    def __init__(self, *, transcripts: list[str], latency_ms: float = 150, **kwargs):
+        super().__init__(**kwargs)
+        self._transcripts = list(transcripts)
+        self._latency = latency_ms / 1000
+        self._count = 0
+
+    async def run_stt(self, audio: bytes) -> AsyncGenerator[Frame, None]:
+        await asyncio.sleep(self._latency)
+        self._count += 1
+        text = (
+            self._transcripts.pop(0) if self._transcripts else f"Replayed utterance {self._count}."
+        )
+        yield TranscriptionFrame(text, self._user_id, time_now_iso8601())
+
+
+class ReplayLLMService(LLMService):
+    """Streams a canned response after ``ttft_ms``, then ``tokens_per_sec`` words a second."""
+
+    def __init__(
+        self,
+        *,
+        ttft_ms: float = 400,
+        tokens_per_sec: float = 60,
+        response_tokens: int = 30,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._ttft = ttft_ms / 1000
+        self._token_interval = 1 / tokens_per_sec
+        self._words = REPLAY_RESPONSE.split()
+        self._response_tokens = response_tokens
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, LLMContextFrame):
+            await self._respond()
+        else:
+            await self.push_frame(frame, direction)
+
+    async def _respond(self):
+        await self.push_frame(LLMFullResponseStartFrame())
+        await self.start_processing_metrics()
+        try:
+            await self.start_ttfb_metrics()
+            await asyncio.sleep(self._ttft)
+            await self.stop_ttfb_metrics()
+            for i in range(self._response_tokens):
+                if i:
+                    await asyncio.sleep(self._token_interval)
+                word = self._words[i % len(self._words)]
+                await self.push_frame(LLMTextFrame(word if i == 0 else f" {word}"))
+        finally:
+            await self.stop_processing_metrics()
+            await self.push_frame(LLMFullResponseEndFrame())
+
+
+class ReplayTTSService(TTSService):
+    """Returns silence sized to the text after ``ttfb_ms``, generated at ``speed`` x real time."""
+
+    def __init__(
+        self,
+        *,
+        ttfb_ms: float = 200,
+        speed: float = 4.0,
+        chars_per_sec: float = 15.0,
+        chunk_ms: int = 40,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._ttfb = ttfb_ms / 1000
+        self._speed = speed
+        self._chars_per_sec = chars_per_sec
+        self._chunk_secs = chunk_ms / 1000
+
+    async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
+        await self.start_ttfb_metrics()
+        yield TTSStartedFrame()
+        await asyncio.sleep(self._ttfb)
+
+        chunk_bytes = int(self.sample_rate * self._chunk_secs) * 2
+        remaining = int(self.sample_rate * len(text) / self._chars_per_sec) * 2
+        first = True
+        while remaining > 0:
+            if not first:
+                await asyncio.sleep(self._chunk_secs / self._speed)
+            size = min(chunk_bytes, remaining)
+            remaining -= size
+            if first:
+                await self.stop_ttfb_metrics()
+                first = False
+            yield TTSAudioRawFrame(bytes(size), self.sample_rate, 1)
+        yield TTSStoppedFrame()
+
+
+class ReplaySummaryClient:
+    """Stands in for the Anthropic client ContextWindowProcessor summarizes with.
+
+    ``messages.create`` returns a short canned summary after ``latency_ms``.
+    """
+
+    def __init__(self, *, latency_ms: float = 800):
+        self._latency = latency_ms / 1000
+        self.calls = 0
+        self.messages = SimpleNamespace(create=self._create)
+
+    async def _create(self, **kwargs):
+        await asyncio.sleep(self._latency)
+        self.calls += 1
+        text = f"Replayed summary {self.calls} of the earlier conversation."
+        return SimpleNamespace(
+            content=[SimpleNamespace(type="text", text=text)],
+            usage=SimpleNamespace(input_tokens=0, output_tokens=len(text.split())),
+        )
+
+
+# ---------------------------------------------------------------------------
+# Replay transport
+# ---------------------------------------------------------------------------
+
+
+def load_wav(path: Path) -> tuple[bytes, int]:
+    """16-bit PCM from a WAV file, downmixed to mono. Returns (audio, sample_rate)."""
+    with wave.open(str(path), "rb") as w:
+        if w.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected 16-bit PCM, got {8 * w.getsampwidth()}-bit")
+        channels, rate = w.getnchannels(), w.getframerate()
+        audio = w.readframes(w.getnframes())
+    if channels > 1:
+        samples = np.frombuffer(audio, dtype=np.int16).reshape(-1, channels)
+        audio = samples.mean(axis=1).astype(np.int16).tobytes()
+    return audio, rate
+
+
+def comfort_noise(samples: int) -> bytes:
+    noise = np.random.default_rng().normal(0, COMFORT_NOISE_RMS, samples)
+    return noise.astype(np.int16).tobytes()
+
+
+class ReplayMonitor(BaseObserver):
+    """Counts frame pushes and completed bot responses for the feeder and the report.
+
+    A response completes when the bot stops speaking, or with ``text_only`` when
+    the LLM finishes it (no audio output, or audio that never pauses).
+    """
+
+    def __init__(self, *, text_only: bool = False):
+        super().__init__()
+        self._text_only = text_only
+        self.pushes = 0
+        self.responses = 0
+        self._responding = False
+
+    async def on_push_frame(self, data: FramePushed):
+        self.pushes += 1
+        frame, source = data.frame, data.source
+        if isinstance(frame, LLMFullResponseStartFrame) and isinstance(source, LLMService):
+            self._responding = True
+        elif not self._responding:
+            return
+        elif self._text_only:
+            if isinstance(frame, LLMFullResponseEndFrame) and isinstance(source, LLMService):
+                self._responding = False
+                self.responses += 1
+        elif isinstance(frame, BotStoppedSpeakingFrame) and isinstance(
+            source, BaseOutputTransport
+        ):
+            self._responding = False
+            self.responses += 1
+
+
+class ReplayInputTransport(BaseInputTransport):
+    """Feeds the utterances, then silence until each has been answered."""
+
+    def __init__(self, transport: "ReplayTransport", params: TransportParams):
+        super().__init__(params)
+        self._transport = transport
+        self._feed_task: Optional[asyncio.Task] = None
+
+    async def start(self, frame: StartFrame):
+        await super().start(frame)
+        await self.set_transport_ready(frame)
+        if not self._feed_task:
+            self._feed_task = self.create_task(self._feed())
+
+    async def stop(self, frame: EndFrame):
+        await super().stop(frame)
+        await self._stop_feeding()
+
+    async def cancel(self, frame: CancelFrame):
+        await super().cancel(frame)
+        await self._stop_feeding()
+
+    async def _stop_feeding(self):
+        if self._feed_task:
+            await self.cancel_task(self._feed_task)
+            self._feed_task = None
+
+    async def _feed(self):
+        transport = self._transport
+        resampler = create_file_resampler()
+        chunk_bytes = int(self.sample_rate * INPUT_CHUNK_MS / 1000) * 2
+        silence = comfort_noise(chunk_bytes // 2)
+
+        interval = INPUT_CHUNK_MS / 1000 / transport.speed
+        next_chunk_at = time.monotonic()
+
+        await transport._call_event_handler("on_client_connected", "replay")
+
+        async def feed(audio: bytes):
+            nonlocal next_chunk_at
+            for i in range(0, len(audio), chunk_bytes):
+                chunk = audio[i : i + chunk_bytes].ljust(chunk_bytes, b"\0")
+                await self.push_audio_frame(
+                    InputAudioRawFrame(audio=chunk, sample_rate=self.sample_rate, num_channels=1)
+                )
+                transport.audio_fed_secs += INPUT_CHUNK_MS / 1000
+                # Paced against a fixed schedule so processing time doesn't add up
+                next_chunk_at += interval
+                await asyncio.sleep(max(0.0, next_chunk_at - time.monotonic()))
+
+        async def feed_silence_until(responses: int):
+            deadline = time.monotonic() + transport.turn_timeout
+            while transport.monitor.responses < responses:
+                if time.monotonic() > deadline:
+                    logger.warning(f"Replay: no response {responses} within timeout")
+                    return
+                await feed(silence)
+
+        await feed(comfort_noise(int(self.sample_rate * LEAD_IN_SECS)))
+        # Bot greeting (bot/intake) or the whole debate
+        await feed_silence_until(transport.initial_responses)
+
+        for audio, rate in transport.utterances:
+            audio = await resampler.resample(audio, rate, self.sample_rate)
+            expected = transport.monitor.responses + 1
+            await feed(audio)
+            await feed_silence_until(expected)
+
+        await feed(comfort_noise(int(self.sample_rate * LEAD_IN_SECS)))
+        await transport._call_event_handler("on_client_disconnected", "replay")
+
+
+class ReplayOutputTransport(BaseOutputTransport):
+    """Discards bot audio, taking as long as playing it would (divided by speed)."""
+
+    def __init__(self, transport: "ReplayTransport", params: TransportParams):
+        super().__init__(params)
+        self._transport = transport
+
+    async def start(self, frame: StartFrame):
+        await super().start(frame)
+        await self.set_transport_ready(frame)
+
+    async def write_audio_frame(self, frame: OutputAudioRawFrame) -> bool:
+        duration = len(frame.audio) / (2 * frame.num_channels * frame.sample_rate)
+        await asyncio.sleep(duration / self._transport.speed)
+        return True
+
+
+class ReplayTransport(BaseTransport):
+    """File-backed stand-in for SmallWebRTCTransport."""
+
+    def __init__(
+        self,
+        params: TransportParams,
+        utterances: list[tuple[bytes, int]],
+        monitor: ReplayMonitor,
+        *,
+        speed: float = 1.0,
+        initial_responses: int = 1,
+        turn_timeout: float = 30.0,
+    ):
+        super().__init__()
+        self._params = params
+        self.utterances = utterances
+        self.monitor = monitor
+        self.speed = speed
+        self.initial_responses = initial_responses
+        self.turn_timeout = turn_timeout
+        self.audio_fed_secs = 0.0
+        self._input: Optional[ReplayInputTransport] = None
+        self._output: Optional[ReplayOutputTransport] = None
+
+        self._register_event_handler("on_client_connected")
+        self._register_event_handler("on_client_disconnected")
+
+    def input(self) -> FrameProcessor:
+        if not self._input:
+            self._input = ReplayInputTransport(self, self._params)
+        return self._input
+
+    def output(self) -> FrameProcessor:
+        if not self._output:
+            self._output = ReplayOutputTransport(self, self._params)
+        return self._output
+
+
+# ---------------------------------------------------------------------------
+# Replay
+# ---------------------------------------------------------------------------
+
+
+async def replay(
+    mode: str,
+    wavs: list[Path],
+    *,
+    speed: float = 1.0,
+    turns: int = 6,
+    turn_timeout: float = 30.0,
+    stt_latency_ms: float = 150,
+    llm_ttft_ms: float = 400,
+    llm_tokens_per_sec: float = 60,
+    llm_response_tokens: int = 30,
+    tts_ttfb_ms: float = 200,
+    tts_speed: float = 4.0,
+    summary_latency_ms: float = 800,
+    trace_file: Optional[str] = None,
+) -> dict:
+    """Replay ``wavs`` through the ``mode`` pipeline and return the benchmark report."""
+    # The runner modules refuse to import without keys; nothing here calls the APIs
+    os.environ.setdefault("ANTHROPIC_API_KEY", "replay")
+    os.environ.setdefault("DEEPGRAM_API_KEY", "replay")
+
+    text_only = mode == "intake"
+    utterances = [load_wav(path) for path in wavs]
+    transcripts = [
+        path.with_suffix(".txt").read_text().strip()
+        for path in wavs
+        if path.with_suffix(".txt").exists()
+    ]
+
+    # The bot only pauses between debate turns in pipelined mode; count LLM responses
+    monitor = ReplayMonitor(text_only=text_only or mode == "debate")
+    # Debate turns are generated ahead of playback; only their LLM part is traced
+    latency = TurnLatencyObserver(
+        f"replay-{mode}", trace_file=trace_file, text_only=text_only or mode == "debate"
+    )
+    params = TransportParams(audio_in_enabled=True, audio_out_enabled=not text_only)
+    transport = ReplayTransport(
+        params,
+        [] if mode == "debate" else utterances,
+        monitor,
+        speed=speed,
+        # The debate runs on its own; the other modes open with a greeting
+        initial_responses=turns if mode == "debate" else 1,
+        turn_timeout=turn_timeout,
+    )
+
+    services = dict(
+        stt=ReplaySTTService(transcripts=transcripts, latency_ms=stt_latency_ms),
+        llm=ReplayLLMService(
+            ttft_ms=llm_ttft_ms,
+            tokens_per_sec=llm_tokens_per_sec,
+            response_tokens=llm_response_tokens,
+        ),
+        observers=[latency, monitor],
+    )
+    summary_client = ReplaySummaryClient(latency_ms=summary_latency_ms)
+    if mode == "bot":
+        from bot import build_bot_task
+
+        task = build_bot_task(
+            transport,
+            tts=ReplayTTSService(ttfb_ms=tts_ttfb_ms, speed=tts_speed),
+            summary_client=summary_client,
+            **services,
+        )
+    elif mode == "debate":
+        import arguing_runner
+
+        config = dict(arguing_runner.debate_config)
+        task = arguing_runner.build_debate_task(
+            transport,
+            config,
+            tts_pool={
+                config[key]: ReplayTTSService(ttfb_ms=tts_ttfb_ms, speed=tts_speed)
+                for key in ("bot_a_voice", "bot_b_voice")
+            },
+            **services,
+        )
+    else:
+        import recruiter_runner
+
+        recruiter_runner.session_state["role"] = "Senior Backend Engineer"
+        recruiter_runner.session_state["hm_system_prompt"] = (
+            recruiter_runner.build_hm_system_prompt(
+                "Senior Backend Engineer", "5+ years of Python; hybrid, 3 days in office."
+            )
+        )
+        task = recruiter_runner.build_intake_task(
+            transport, summary_client=summary_client, **services
+        )
+
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    await PipelineRunner(handle_sigint=False).run(task)
+    wall = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+
+    return {
+        "mode": mode,
+        "utterances": len(utterances) if mode != "debate" else 0,
+        "responses": monitor.responses,
+        "context_summaries": summary_client.calls,
+        "wall_secs": round(wall, 3),
+        "audio_in_secs": round(transport.audio_fed_secs, 3),
+        "cpu_secs": round(cpu, 3),
+        "cpu_percent": round(100 * cpu / wall, 1) if wall else 0.0,
+        "frames_pushed": monitor.pushes,
+        "frames_per_sec": round(monitor.pushes / wall, 1) if wall else 0.0,
+        "latency_ms": latency.stats(),
+    }
+
+
+def print_report(report: dict):
+    print(f"\nReplay: {report['mode']}")
+    print(
+        f"  {report['responses']} responses to {report['utterances']} utterances, "
+        f"{report['audio_in_secs']:.1f}s of input audio in {report['wall_secs']:.1f}s"
+    )
+    print(f"  {report['context_summaries']} context window summaries")
+    print(f"  CPU {report['cpu_secs']:.2f}s ({report['cpu_percent']:.0f}% of one core)")
+    print(f"  {report['frames_pushed']} frame pushes ({report['frames_per_sec']:.0f}/s)")
+    print(f"  {'stage':<12} {'p50 ms':>8} {'p95 ms':>8} {'n':>4}")
+    for stage, stats in report["latency_ms"].items():
+        print(f"  {stage:<12} {stats['p50']:>8.0f} {stats['p95']:>8.0f} {stats['n']:>4}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline pipeline replay benchmark")
+    parser.add_argument("mode", choices=["bot", "debate", "intake"])
+    parser.add_argument("--wav", type=Path, nargs="*", default=[], help="user utterances")
+    parser.add_argument("--speed", type=float, default=1.0, help="audio replay speed")
+    parser.add_argument("--turns", type=int, default=6, help="debate turns to run")
+    parser.add_argument("--turn-timeout", type=float, default=30.0)
+    parser.add_argument("--stt-latency-ms", type=float, default=150)
+    parser.add_argument("--llm-ttft-ms", type=float, default=400)
+    parser.add_argument("--llm-tokens-per-sec", type=float, default=60)
+    parser.add_argument("--llm-response-tokens", type=int, default=30)
+    parser.add_argument("--tts-ttfb-ms", type=float, default=200)
+    parser.add_argument("--tts-speed", type=float, default=4.0, help="synthesis x real time")
+    parser.add_argument("--summary-latency-ms", type=float, default=800)
+    parser.add_argument("--trace", default=None, help="also write latency spans to this JSONL")
+    parser.add_argument("--json", type=Path, default=None, help="write the report here")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level=args.log_level)
+
+    report = asyncio.run(
+        replay(
+            args.mode,
+            args.wav,
+            speed=args.speed,
+            turns=args.turns,
+            turn_timeout=args.turn_timeout,
+            stt_latency_ms=args.stt_latency_ms,
+            llm_ttft_ms=args.llm_ttft_ms,
+            llm_tokens_per_sec=args.llm_tokens_per_sec,
+            llm_response_tokens=args.llm_response_tokens,
+            tts_ttfb_ms=args.tts_ttfb_ms,
+            tts_speed=args.tts_speed,
+            summary_latency_ms=args.summary_latency_ms,
+            trace_file=args.trace,
+        )
+    )
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Process-wide warm resources shared by every bot session.
+
+Building a session used to load the Silero VAD model and open fresh TLS
+connections on the critical path between the client connecting and the first
+greeting. This module keeps those warm for the whole process:
+
+  - the Silero ONNX model is loaded once; each session gets its own
+    SharedSileroVADAnalyzer with private RNN state over the shared weights
+  - one Anthropic client is shared by the pipeline LLM services and side-channel
+    calls, and warm_up() opens its keep-alive connection while a WebRTC offer is
+    still being negotiated
+
+Usage:
+    preload()                      # at startup
+    start_warm_up()                # when an SDP offer arrives
+    SharedSileroVADAnalyzer(params=VADParams(stop_secs=0.2))
+    AnthropicLLMService(api_key=..., client=anthropic_client())
+"""
+
+import asyncio
+import os
+import threading
+import time
+from importlib import resources
+from typing import Optional
+
+import anthropic
+import httpx
+from loguru import logger
+
+from pipecat.audio.vad.silero import SileroOnnxModel, SileroVADAnalyzer
+from pipecat.audio.vad.vad_analyzer import VADAnalyzer, VADParams
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+# Idle keep-alive connections are kept this long; warm_up() is skipped if it
+# already opened one within the last WARM_TTL_SECS.
+KEEPALIVE_SECS = float(os.getenv("WARM_POOL_KEEPALIVE_SECS", "60"))
+WARM_TTL_SECS = float(os.getenv("WARM_POOL_TTL_SECS", "30"))
+
+# ---------------------------------------------------------------------------
+# Shared Silero VAD
+# ---------------------------------------------------------------------------
+
+_vad_session = None
+_vad_lock = threading.Lock()
+
+
+def _silero_session():
+    """The process-wide Silero ONNX session, loaded on first use."""
+    global _vad_session
+    with _vad_lock:
+        if _vad_session is None:
+            path = resources.files("pipecat.audio.vad.data").joinpath("silero_vad.onnx")
+            _vad_session = SileroOnnxModel(str(path), force_onnx_cpu=True).session
+            logger.info("Loaded shared Silero VAD model")
+    return _vad_session
+
+
+class _SileroState(SileroOnnxModel):
+    """Per-session Silero RNN state running on the shared ONNX session."""
+
+    def __init__(self, session):
+        self.session = session
+        self.sample_rates = [8000, 16000]
+        self.reset_states()
+
+
+class SharedSileroVADAnalyzer(SileroVADAnalyzer):
+    """SileroVADAnalyzer that reuses the process-wide model instead of loading one."""
+
+    def __init__(self, *, sample_rate: Optional[int] = None, params: Optional[VADParams] = None):
+        VADAnalyzer.__init__(self, sample_rate=sample_rate, params=params)
+        self._model = _SileroState(_silero_session())
+        self._last_reset_time = 0
+
+
+# ---------------------------------------------------------------------------
+# Shared Anthropic client
+# ---------------------------------------------------------------------------
+
+_anthropic: Optional[anthropic.AsyncAnthropic] = None
+_last_warm = 0.0
+_warm_task: Optional[asyncio.Task] = None
+
+
+def anthropic_client() -> anthropic.AsyncAnthropic:
+    """The process-wide Anthropic client, keeping idle connections for reuse."""
+    global _anthropic
+    if _anthropic is None:
+        _anthropic = anthropic.AsyncAnthropic(
+            api_key=os.getenv("ANTHROPIC_API_KEY"),
+            http_client=anthropic.DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=20,
+                    keepalive_expiry=KEEPALIVE_SECS,
+                ),
+            ),
+        )
+    return _anthropic
+
+
+# ---------------------------------------------------------------------------
+# Warm-up
+# ---------------------------------------------------------------------------
+
+
+def preload():
+    """Load the shared models up front so the first session doesn't pay for it."""
+    _silero_session()
+
+
+async def warm_up():
+    """Make sure the VAD is loaded and an Anthropic connection is open."""
+    global _last_warm
+    await asyncio.to_thread(_silero_session)
+    if time.monotonic() - _last_warm < WARM_TTL_SECS:
+        return
+    started = time.perf_counter()
+    try:
+        # Free call; leaves a TLS connection in the client's keep-alive pool
+        await anthropic_client().models.list(limit=1)
+    except Exception as e:
+        logger.warning(f"Anthropic warm-up failed: {e}")
+        return
+    _last_warm = time.monotonic()
+    logger.debug(f"Warmed Anthropic connection in {time.perf_counter() - started:.3f}s")
+
+
+def start_warm_up():
+    """Run warm_up() in the background unless a warm-up is already running."""
+    global _warm_task
+    if _warm_task is None or _warm_task.done():
+        _warm_task = asyncio.create_task(warm_up())